@@ -1,6 +1,6 @@
 import re
 
-with open('main.py', 'r', encoding='utf-8') as f:
+with open('installer_gui.py', 'r', encoding='utf-8') as f:
     content = f.read()
 
 old_pattern = r'DISCLAIMER_TEXT = """.*?"""'
@@ -45,7 +45,7 @@ If you do not agree, cancel the installation.
 
 content_new = re.sub(old_pattern, new_text, content, count=1, flags=re.DOTALL)
 
-with open('main.py', 'w', encoding='utf-8') as f:
+with open('installer_gui.py', 'w', encoding='utf-8') as f:
     f.write(content_new)
 
 print('✓ Updated DISCLAIMER_TEXT successfully')
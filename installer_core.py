@@ -0,0 +1,2659 @@
+from __future__ import annotations
+
+# installer_core.py — GUI-free part of the colorFabb Filament Installer:
+# download, catalog, target resolution, copy plans, install and manifest.
+# Must not import Qt: headless runs (--silent, --uninstall, --check-download,
+# --all-users) only load this module.
+
+import sys, os, stat, socket, mmap, struct, zlib, zipfile, shutil, hashlib, logging, logging.handlers, queue, atexit, tempfile, ssl, functools, threading, json, configparser, time, contextlib, platform, random
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.request import urlopen, Request
+from urllib.error import HTTPError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from email.utils import formatdate, parsedate_to_datetime
+
+# Try to import certifi for better SSL certificate handling
+try:
+    import certifi
+    CERTIFI_AVAILABLE = True
+except ImportError:
+    CERTIFI_AVAILABLE = False
+
+APP_DISPLAY_NAME = "colorFabb Filament Installer"
+
+GITHUB_ZIP_URL = "https://github.com/colorfabb/printer-profiles/archive/refs/heads/main.zip"
+EXPECTED_SHA256 = None
+
+PRUSA_EXTS = {".ini"}
+JSON_EXTS  = {".json", ".jso"}
+
+# Step 1 shows how many profiles each slicer already has. Counting stops at this
+# cap so large preset libraries (many Bambu accounts) cannot stall detection.
+DETECT_COUNT_LIMIT = 500
+
+LINUX_FLATPAK_BASES = {
+    "BambuStudio": ("com.bambulab.BambuStudio", "BambuStudio"),
+    "PrusaSlicer": ("com.prusa3d.PrusaSlicer", "PrusaSlicer"),
+    "OrcaSlicer": ("com.orcaslicer.OrcaSlicer", "OrcaSlicer"),
+    "AnyCubicSlicer": ("com.anycubic.SlicerNext", "AnycubicSlicerNext"),
+}
+
+ALL_SLICERS = ["PrusaSlicer", "OrcaSlicer", "BambuStudio", "SnapmakerOrca", "AnyCubicSlicer", "QIDIStudio"]
+
+# Slicers that keep presets in per-account folders under <root>/user/<account>.
+# - root:    folder name below the app-data base
+# - aliases: lower-cased folder names the user may browse to directly
+# - account: rule deciding which user/<name> folders are active accounts
+# Adding such a slicer is a new entry here; discovery is shared.
+ACCOUNT_SLICERS = {
+    "BambuStudio": {"root": "BambuStudio", "aliases": {"bambustudio"}, "account": str.isdigit},
+    "SnapmakerOrca": {"root": "Snapmaker_Orca", "aliases": {"snapmaker_orca", "snapmakerorca"}, "account": str.isdigit},
+    "AnyCubicSlicer": {"root": "AnycubicSlicerNext", "aliases": {"anycubicslicernext"}, "account": str.isdigit},
+    "QIDIStudio": {"root": "QIDIStudio", "aliases": {"qidistudio"}, "account": str.isdigit},
+}
+
+
+# ========= PATH HELPERS =========
+def appdata_base() -> Path:
+    if sys.platform.startswith("win"):
+        return Path(os.environ.get("APPDATA", str(Path.home() / "AppData" / "Roaming")))
+    elif sys.platform == "darwin":
+        return Path.home() / "Library" / "Application Support"
+    else:
+        return Path.home() / ".config"
+
+def appdata_base_for_home(home: Path) -> Path:
+    """The slicer app-data base inside another user's home folder."""
+    if sys.platform.startswith("win"):
+        return home / "AppData" / "Roaming"
+    elif sys.platform == "darwin":
+        return home / "Library" / "Application Support"
+    else:
+        return home / ".config"
+
+# Profile folders under the platform's users root that are not real users.
+_NON_USER_HOMES = {"public", "default", "default user", "all users", "shared", "lost+found"}
+
+def enumerate_user_homes(users_file: Path | None = None) -> list[Path]:
+    """Home folders for a multi-user install.
+
+    With `users_file`, read one home folder per line (blank lines and `#` comments
+    are ignored). Otherwise list the platform users root (`/home`, `/Users` or
+    `C:\\Users`).
+    """
+    if users_file is not None:
+        homes = []
+        for line in Path(users_file).read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                homes.append(Path(line).expanduser())
+        return _unique_paths(homes)
+
+    if sys.platform.startswith("win"):
+        users_root = Path(os.environ.get("SystemDrive", "C:") + "\\") / "Users"
+    elif sys.platform == "darwin":
+        users_root = Path("/Users")
+    else:
+        users_root = Path("/home")
+
+    homes = []
+    try:
+        with os.scandir(users_root) as it:
+            for entry in it:
+                if entry.name.startswith(".") or entry.name.lower() in _NON_USER_HOMES:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    homes.append(Path(entry.path))
+    except OSError as e:
+        logging.error(f"Cannot list users in {users_root}: {e}")
+    return sorted(homes)
+
+def _unique_paths(paths: list[Path]) -> list[Path]:
+    seen: set[str] = set()
+    out: list[Path] = []
+    for path in paths:
+        key = str(path)
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(path)
+    return out
+
+def _merge_target_values(*values):
+    merged: list[Path] = []
+    for value in values:
+        if not value:
+            continue
+        if isinstance(value, list):
+            merged.extend(value)
+        else:
+            merged.append(value)
+
+    merged = _unique_paths(merged)
+    if not merged:
+        return None
+    if len(merged) == 1:
+        return merged[0]
+    return merged
+
+def _linux_flatpak_app_root(flatpak_id: str, app_dir: str, home: Path | None = None) -> Path:
+    return (home or Path.home()) / ".var" / "app" / flatpak_id / "config" / app_dir
+
+def _linux_flatpak_base(slicer: str, home: Path | None = None) -> Path | None:
+    """Flatpak app-data base for `slicer` (the `config` folder), if it ships as a Flatpak."""
+    if slicer not in LINUX_FLATPAK_BASES:
+        return None
+    return _linux_flatpak_app_root(*LINUX_FLATPAK_BASES[slicer], home=home).parent
+
+def _linux_flatpak_fixed_targets(home: Path | None = None):
+    """Flatpak targets for slicers without per-account folders."""
+    prusa_root = _linux_flatpak_app_root(*LINUX_FLATPAK_BASES["PrusaSlicer"], home=home)
+    orca_root = _linux_flatpak_app_root(*LINUX_FLATPAK_BASES["OrcaSlicer"], home=home)
+    return {
+        "PrusaSlicer": {
+            "filament": prusa_root / "filament",
+            "print":    prusa_root / "print",
+        },
+        "OrcaSlicer": {
+            "filament": orca_root / "user" / "default" / "filament",
+            "process":  orca_root / "user" / "default" / "process",
+        },
+    }
+
+def _slicer_root_from_base(slicer: str, base: Path) -> Path:
+    """Resolve an account-folder slicer's root folder from a user-provided base path.
+
+    The UI allows browsing any folder, so handle common selections
+    (BambuStudio shown, the other ACCOUNT_SLICERS work the same way):
+    - %APPDATA% (Roaming)          -> base/BambuStudio
+    - %APPDATA%/BambuStudio       -> base
+    - %APPDATA%/BambuStudio/user  -> base.parent
+    """
+    spec = ACCOUNT_SLICERS[slicer]
+    try:
+        name = base.name.lower()
+    except Exception:
+        name = ""
+
+    if name in spec["aliases"]:
+        return base
+    if name == "user" and base.parent.name.lower() in spec["aliases"]:
+        return base.parent
+    return base / spec["root"]
+
+def _scan_account_folders(user_root: Path, account_rule) -> list[Path]:
+    """List account folders in `user_root`, most recently modified first.
+
+    Uses os.scandir so each entry is stat'ed at most once (on Windows the
+    directory listing already carries the mtime).
+    """
+    found: list[tuple[float, str]] = []
+    try:
+        with os.scandir(user_root) as it:
+            for entry in it:
+                if not account_rule(entry.name):
+                    continue
+                try:
+                    if not entry.is_dir():
+                        continue
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    continue
+                found.append((mtime, entry.path))
+    except OSError:
+        return []
+    found.sort(key=lambda t: t[0], reverse=True)
+    return [Path(p) for _mtime, p in found]
+
+def _discover_user_profile_roots(slicer: str, bases: list[Path]) -> list[Path]:
+    """Discover per-account user folders for an ACCOUNT_SLICERS entry.
+
+    These slicers create per-account folders under <root>/user/<digits>. Multiple
+    accounts can be active, so we return *all* matching folders of every base,
+    each base sorted by most recently modified (descending). Per base we fall back
+    to user/default only if no account folders exist.
+    """
+    account_rule = ACCOUNT_SLICERS[slicer]["account"]
+    out: list[Path] = []
+    for base in bases:
+        user_root = _slicer_root_from_base(slicer, base) / "user"
+        accounts = _scan_account_folders(user_root, account_rule)
+        out.extend(accounts or [user_root / "default"])
+    return _unique_paths(out)
+
+def _discover_bambu_user_profile_root(base: Path) -> Path:
+    """Pick the best BambuStudio user folder.
+
+    Deprecated in favor of `_discover_user_profile_roots()`.
+    Kept for compatibility; returns the most recently modified candidate.
+    """
+    return _discover_user_profile_roots("BambuStudio", [base])[0]
+
+def _account_slicer_bases(slicer: str, base: Path, home: Path | None = None) -> list[Path]:
+    """App-data bases scanned for an account-folder slicer: native, plus Flatpak on Linux."""
+    bases = [base]
+    flatpak_base = _linux_flatpak_base(slicer, home) if sys.platform.startswith("linux") else None
+    if flatpak_base is not None:
+        bases.append(flatpak_base)
+    return bases
+
+def _resolve_slicer_targets(slicer: str, base: Path, home: Path | None = None) -> dict:
+    """Resolve the filament/process(print) target folders for one slicer."""
+    if slicer in ACCOUNT_SLICERS:
+        # Native and Flatpak bases are discovered in one pass.
+        user_roots = _discover_user_profile_roots(slicer, _account_slicer_bases(slicer, base, home))
+        return {
+            "filament": [p / "filament" for p in user_roots],
+            "process":  [p / "process" for p in user_roots],
+        }
+
+    if slicer == "PrusaSlicer":
+        categories = {
+            "filament": base / "PrusaSlicer" / "filament",
+            "print":    base / "PrusaSlicer" / "print",
+        }
+    else:
+        categories = {
+            "filament": base / slicer / "user" / "default" / "filament",
+            "process":  base / slicer / "user" / "default" / "process",
+        }
+    if not sys.platform.startswith("linux"):
+        return categories
+
+    flatpak_categories = _linux_flatpak_fixed_targets(home).get(slicer, {})
+    return {
+        category: _merge_target_values(categories.get(category), flatpak_categories.get(category))
+        for category in sorted(set(categories) | set(flatpak_categories))
+    }
+
+# Resolved targets per (base, home, slicer). Account-folder slicers are invalidated by
+# the mtime of their `user` folders, which changes when an account folder is
+# added or removed; the other slicers resolve to fixed paths and never go stale.
+_TARGET_CACHE: dict[tuple[str, str, str], tuple[tuple, dict]] = {}
+
+def _target_cache_stamp(slicer: str, base: Path, home: Path | None = None) -> tuple:
+    if slicer not in ACCOUNT_SLICERS:
+        return ()
+    stamp = []
+    for b in _account_slicer_bases(slicer, base, home):
+        try:
+            stamp.append(os.stat(_slicer_root_from_base(slicer, b) / "user").st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+def invalidate_target_cache(base: Path | None = None, slicer: str | None = None):
+    """Drop cached target resolutions (all, or those matching base/slicer)."""
+    for key in list(_TARGET_CACHE):
+        if base is not None and key[0] != str(base):
+            continue
+        if slicer is not None and key[2] != slicer:
+            continue
+        del _TARGET_CACHE[key]
+
+def slicer_targets_for(slicer: str, base: Path, home: Path | None = None) -> dict:
+    """Targets for one slicer, memoized per (base, home, slicer).
+
+    `home` only matters on Linux, where it locates the Flatpak config folders
+    (defaults to the current user's home).
+    """
+    key = (str(base), str(home or ""), slicer)
+    stamp = _target_cache_stamp(slicer, base, home)
+    cached = _TARGET_CACHE.get(key)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, _resolve_slicer_targets(slicer, base, home))
+        _TARGET_CACHE[key] = cached
+    # Hand out copies so callers cannot mutate the cached lists.
+    return {c: (list(v) if isinstance(v, list) else v) for c, v in cached[1].items()}
+
+def slicer_targets_from_base(base: Path, home: Path | None = None):
+    return {slicer: slicer_targets_for(slicer, base, home) for slicer in ALL_SLICERS}
+
+# ========= TEMP =========
+TEMP_ROOT = Path(tempfile.gettempdir()) / "colorfabb_installer"
+CACHE_DIR = TEMP_ROOT / "cache"
+INSTALLED_LIST = TEMP_ROOT / "installed_files.txt"
+LOG_FILE = TEMP_ROOT / "installer.log"
+VALIDATION_CACHE = CACHE_DIR / "validation_cache.json"
+CATALOG_CACHE = CACHE_DIR / "catalog_cache.json"
+BACKUP_DIR = TEMP_ROOT / "backups"
+
+# ========= LOGO (MEIPASS-aware) =========
+SCRIPT_DIR = Path(__file__).parent
+LOGO_CANDIDATES = [
+    ("logo/cF_Logo.png", "logo"),            # primair
+    ("logo/logo.png",    "logo"),
+    ("logo/colorfabb.png","logo"),
+    ("logo/colorfabb_logo.png","logo"),
+    ("logo.png",         ""),                # root fallback
+]
+
+@functools.lru_cache(maxsize=None)
+def find_logo() -> Path | None:
+    # Resolved once per process; the bundled assets do not move while running.
+    candidates = []
+    if getattr(sys, "_MEIPASS", None):
+        base = Path(sys._MEIPASS)
+        for rel, _sub in LOGO_CANDIDATES:
+            p = base / rel
+            if p.exists():
+                candidates.append(p)
+    for rel, _sub in LOGO_CANDIDATES:
+        p = SCRIPT_DIR / rel
+        if p.exists():
+            candidates.append(p)
+    return candidates[0] if candidates else None
+
+# ========= LOGGING =========
+# Callers only enqueue records (QueueHandler); a QueueListener thread formats and
+# writes them, so copy loops never wait on a slow, AV-scanned log file.
+LOG_MAX_BYTES = 2 * 1024 * 1024
+LOG_BACKUPS = 3
+LOG_SUMMARY_INTERVAL = 5.0  # seconds between aggregated per-file counts
+
+# Per-file events (one per copied/removed file) sit between DEBUG and INFO.
+FILE_EVENT = 15
+logging.addLevelName(FILE_EVENT, "FILE")
+
+LOG_VERBOSITIES = ("files", "summary")
+_LOG_LISTENER: logging.handlers.QueueListener | None = None
+
+def log_file_event(event: str, msg: str):
+    """Log one per-file event; 'summary' verbosity folds these into periodic counts."""
+    logging.log(FILE_EVENT, msg, extra={"file_event": event})
+
+class _SummarizingHandler(logging.Handler):
+    """Forwards records to `targets`, replacing per-file events with periodic counts."""
+    def __init__(self, targets: list[logging.Handler], interval: float = LOG_SUMMARY_INTERVAL):
+        super().__init__(FILE_EVENT)
+        self.targets = targets
+        self.interval = interval
+        self.counts: dict[str, int] = {}
+        self.window_start = time.monotonic()
+
+    def _forward(self, record: logging.LogRecord):
+        for h in self.targets:
+            if record.levelno >= h.level:
+                h.handle(record)
+
+    def flush_counts(self):
+        if self.counts:
+            parts = ", ".join(f"{event} {n}" for event, n in sorted(self.counts.items()))
+            elapsed = time.monotonic() - self.window_start
+            self._forward(logging.makeLogRecord({
+                "name": "root", "levelno": logging.INFO, "levelname": "INFO",
+                "msg": f"Files: {parts} (last {elapsed:.1f}s)"}))
+            self.counts = {}
+        self.window_start = time.monotonic()
+
+    def emit(self, record: logging.LogRecord):
+        if record.levelno == FILE_EVENT:
+            event = getattr(record, "file_event", "file")
+            self.counts[event] = self.counts.get(event, 0) + 1
+            if time.monotonic() - self.window_start >= self.interval:
+                self.flush_counts()
+            return
+        self.flush_counts()  # keep counts ahead of the message that follows them
+        self._forward(record)
+
+    def close(self):
+        self.flush_counts()
+        super().close()
+
+def shutdown_logging():
+    """Drain the log queue and stop the listener thread (registered atexit)."""
+    global _LOG_LISTENER
+    listener, _LOG_LISTENER = _LOG_LISTENER, None
+    if listener is not None:
+        listener.stop()
+        for h in listener.handlers:
+            h.close()
+
+def setup_logging(verbosity: str = "files"):
+    """Log to a size-rotated installer.log and stdout through a background queue.
+
+    verbosity "files" logs every copied/removed file; "summary" aggregates those
+    into one count line per LOG_SUMMARY_INTERVAL.
+    """
+    shutdown_logging()
+    try:
+        LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    except Exception:
+        pass
+    formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
+    handlers: list[logging.Handler] = []
+    try:
+        handlers.append(logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding='utf-8'))
+    except Exception:
+        pass
+    handlers.append(logging.StreamHandler(sys.stdout))
+    for h in handlers:
+        h.setFormatter(formatter)
+    if verbosity == "summary":
+        handlers = [_SummarizingHandler(handlers)]
+
+    global _LOG_LISTENER
+    q: queue.SimpleQueue = queue.SimpleQueue()
+    _LOG_LISTENER = logging.handlers.QueueListener(q, *handlers, respect_handler_level=True)
+    _LOG_LISTENER.start()
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.addHandler(logging.handlers.QueueHandler(q))
+    root.setLevel(FILE_EVENT)
+    atexit.register(shutdown_logging)
+
+# ========= TIMINGS =========
+# Per-phase spans (wall time plus bytes / file counts). Nothing is recorded until
+# enable_timings(); until then span() hands out a shared no-op object, so the
+# instrumented code pays one global lookup per phase.
+TIMINGS_JSON  = TEMP_ROOT / "timings.json"
+TIMINGS_TRACE = TEMP_ROOT / "timings.trace.json"
+_SPANS: list[dict] | None = None
+_SPANS_T0 = 0
+
+class _Span:
+    __slots__ = ("name", "attrs", "_t0")
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self._t0 = 0
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+    def __enter__(self):
+        self._t0 = time.perf_counter_ns()
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        t1 = time.perf_counter_ns()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        spans = _SPANS
+        if spans is not None:
+            spans.append({"name": self.name, "start_ns": self._t0 - _SPANS_T0, "dur_ns": t1 - self._t0,
+                          "thread": threading.current_thread().name, "tid": threading.get_ident(),
+                          "attrs": self.attrs})
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+    def set(self, **attrs):
+        pass
+    def __enter__(self):
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+def span(name: str, **attrs):
+    """Context manager timing one phase; `.set(**attrs)` records counts on it."""
+    if _SPANS is None:
+        return _NULL_SPAN
+    return _Span(name, attrs)
+
+def timed(name: str, attrs_of=None):
+    """Decorator form of span(); `attrs_of(result)` may return attrs to record."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _SPANS is None:
+                return fn(*args, **kwargs)
+            with _Span(name, {}) as sp:
+                result = fn(*args, **kwargs)
+                if attrs_of is not None:
+                    sp.set(**attrs_of(result))
+                return result
+        return wrapper
+    return deco
+
+def enable_timings():
+    global _SPANS, _SPANS_T0
+    if _SPANS is None:
+        _SPANS = []
+        _SPANS_T0 = time.perf_counter_ns()
+
+def timing_spans() -> list[dict]:
+    return list(_SPANS or [])
+
+def write_timings(fmt: str = "json") -> Path | None:
+    """Write recorded spans next to installer.log, as plain JSON or Chrome trace events."""
+    if _SPANS is None:
+        return None
+    spans = timing_spans()
+    if fmt == "chrome":
+        # Load in chrome://tracing or https://ui.perfetto.dev
+        pid = os.getpid()
+        events = [{"name": sp["name"], "ph": "X", "ts": sp["start_ns"] / 1000, "dur": sp["dur_ns"] / 1000,
+                   "pid": pid, "tid": sp["tid"], "args": sp["attrs"]} for sp in spans]
+        names = {sp["tid"]: sp["thread"] for sp in spans}
+        events += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": n}}
+                   for tid, n in names.items()]
+        path, doc = TIMINGS_TRACE, {"traceEvents": events, "displayTimeUnit": "ms"}
+    else:
+        path = TIMINGS_JSON
+        doc = {"app": APP_DISPLAY_NAME, "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+               "spans": [{"name": sp["name"], "start_ms": round(sp["start_ns"] / 1e6, 3),
+                          "wall_ms": round(sp["dur_ns"] / 1e6, 3), "thread": sp["thread"], **sp["attrs"]}
+                         for sp in spans]}
+    try:
+        ensure_dir(path.parent)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=1, default=str)
+    except OSError as e:
+        logging.warning(f"Could not write timings: {e}")
+        return None
+    logging.info(f"Wrote phase timings: {path}")
+    return path
+
+# ========= METRICS =========
+# Fleet-facing summary of a headless run, derived from the same spans as
+# --profile-timings: a Prometheus textfile-collector file plus a JSON summary.
+METRICS_PROM_NAME = "colorfabb_installer.prom"
+METRICS_JSON_NAME = "metrics.json"
+
+# counter name -> (span name, attribute summed over those spans, help text)
+METRIC_COUNTERS = {
+    "bytes_downloaded":    ("download.transfer", "bytes",     "Bytes of profiles ZIP downloaded"),
+    "files_copied":        ("copy",              "copied",    "Profile files written"),
+    "files_unchanged":     ("copy",              "unchanged", "Profile files skipped because the destination was identical"),
+    "bytes_copied":        ("copy",              "bytes",     "Bytes of profile files written"),
+    "files_removed":       ("uninstall",         "removed",   "Installed files removed by uninstall"),
+    "files_backed_up":     ("backup",            "files",     "Overwritten or deleted files saved before the change"),
+    "backup_bytes_stored": ("backup",            "stored",    "Compressed bytes added to the backup store"),
+    "profiles_invalid":    ("validate",          "invalid",   "Profiles skipped because they failed to parse"),
+    "validation_cached":   ("validate",          "cached",    "Profiles whose validation result came from the cache"),
+    "validation_parsed":   ("validate",          "parsed",    "Profiles parsed because no cached result existed"),
+}
+
+def summarize_spans(spans: list[dict]) -> tuple[dict[str, float], dict[str, float], int]:
+    """(counters, seconds per phase, failed spans) aggregated over recorded spans."""
+    counters = {name: 0 for name in METRIC_COUNTERS}
+    phases: dict[str, float] = {}
+    failures = 0
+    for sp in spans:
+        phases[sp["name"]] = phases.get(sp["name"], 0.0) + sp["dur_ns"] / 1e9
+        if "error" in sp["attrs"]:
+            failures += 1
+        for name, (span_name, attr, _help) in METRIC_COUNTERS.items():
+            if sp["name"] == span_name:
+                counters[name] += sp["attrs"].get(attr, 0) or 0
+    return counters, phases, failures
+
+def _write_atomic(path: Path, text: str):
+    # node_exporter may read the textfile at any moment: never expose a partial file.
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+def write_metrics(mode: str, ok: bool, out_dir: Path | None = None, version: str = "") -> Path | None:
+    """Write the Prometheus textfile and JSON summary for this run into `out_dir` (default: next to installer.log)."""
+    if _SPANS is None:
+        return None
+    out_dir = out_dir or TEMP_ROOT
+    counters, phases, failures = summarize_spans(timing_spans())
+    duration = (time.perf_counter_ns() - _SPANS_T0) / 1e9
+    finished = time.time()
+    labels = f'mode="{mode}"'
+    lines = [
+        "# HELP colorfabb_installer_info Installer version of the last run.",
+        "# TYPE colorfabb_installer_info gauge",
+        f'colorfabb_installer_info{{{labels},version="{version}"}} 1',
+        "# HELP colorfabb_installer_last_run_success 1 if the last run succeeded.",
+        "# TYPE colorfabb_installer_last_run_success gauge",
+        f"colorfabb_installer_last_run_success{{{labels}}} {1 if ok else 0}",
+        "# HELP colorfabb_installer_last_run_timestamp_seconds Unix time the last run finished.",
+        "# TYPE colorfabb_installer_last_run_timestamp_seconds gauge",
+        f"colorfabb_installer_last_run_timestamp_seconds{{{labels}}} {finished:.0f}",
+        "# HELP colorfabb_installer_run_duration_seconds Wall time of the last run.",
+        "# TYPE colorfabb_installer_run_duration_seconds gauge",
+        f"colorfabb_installer_run_duration_seconds{{{labels}}} {duration:.3f}",
+        "# HELP colorfabb_installer_failures Failed phases in the last run.",
+        "# TYPE colorfabb_installer_failures gauge",
+        f"colorfabb_installer_failures{{{labels}}} {failures}",
+    ]
+    for name, (_span, _attr, help_text) in METRIC_COUNTERS.items():
+        lines += [f"# HELP colorfabb_installer_{name} {help_text} in the last run.",
+                  f"# TYPE colorfabb_installer_{name} gauge",
+                  f"colorfabb_installer_{name}{{{labels}}} {counters[name]}"]
+    lines += ["# HELP colorfabb_installer_phase_seconds Wall time per phase in the last run.",
+              "# TYPE colorfabb_installer_phase_seconds gauge"]
+    lines += [f'colorfabb_installer_phase_seconds{{{labels},phase="{ph}"}} {sec:.6f}' for ph, sec in sorted(phases.items())]
+    summary = {"app": APP_DISPLAY_NAME, "version": version, "host": platform.node(), "mode": mode, "ok": ok,
+               "finished": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(finished)),
+               "duration_s": round(duration, 3), "failures": failures, "counters": counters,
+               "phases_s": {ph: round(sec, 6) for ph, sec in sorted(phases.items())}}
+    try:
+        ensure_dir(out_dir)
+        _write_atomic(out_dir / METRICS_PROM_NAME, "\n".join(lines) + "\n")
+        _write_atomic(out_dir / METRICS_JSON_NAME, json.dumps(summary, indent=1) + "\n")
+    except OSError as e:
+        logging.warning(f"Could not write metrics: {e}")
+        return None
+    logging.info(f"Wrote metrics: {out_dir / METRICS_PROM_NAME}")
+    return out_dir / METRICS_JSON_NAME
+
+@contextlib.contextmanager
+def metrics_run(mode: str, out_dir: Path | None, enabled: bool, version: str = ""):
+    """Record spans for the enclosed run and write metrics when it ends, failed or not.
+
+    Yields a status dict; set status["ok"] = False for failures that do not raise.
+    """
+    status = {"ok": True}
+    if not enabled:
+        yield status
+        return
+    enable_timings()
+    try:
+        yield status
+    except BaseException:
+        status["ok"] = False
+        raise
+    finally:
+        write_metrics(mode, status["ok"], out_dir, version)
+
+# ========= UTILS =========
+def ensure_dir(p: Path):
+    p.mkdir(parents=True, exist_ok=True)
+
+def humanize_bytes(n: int) -> str:
+    for unit in ['B','KB','MB','GB','TB']:
+        if n < 1024.0:
+            return f"{n:3.1f} {unit}" if unit != 'B' else f"{n} {unit}"
+        n /= 1024.0
+    return f"{n:.1f} PB"
+
+def sha256_file(path: Path) -> str:
+    """sha256 of a file, hashed straight from a memory map (no buffered read loop)."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
+
+def make_ssl_context(verify_ssl: bool = True) -> ssl.SSLContext:
+    """SSL context for downloads; certifi's CA bundle is preferred when available."""
+    if not verify_ssl:
+        # Disable SSL verification (only when explicitly requested by user)
+        return ssl._create_unverified_context()
+    if CERTIFI_AVAILABLE:
+        return ssl.create_default_context(cafile=certifi.where())
+    return ssl.create_default_context()
+
+# ========= CANCELLATION =========
+class Cancelled(Exception):
+    """Raised by CancelToken.check() once cancellation was requested."""
+
+class CancelToken:
+    """Cooperative cancellation shared between a worker and the thread that cancels it.
+
+    Workers call `check()` in their loops. Blocking I/O can register a callback
+    (e.g. shutting down the HTTP socket) so cancel() also interrupts a stalled
+    read. Callbacks run on the cancelling thread, often the GUI thread, so they
+    must never block.
+    """
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for cb in callbacks:
+            try:
+                cb()
+            except Exception:
+                pass
+
+    def on_cancel(self, cb):
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(cb)
+                return
+        cb()
+
+    def check(self):
+        if self._event.is_set():
+            raise Cancelled("Cancelled by user")
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to `timeout` seconds; returns True early once cancelled."""
+        return self._event.wait(timeout)
+
+def _check(cancel: CancelToken | None):
+    if cancel is not None:
+        cancel.check()
+
+def _private_dir(d: Path) -> Path:
+    """Create `d` with mode 0700 and check that only the current user controls it.
+
+    TEMP_ROOT lives in the shared temp folder, where another account could have
+    created a folder first to read or plant files. Raises PermissionError when
+    `d` is a symlink or not ours, or a folder between TEMP_ROOT and it belongs
+    to anyone but us or root.
+    """
+    ensure_dir(d.parent)
+    try:
+        os.mkdir(d, 0o700)
+    except FileExistsError:
+        pass
+    if hasattr(os, "getuid"):
+        uid = os.getuid()
+        ancestors = [p for p in d.parents if p == TEMP_ROOT or TEMP_ROOT in p.parents]
+        for p, owners in [(d, (uid,))] + [(p, (uid, 0)) for p in ancestors]:
+            st = os.lstat(p)
+            if not stat.S_ISDIR(st.st_mode) or st.st_uid not in owners:
+                raise PermissionError(f"{p} is not a folder owned by the current user")
+        if stat.S_IMODE(os.lstat(d).st_mode) != 0o700:
+            os.chmod(d, 0o700)
+    return d
+
+def _remove_quietly(path: Path):
+    try:
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning(f"Could not clean up {path}: {e}")
+
+# ========= ARCHIVE ACCESS =========
+# fetch_url_to_file() hashes the download as it streams and, up to
+# ARCHIVE_MEMORY_LIMIT bytes, also keeps it in memory. verify_profiles_zip() and
+# extract_zip() then run from that one buffer; larger archives are memory-mapped
+# so testzip and member reads share the page cache. The file is written either
+# way: --watch, the LAN cache and the wizard reuse it. 0 disables the in-memory copy.
+ARCHIVE_MEMORY_LIMIT = 64 * 1024 * 1024
+
+_HELD_ARCHIVE: dict | None = None
+_HELD_LOCK = threading.Lock()
+
+def _file_key(path: Path) -> tuple[int, int]:
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns
+
+def _hold_archive(path: Path, data: bytearray | None, digest: str):
+    """Remember the latest download (only one at a time, so memory stays bounded)."""
+    global _HELD_ARCHIVE
+    with _HELD_LOCK:
+        _HELD_ARCHIVE = {"path": str(path), "key": _file_key(path), "data": data, "sha256": digest}
+
+def _held_archive(path: Path) -> dict | None:
+    """The held download of `path`, if the file has not been replaced since."""
+    held = _HELD_ARCHIVE
+    if held is None or held["path"] != str(path):
+        return None
+    try:
+        return held if held["key"] == _file_key(path) else None
+    except OSError:
+        return None
+
+def release_archive(path: Path):
+    """Drop the in-memory copy of `path` (its sha256 is kept)."""
+    with _HELD_LOCK:
+        if _HELD_ARCHIVE is not None and _HELD_ARCHIVE["path"] == str(path):
+            _HELD_ARCHIVE["data"] = None
+
+class _BufferFile:
+    """Read-only, seekable file over a buffer (bytearray or mmap) that zipfile can open without a copy."""
+    def __init__(self, buf):
+        self._view = memoryview(buf)
+        self._pos = 0
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        origin = (0, self._pos, len(self._view))[whence]
+        self._pos = max(0, origin + offset)
+        return self._pos
+
+    def read(self, n: int = -1) -> bytes:
+        end = len(self._view) if n is None or n < 0 else min(len(self._view), self._pos + n)
+        data = self._view[self._pos:end].tobytes()
+        self._pos = max(self._pos, end)
+        return data
+
+    def close(self):
+        self._view.release()
+
+@contextlib.contextmanager
+def open_archive(zip_path: Path):
+    """ZipFile over the held in-memory download of `zip_path`, else over a memory map of it."""
+    held = _held_archive(zip_path)
+    if held is not None and held["data"] is not None:
+        buf = _BufferFile(held["data"])
+        try:
+            with zipfile.ZipFile(buf) as z:
+                yield z
+        finally:
+            buf.close()
+        return
+    with open(zip_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise zipfile.BadZipFile(f"Empty archive: {zip_path}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            buf = _BufferFile(mm)
+            try:
+                with zipfile.ZipFile(buf) as z:
+                    yield z
+            finally:
+                buf.close()  # the mmap cannot close while a view is exported
+
+# ========= DOWNLOAD =========
+# Connect and every read time out after DOWNLOAD_TIMEOUT seconds, so a stalled
+# server fails the download (and --watch backs off) instead of hanging. Cancel
+# shuts the socket down: unlike closing the response, shutdown() takes no lock
+# the reading thread holds, so it returns at once and wakes the blocked read.
+DOWNLOAD_TIMEOUT = 30.0
+
+def _response_socket(r) -> socket.socket | None:
+    """The socket behind an urlopen() response, or None if it cannot be found."""
+    return getattr(getattr(getattr(r, "fp", None), "raw", None), "_sock", None)
+
+def _abort_socket(sock: socket.socket):
+    try:
+        # The plain socket method: SSLSocket.shutdown() would also tear down
+        # the SSL object the reading thread is using.
+        socket.socket.shutdown(sock, socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+def fetch_url_to_file(url: str, dest: Path, verify_ssl: bool = True, cancel: CancelToken | None = None,
+                      progress=None, headers: dict | None = None) -> dict | None:
+    """Stream `url` into `dest` via `dest.part`, renamed into place only when complete.
+
+    `progress(downloaded, total)` is called per chunk. On cancellation or error the
+    partial file is removed, so `dest` is never left truncated. Extra `headers` allow
+    conditional requests: returns None on 304 Not Modified (nothing written), else
+    the response's cache validators {"etag", "last_modified"}.
+    """
+    ensure_dir(dest.parent)
+    part = dest.with_name(dest.name + ".part")
+    req = Request(url, headers={"User-Agent": "colorFabb-Installer", **(headers or {})})
+    try:
+        # connect = DNS + TCP + TLS handshake + response headers
+        with span("download.connect", url=url) as csp:
+            try:
+                r = urlopen(req, timeout=DOWNLOAD_TIMEOUT, context=make_ssl_context(verify_ssl))
+            except HTTPError as e:
+                if e.code != 304:
+                    raise
+                e.close()
+                csp.set(not_modified=True)
+                return None
+        validators = {"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
+        with r, span("download.transfer") as sp:
+            sock = _response_socket(r)
+            if cancel is not None and sock is not None:
+                cancel.on_cancel(lambda: _abort_socket(sock))  # unblocks a stalled read
+            total = int(r.headers.get("Content-Length", "0")) if r.headers.get("Content-Length") else 0
+            downloaded = 0
+            digest = hashlib.sha256()
+            keep = bytearray() if 0 < ARCHIVE_MEMORY_LIMIT and total <= ARCHIVE_MEMORY_LIMIT else None
+            with open(part, "wb") as f:
+                while True:
+                    _check(cancel)
+                    buf = r.read(64 * 1024)
+                    if not buf:
+                        break
+                    f.write(buf)
+                    digest.update(buf)
+                    if keep is not None:
+                        keep += buf
+                        if len(keep) > ARCHIVE_MEMORY_LIMIT:
+                            keep = None  # no (or a wrong) Content-Length; fall back to mmap
+                    downloaded += len(buf)
+                    if progress is not None:
+                        progress(downloaded, total)
+            sp.set(bytes=downloaded, in_memory=keep is not None)
+        _check(cancel)
+        os.replace(part, dest)
+        _hold_archive(dest, keep, digest.hexdigest())
+        return validators
+    except BaseException as e:
+        _remove_quietly(part)
+        if cancel is not None and cancel.cancelled and not isinstance(e, Cancelled):
+            raise Cancelled("Cancelled by user") from e
+        raise
+
+def verify_profiles_zip(zip_path: Path) -> str:
+    """Validate the downloaded ZIP (CRC test + optional pinned sha256); returns its sha256.
+
+    The sha256 computed while downloading is reused when `zip_path` is unchanged.
+    """
+    held = _held_archive(zip_path)
+    with span("verify.testzip") as sp, open_archive(zip_path) as z:
+        bad = z.testzip()
+        if bad is not None:
+            # extract_zip() decompresses duplicate members only once, so catch every bad one here.
+            raise zipfile.BadZipFile(f"Corrupt member in profiles ZIP: {bad}")
+        sp.set(files=len(z.infolist()), in_memory=held is not None and held["data"] is not None)
+    with span("verify.sha256", bytes=zip_path.stat().st_size, reused=held is not None):
+        digest = held["sha256"] if held is not None else sha256_file(zip_path)
+    if EXPECTED_SHA256 and digest.lower() != EXPECTED_SHA256.lower():
+        raise RuntimeError(f"SHA256 mismatch: got {digest}, expected {EXPECTED_SHA256}")
+    return digest
+
+# ========= EXTRACT & PARSE REPO =========
+# The upstream repo ships many byte-identical presets (the same profile in the
+# OrcaSlicer, BambuStudio, Snapmaker Orca, AnyCubic and QIDI folders). Members
+# are therefore stored once in a blob store next to the extracted tree
+# (<dest>.blobs, one per tree, so trees never prune each other's blobs), keyed
+# by the sha256 of their raw
+# compressed bytes (equal bytes decompress to equal content, no inflate needed
+# to tell), and the extracted tree is made of hard links to those blobs. Every
+# consumer keeps reading ordinary paths; decompression and disk use scale with
+# unique content. Filesystems without hard links get copies of the blob.
+# A blob found in the store is only linked after its size and CRC32 match the
+# member; anything else (stale, corrupt, planted, vanished) is treated as a
+# miss and replaced. The store is private to the user running the installer.
+_LOCAL_HEADER = struct.Struct("<4s22xHH")  # signature, ..., file name length, extra field length
+_WIN_ILLEGAL = str.maketrans(':<>|"?*', "_______")
+
+def _raw_member_bytes(fp, info: zipfile.ZipInfo) -> bytes:
+    """Compressed bytes of `info` as stored in the archive (no decompression)."""
+    fp.seek(info.header_offset)
+    sig, name_len, extra_len = _LOCAL_HEADER.unpack(fp.read(_LOCAL_HEADER.size))
+    if sig != b"PK\x03\x04":
+        raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+    fp.seek(info.header_offset + _LOCAL_HEADER.size + name_len + extra_len)
+    return fp.read(info.compress_size)
+
+def _member_relpath(name: str) -> str | None:
+    """Safe relative path for an archive member (like ZipFile.extract: no absolute or '..' parts)."""
+    parts = [p for p in name.replace("\\", "/").split("/") if p not in ("", ".", "..")]
+    if os.sep == "\\":
+        parts = [p.translate(_WIN_ILLEGAL).rstrip(".") for p in parts]
+        parts = [p for p in parts if p]
+    return os.path.join(*parts) if parts else None
+
+def _link_or_copy(blob: Path, target: Path) -> bool:
+    """Hard-link `target` to `blob`; copy when the filesystem refuses. True if linked."""
+    try:
+        os.link(blob, target)
+        return True
+    except OSError:
+        shutil.copyfile(blob, target)
+        return False
+
+def _blob_dir(dest_dir: Path) -> Path:
+    return dest_dir.with_name(dest_dir.name + ".blobs")
+
+def _prune_blobs(store: Path, keep: set[str]):
+    try:
+        entries = list(os.scandir(store))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name not in keep:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+def _blob_matches(blob: Path, member: zipfile.ZipInfo) -> bool:
+    """True if `blob` holds exactly the content of `member` (size and CRC32)."""
+    try:
+        if os.stat(blob).st_size != member.file_size:
+            return False
+        crc = 0
+        with open(blob, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                crc = zlib.crc32(chunk, crc)
+    except OSError:
+        return False
+    return crc == member.CRC
+
+def _place_member(z: zipfile.ZipFile, member: zipfile.ZipInfo, target: str,
+                  store: Path, stored: dict[str, bool]) -> tuple[str, bool]:
+    """Create `target` from `member` through the blob store; returns (blob key, decompressed).
+
+    `stored` maps the blobs present in `store` to whether they have been
+    checked against their member during this extraction.
+    """
+    raw = _raw_member_bytes(z.fp, member)
+    key = hashlib.sha256(bytes([member.compress_type]) + raw).hexdigest()
+    blob = store / key
+    if stored.get(key) is False:
+        stored[key] = _blob_matches(blob, member)
+    if stored.get(key):
+        try:
+            _link_or_copy(blob, Path(target))
+            return key, False
+        except FileNotFoundError:
+            stored.pop(key, None)  # removed behind our back: decompress it again
+    # First copy of this content: write it in the tree, then publish it as the
+    # blob under a temp name renamed into place, so a crash or a concurrent
+    # extraction never sees a truncated blob and a bad one is replaced whole.
+    with z.open(member) as src, open(target, "wb") as out:
+        shutil.copyfileobj(src, out, 1024 * 1024)
+    tmp = store / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        _remove_quietly(tmp)
+        _link_or_copy(Path(target), tmp)
+        os.replace(tmp, blob)
+    except OSError:
+        _remove_quietly(tmp)
+        stored.pop(key, None)
+        return key, True  # the tree file is complete; just not shared
+    stored[key] = True
+    return key, True
+
+# Re-extraction is incremental: a sibling index (<dest>.index.json) maps every
+# extracted file to its member CRC, size and blob. A new archive only relinks
+# the members whose CRC or size changed and deletes the removed ones, so
+# unchanged files keep their mtimes. Without a complete index, or when most of
+# the archive changed, the tree is rebuilt in a staging folder instead.
+# The index is only trusted as far as the tree agrees with it: an indexed file
+# that is missing, not a regular file or of the wrong size counts as changed.
+# <dest>.stamp changes with every extraction and is absent while the tree is
+# being modified; the catalog cache keys on it.
+EXTRACT_REBUILD_FRACTION = 0.5
+
+def _extract_index_paths(dest_dir: Path) -> tuple[Path, Path]:
+    return dest_dir.with_name(dest_dir.name + ".index.json"), dest_dir.with_name(dest_dir.name + ".stamp")
+
+def extraction_stamp(dest_dir: Path) -> str | None:
+    """Token identifying the current contents of an extracted tree (None if unknown)."""
+    try:
+        return _extract_index_paths(dest_dir)[1].read_text(encoding="utf-8").strip() or None
+    except OSError:
+        return None
+
+def _load_extract_index(dest_dir: Path) -> dict | None:
+    index_path, _stamp_path = _extract_index_paths(dest_dir)
+    stamp = extraction_stamp(dest_dir)
+    if stamp is None or not dest_dir.is_dir():
+        return None
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            doc = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(doc, dict) or doc.get("stamp") != stamp or not isinstance(doc.get("members"), dict):
+        return None
+    return doc
+
+def _tree_file_sizes(dest_dir: Path) -> dict[str, int]:
+    """Size of every regular file below `dest_dir` by relative path, in one scandir walk."""
+    sizes: dict[str, int] = {}
+    pending = [""]
+    while pending:
+        rel = pending.pop()
+        try:
+            it = os.scandir(os.path.join(dest_dir, rel))
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                path = os.path.join(rel, entry.name) if rel else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(path)
+                elif entry.is_file(follow_symlinks=False):
+                    sizes[path] = entry.stat(follow_symlinks=False).st_size
+    return sizes
+
+def _write_extract_index(dest_dir: Path, members: dict[str, list] | None):
+    """Record `members` as the contents of `dest_dir`; None marks the tree as being modified."""
+    index_path, stamp_path = _extract_index_paths(dest_dir)
+    if members is None:
+        _remove_quietly(stamp_path)
+        return
+    stamp = f"{time.time_ns():x}-{random.getrandbits(32):08x}"
+    try:
+        _write_atomic(index_path, json.dumps({"stamp": stamp, "members": members}))
+        _write_atomic(stamp_path, stamp)
+    except OSError as e:
+        logging.warning(f"Could not write extraction index: {e}")  # next extraction is a full one
+
+def _extract_full(z: zipfile.ZipFile, files: dict[str, zipfile.ZipInfo], dirs: list[str], dest_dir: Path,
+                  store: Path, stored: dict[str, bool], cancel: CancelToken | None) -> tuple[dict[str, list], int]:
+    """Build the whole tree in a staging folder and swap it in; returns (index members, decompressed)."""
+    staging = dest_dir.with_name(dest_dir.name + ".staging")
+    _remove_quietly(staging)
+    ensure_dir(staging)
+    members: dict[str, list] = {}
+    decompressed = 0
+    try:
+        made_dirs: set[str] = set()
+        for rel in dirs:
+            os.makedirs(os.path.join(staging, rel), exist_ok=True)
+        for rel, member in files.items():
+            _check(cancel)
+            target = os.path.join(staging, rel)
+            parent = os.path.dirname(target)
+            if parent not in made_dirs:
+                os.makedirs(parent, exist_ok=True)
+                made_dirs.add(parent)
+            key, inflated = _place_member(z, member, target, store, stored)
+            decompressed += inflated
+            members[rel] = [member.CRC, member.file_size, key]
+        _check(cancel)
+    except BaseException:
+        _remove_quietly(staging)
+        raise
+    _write_extract_index(dest_dir, None)
+    if dest_dir.exists():
+        shutil.rmtree(dest_dir)
+    os.replace(staging, dest_dir)
+    return members, decompressed
+
+def _extract_changes(z: zipfile.ZipFile, files: dict[str, zipfile.ZipInfo], dirs: list[str], dest_dir: Path,
+                     old: dict[str, list], changed: list[str], removed: list[str],
+                     store: Path, stored: dict[str, bool]) -> tuple[dict[str, list], int]:
+    """Patch `dest_dir` in place; returns (index members, decompressed).
+
+    Removed files and the folders they leave empty go first, so a folder that
+    became a file (or the reverse) has its place free before anything is written.
+    """
+    _write_extract_index(dest_dir, None)
+    changed_set = set(changed)
+    members = {rel: old[rel] for rel in files if rel not in changed_set}
+    decompressed = 0
+    emptied: set[str] = set()
+    for rel in removed:
+        path = os.path.join(dest_dir, rel)
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        emptied.add(os.path.dirname(path))
+    root = os.path.normpath(dest_dir)
+    for d in sorted(emptied, key=len, reverse=True):
+        while os.path.normpath(d) != root and d.startswith(root):
+            try:
+                os.rmdir(d)
+            except OSError:
+                break
+            d = os.path.dirname(d)
+    for rel in dirs:
+        os.makedirs(os.path.join(dest_dir, rel), exist_ok=True)
+    for rel in changed:
+        member = files[rel]
+        target = os.path.join(dest_dir, rel)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.unlink(target)  # never write through a hard link into a blob
+        except FileNotFoundError:
+            pass
+        key, inflated = _place_member(z, member, target, store, stored)
+        decompressed += inflated
+        members[rel] = [member.CRC, member.file_size, key]
+    return members, decompressed
+
+def extract_zip(zip_path: Path, dest_dir: Path, cancel: CancelToken | None = None):
+    """Bring `dest_dir` up to date with the archive at `zip_path`.
+
+    With a complete index of the previous extraction only added or changed
+    members (by CRC and size) are written and removed ones deleted; otherwise
+    the tree is rebuilt in a sibling staging folder and swapped in once complete.
+    Cancellation is honoured until files in `dest_dir` start to change, so a
+    cancelled or failed rebuild leaves the previous tree intact. Member content
+    goes through the de-duplicated blob store (see above).
+    """
+    store = _private_dir(_blob_dir(dest_dir))
+    stored = {entry.name: False for entry in os.scandir(store)}
+    index = _load_extract_index(dest_dir)
+    with span("extract") as sp, open_archive(zip_path) as z:
+        files: dict[str, zipfile.ZipInfo] = {}
+        dirs: list[str] = []
+        for member in z.infolist():
+            rel = _member_relpath(member.filename)
+            if rel is None:
+                continue
+            if member.is_dir():
+                dirs.append(rel)
+            else:
+                files[rel] = member
+        changed = removed = None
+        if index is not None:
+            old = index["members"]
+            present = _tree_file_sizes(dest_dir)
+            changed = [rel for rel, m in files.items()
+                       if old.get(rel, [None, None])[:2] != [m.CRC, m.file_size] or present.get(rel) != m.file_size]
+            removed = [rel for rel in old if rel not in files]
+        if changed is None or len(changed) + len(removed) > EXTRACT_REBUILD_FRACTION * max(1, len(files)):
+            members, decompressed = _extract_full(z, files, dirs, dest_dir, store, stored, cancel)
+            sp.set(mode="full", written=len(files), removed=0)
+        elif not changed and not removed:
+            members = None  # same content: keep the stamp so the catalog cache stays valid
+            sp.set(mode="unchanged", written=0, removed=0, files=len(files))
+        else:
+            _check(cancel)
+            try:
+                members, decompressed = _extract_changes(z, files, dirs, dest_dir, old, changed, removed, store, stored)
+                sp.set(mode="incremental", written=len(changed), removed=len(removed))
+            except (IsADirectoryError, NotADirectoryError, FileExistsError) as e:
+                # A file and a folder still fight over a path (e.g. a leftover empty
+                # folder from the old archive): rebuild. The tree is already changing,
+                # so this is no longer cancellable.
+                logging.info(f"Incremental extraction hit a file/folder conflict ({e}); rebuilding")
+                members, decompressed = _extract_full(z, files, dirs, dest_dir, store, stored, None)
+                sp.set(mode="full", written=len(files), removed=0)
+        if members is not None:
+            sp.set(files=len(files), bytes=sum(m.file_size for m in files.values()),
+                   unique=len({m[2] for m in members.values()}), decompressed=decompressed)
+    release_archive(zip_path)  # extraction is the last reader of the buffer
+    if members is None:
+        return
+    _write_extract_index(dest_dir, members)
+    _prune_blobs(store, {m[2] for m in members.values()})  # the tree's links keep anything still in use alive
+
+def _casefold(s: str) -> str:
+    return s.replace("\\", "/").lower()
+
+@timed("catalog", lambda r: {"files": len(r[0]) + len(r[1])})
+def collect_repo_profiles_robust(extracted_root: Path):
+    filament_items = []
+    process_items  = []
+    for p in extracted_root.rglob("*"):
+        if not p.is_file(): continue
+        ext  = p.suffix.lower()
+        path = _casefold(str(p))
+        if "/prusaslicer/" in path and ext in PRUSA_EXTS:
+            if "/filament/" in path:
+                filament_items.append({"slicer":"PrusaSlicer","src":p})
+            elif "/print/" in path:
+                process_items.append({"slicer":"PrusaSlicer","src":p,"category":"print"})
+            continue
+        if "/orcaslicer/" in path and ext in JSON_EXTS:
+            if "/filament/" in path:
+                filament_items.append({"slicer":"OrcaSlicer","src":p})
+            elif "/process/" in path:
+                process_items.append({"slicer":"OrcaSlicer","src":p,"category":"process"})
+            continue
+        if ("/anycubicslicer/" in path or "/anycubicslicernext/" in path) and ext in JSON_EXTS:
+            if "/filament/" in path:
+                filament_items.append({"slicer":"AnyCubicSlicer","src":p})
+            elif "/process/" in path:
+                process_items.append({"slicer":"AnyCubicSlicer","src":p,"category":"process"})
+            continue
+        if ("/bambustudio/" in path or "/bambu studio/" in path) and ext in JSON_EXTS:
+            if "/filament/" in path:
+                filament_items.append({"slicer":"BambuStudio","src":p})
+            elif "/process/" in path:
+                process_items.append({"slicer":"BambuStudio","src":p,"category":"process"})
+            continue
+        if ("/snapmakerorca/" in path or "/snapmaker_orca/" in path or "/snapmaker orca/" in path) and ext in JSON_EXTS:
+            if "/filament/" in path:
+                filament_items.append({"slicer":"SnapmakerOrca","src":p})
+            elif "/process/" in path:
+                process_items.append({"slicer":"SnapmakerOrca","src":p,"category":"process"})
+            continue
+        if ("/qidistudio/" in path or "/qidi studio/" in path) and ext in JSON_EXTS:
+            if "/filament/" in path:
+                filament_items.append({"slicer":"QIDIStudio","src":p})
+            elif "/process/" in path:
+                process_items.append({"slicer":"QIDIStudio","src":p,"category":"process"})
+            continue
+    return filament_items, process_items
+
+# ========= VALIDATION =========
+# Below this many uncached files, parsing inline beats the cost of starting worker processes.
+VALIDATE_POOL_MIN = 64
+VALIDATION_CACHE_MAX = 20000
+
+def _parse_profile_bytes(data: bytes, ext: str) -> str:
+    """Parse one profile; returns "" when valid, else a short error message."""
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        return f"not UTF-8: {e}"
+    if ext in JSON_EXTS:
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError as e:
+            return f"invalid JSON: {e}"
+        if not isinstance(obj, dict):
+            return "invalid JSON: top level is not an object"
+        return ""
+    # PrusaSlicer .ini: flat `key = value` lines, optionally followed by [type:name] sections.
+    cp = configparser.RawConfigParser(strict=False, delimiters=("=",), comment_prefixes=("#", ";"))
+    try:
+        cp.read_string("[__root__]\n" + text)
+    except configparser.ParsingError as e:
+        lineno, line = e.errors[0]
+        return f"invalid INI: line {lineno - 1}: {line.strip()[:60]}"  # -1 for the synthetic header
+    except configparser.Error as e:
+        return f"invalid INI: {e}".splitlines()[0]
+    return ""
+
+def _validate_worker(batch: list[tuple[str, bytes, str]]) -> list[tuple[str, str]]:
+    return [(digest, _parse_profile_bytes(data, ext)) for digest, data, ext in batch]
+
+def _load_validation_cache() -> dict[str, str]:
+    try:
+        with open(VALIDATION_CACHE, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _save_validation_cache(cache: dict[str, str]):
+    if len(cache) > VALIDATION_CACHE_MAX:
+        cache = dict(list(cache.items())[-VALIDATION_CACHE_MAX:])
+    try:
+        ensure_dir(VALIDATION_CACHE.parent)
+        tmp = VALIDATION_CACHE.with_name(VALIDATION_CACHE.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp, VALIDATION_CACHE)
+    except OSError as e:
+        logging.warning(f"Could not write validation cache: {e}")
+
+def validate_profiles(paths, workers: int | None = None, hashes: dict | None = None) -> dict[Path, str]:
+    """Parse every profile (JSON for the Orca family, INI for PrusaSlicer).
+
+    Results are cached by content sha256 in VALIDATION_CACHE, so unchanged files
+    are never parsed twice. Uncached files are parsed on a process pool when
+    there are enough of them to pay for it. Returns {path: error} for failures only;
+    pass a dict as `hashes` to also get {path: sha256} for every readable file.
+    """
+    with span("validate") as sp:
+        cache = _load_validation_cache()
+        failures: dict[Path, str] = {}
+        pending: dict[str, tuple[bytes, str]] = {}
+        by_digest: dict[str, list[Path]] = {}
+        for p in dict.fromkeys(paths):
+            try:
+                data = p.read_bytes()
+            except OSError as e:
+                failures[p] = f"unreadable: {e}"
+                continue
+            digest = hashlib.sha256(data).hexdigest()
+            if hashes is not None:
+                hashes[p] = digest
+            by_digest.setdefault(digest, []).append(p)
+            if digest not in cache and digest not in pending:
+                pending[digest] = (data, p.suffix.lower())
+
+        if pending:
+            batch = [(d, data, ext) for d, (data, ext) in pending.items()]
+            results = None
+            if len(batch) >= VALIDATE_POOL_MIN:
+                n = max(1, min(workers or os.cpu_count() or 1, 8))
+                chunks = [batch[i::n] for i in range(n)]
+                try:
+                    # Imported here: multiprocessing is not needed on the common cached path.
+                    from concurrent.futures import ProcessPoolExecutor
+                    with ProcessPoolExecutor(max_workers=n) as pool:
+                        results = [r for part in pool.map(_validate_worker, chunks) for r in part]
+                except Exception as e:
+                    logging.warning(f"Validation pool unavailable, validating inline: {e}")
+            if results is None:
+                results = _validate_worker(batch)
+            cache.update(results)
+            _save_validation_cache(cache)
+
+        for digest, ps in by_digest.items():
+            err = cache.get(digest, "")
+            if err:
+                for p in ps:
+                    failures[p] = err
+        sp.set(files=len(by_digest), parsed=len(pending), cached=len(by_digest) - len(pending), invalid=len(failures))
+    logging.info(f"Validated {len(by_digest)} profiles ({len(pending)} parsed, {len(failures)} invalid)")
+    return failures
+
+def _log_validation_failures(failures: dict[Path, str]):
+    for p, err in sorted(failures.items()):
+        logging.error(f"Invalid profile, not installing {p.name}: {err}")
+
+# ========= INHERITANCE =========
+# Orca-family JSON presets name a parent through `inherits`. The index maps each
+# (slicer, category, preset name) to its file and each child file to its parent
+# file, so selection can pull in parents with plain dict lookups. Parents that
+# are not in the repo (usually the slicer's own system presets) are reported as
+# dangling.
+_INHERITS_CACHE: dict[str, dict] = {}
+
+def build_inherits_index(items: list[dict], digest: str | None = None) -> dict:
+    """Index `inherits` edges of the catalog; cached per archive sha256 when `digest` is given.
+
+    A parent is looked up within the child's own category, as the slicers do:
+    a filament and a process preset may share a name.
+
+    Returns {"by_name": {(slicer, category, name): src}, "parents": {src: parent_src},
+    "dangling": {src: parent_name}}.
+    """
+    if digest and digest in _INHERITS_CACHE:
+        return _INHERITS_CACHE[digest]
+    by_name: dict[tuple[str, str, str], Path] = {}
+    wanted: dict[Path, tuple[str, str, str]] = {}
+    for it in items:
+        src = it["src"]
+        if src.suffix.lower() not in JSON_EXTS:
+            continue
+        try:
+            obj = json.loads(src.read_bytes().decode("utf-8-sig"))
+        except (OSError, ValueError):
+            continue  # reported by validate_profiles
+        if not isinstance(obj, dict):
+            continue
+        category = it.get("category", "filament")
+        name = obj.get("name")
+        by_name[(it["slicer"], category, name if isinstance(name, str) and name else src.stem)] = src
+        parent = obj.get("inherits")
+        if isinstance(parent, str) and parent.strip():
+            wanted[src] = (it["slicer"], category, parent.strip())
+
+    parents: dict[Path, Path] = {}
+    dangling: dict[Path, str] = {}
+    for src, key in wanted.items():
+        parent_src = by_name.get(key)
+        if parent_src is None:
+            dangling[src] = key[2]
+        elif parent_src != src:
+            parents[src] = parent_src
+    index = {"by_name": by_name, "parents": parents, "dangling": dangling}
+    if dangling:
+        logging.info(f"{len(dangling)} profiles inherit presets that are not in the repo")
+    if digest:
+        _INHERITS_CACHE.clear()  # only the current archive is ever needed
+        _INHERITS_CACHE[digest] = index
+    return index
+
+def required_parents(index: dict, src: Path) -> list[Path]:
+    """Parent chain of `src` within the repo, nearest first (cycle-safe)."""
+    chain: list[Path] = []
+    seen = {src}
+    parent = index["parents"].get(src)
+    while parent is not None and parent not in seen:
+        chain.append(parent)
+        seen.add(parent)
+        parent = index["parents"].get(parent)
+    return chain
+
+# ========= CATALOG CACHE =========
+# The wizard's classified catalog (slicer, category, preset name and content
+# sha256 per profile, plus parse failures and inherits edges) is kept per archive
+# sha256, so the next start can show the lists at once and revalidate in the
+# background. It is only trusted while the extracted folder still has the
+# contents it describes (see extraction_stamp()).
+CATALOG_CACHE_VERSION = 1
+
+def save_catalog_cache(extract_dir: Path, digest: str, filament: list[dict], process: list[dict],
+                       invalid: dict[Path, str], inherits: dict, validators: dict | None = None):
+    """Persist the catalog of `extract_dir` (from the archive with sha256 `digest`)."""
+    names = {src: name for (_slicer, _category, name), src in inherits.get("by_name", {}).items()}
+
+    def rel(p: Path) -> str:
+        return p.relative_to(extract_dir).as_posix()
+
+    def entry(it: dict) -> dict:
+        e = {"slicer": it["slicer"], "path": rel(it["src"]), "sha256": it.get("sha256")}
+        if it["src"] in names:
+            e["name"] = names[it["src"]]
+        if "category" in it:
+            e["category"] = it["category"]
+        return e
+
+    try:
+        doc = {
+            "version": CATALOG_CACHE_VERSION, "sha256": digest,
+            "root": str(extract_dir), "root_key": extraction_stamp(extract_dir),
+            "etag": (validators or {}).get("etag"), "last_modified": (validators or {}).get("last_modified"),
+            "filament": [entry(it) for it in filament],
+            "process": [entry(it) for it in process],
+            "invalid": {rel(p): err for p, err in invalid.items()},
+            "parents": {rel(c): rel(p) for c, p in inherits.get("parents", {}).items()},
+            "dangling": {rel(c): name for c, name in inherits.get("dangling", {}).items()},
+        }
+        _write_atomic(CATALOG_CACHE, json.dumps(doc))
+    except (OSError, ValueError) as e:
+        logging.warning(f"Could not save catalog cache: {e}")
+
+@timed("catalog.cached", lambda r: {"hit": r is not None})
+def load_catalog_cache(extract_dir: Path) -> dict | None:
+    """The saved catalog of `extract_dir`, or None if missing or the folder changed since.
+
+    Returns {"sha256", "filament", "process", "invalid", "inherits", "etag",
+    "last_modified"} shaped like a fresh catalog (items carry "src" paths).
+    """
+    try:
+        with open(CATALOG_CACHE, "r", encoding="utf-8") as f:
+            doc = json.load(f)
+        if (not isinstance(doc, dict) or doc.get("version") != CATALOG_CACHE_VERSION
+                or doc.get("root") != str(extract_dir) or doc.get("root_key") is None
+                or doc.get("root_key") != extraction_stamp(extract_dir)):
+            return None
+        by_name: dict[tuple[str, str, str], Path] = {}
+
+        def item(e: dict) -> dict:
+            it = {"slicer": e["slicer"], "src": extract_dir / e["path"], "sha256": e.get("sha256")}
+            if "category" in e:
+                it["category"] = e["category"]
+            if "name" in e:
+                by_name[(e["slicer"], e.get("category", "filament"), e["name"])] = it["src"]
+            return it
+
+        filament = [item(e) for e in doc["filament"]]
+        process = [item(e) for e in doc["process"]]
+        inherits = {
+            "by_name": by_name,
+            "parents": {extract_dir / c: extract_dir / p for c, p in doc["parents"].items()},
+            "dangling": {extract_dir / c: name for c, name in doc["dangling"].items()},
+        }
+        return {
+            "sha256": doc["sha256"], "etag": doc.get("etag"), "last_modified": doc.get("last_modified"),
+            "filament": filament, "process": process, "inherits": inherits,
+            "invalid": {extract_dir / p: err for p, err in doc["invalid"].items()},
+        }
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+# ========= STATE =========
+def read_installed_set() -> set[Path]:
+    s = set()
+    if INSTALLED_LIST.exists():
+        with open(INSTALLED_LIST, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line: s.add(Path(line))
+    return s
+
+@timed("manifest")
+def rewrite_installed_list(remove_paths: list[Path], add_paths: list[Path]):
+    current = read_installed_set()
+    for p in remove_paths: current.discard(Path(p))
+    for p in add_paths:    current.add(Path(p))
+    try:
+        INSTALLED_LIST.parent.mkdir(parents=True, exist_ok=True)
+        with open(INSTALLED_LIST, 'w', encoding='utf-8') as f:
+            for p in sorted(current):
+                f.write(str(p) + "\n")
+    except Exception:
+        pass
+
+def uninstall_installed_files(dry_run: bool = False) -> tuple[int, int]:
+    with span("uninstall") as sp:
+        current = read_installed_set()
+        total = len(current); deleted = 0
+        for p in list(current):
+            if p.exists() and p.is_file():
+                log_file_event("removed", f"Uninstall: removing {p}")
+                if not dry_run:
+                    try:
+                        p.unlink(); deleted += 1
+                    except Exception as e:
+                        logging.error(f"Failed to remove {p}: {e}")
+            else:
+                log_file_event("not found", f"Uninstall: not found {p}")
+        if not dry_run:
+            rewrite_installed_list(remove_paths=list(current), add_paths=[])
+        sp.set(files=total, removed=deleted, dry_run=dry_run)
+    return (deleted, total)
+
+# ========= BACKUPS =========
+# Before an install overwrites or deletes a destination file, its current bytes
+# go into BACKUP_DIR/objects, zlib-compressed and named by their sha256, so a
+# file that was already saved by an earlier run costs nothing. Each run writes
+# one manifest (BACKUP_DIR/runs/<run-id>.json) listing what it changed; files
+# the run created are listed too, so restore_backup() can return every touched
+# path to its previous state, including its owner and mode. Identical rewrites
+# are never backed up.
+# The backups live under the shared temp folder but hold other users' presets
+# (multi-user installs), so BACKUP_DIR is private to whoever runs the installer:
+# 0700, files 0600, and a folder someone else created first is never used.
+BACKUP_KEEP_RUNS = 20
+
+def _backup_root() -> Path:
+    """BACKUP_DIR, created private to the current user (see _private_dir())."""
+    return _private_dir(BACKUP_DIR)
+
+def _write_private(path: Path, data: bytes):
+    """Atomically write `data` to `path` with mode 0600."""
+    os.makedirs(path.parent, 0o700, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o600)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        _remove_quietly(tmp)
+        raise
+
+class BackupRun:
+    """Collects the backups of one install run; call commit() when the run ends. Thread-safe.
+
+    If the backup folder cannot be used safely the run is disabled: the error
+    is logged and the install goes ahead without backups.
+    """
+    def __init__(self, mode: str):
+        self.run_id = time.strftime("%Y%m%d-%H%M%S") + f"-{random.getrandbits(16):04x}"
+        self.mode = mode
+        self.entries: dict[str, dict] = {}
+        self.stored_bytes = 0
+        self.new_objects = 0
+        self._installed: set[Path] | None = None
+        self._lock = threading.Lock()
+        try:
+            _backup_root()
+            self.enabled = True
+        except OSError as e:
+            logging.error(f"Backups disabled for this run: {e}")
+            self.enabled = False
+
+    def _tracked(self, path: Path) -> bool:
+        if self._installed is None:
+            self._installed = read_installed_set()
+        return path in self._installed
+
+    def _store(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        obj = BACKUP_DIR / "objects" / digest[:2] / digest
+        if not obj.exists():
+            packed = zlib.compress(data, 6)
+            _write_private(obj, packed)
+            with self._lock:
+                self.stored_bytes += len(packed)
+                self.new_objects += 1
+        return digest
+
+    def before_change(self, path: Path, src: Path | None = None, delete: bool = False):
+        """Save `path` before it is overwritten (by `src`, if known) or deleted.
+
+        Nothing is saved when `src` has the same content; a missing `path` is
+        recorded as created by this run. Only the first change per path counts.
+        """
+        if not self.enabled or str(path) in self.entries:
+            return
+        try:
+            data = path.read_bytes()
+            st = path.stat()
+        except FileNotFoundError:
+            data = st = None
+        if data is not None and src is not None and not delete and _same_file_content(src, path):
+            return
+        self.record(path, data, st, delete=delete)
+
+    def record(self, path: Path, data: bytes | None, st: os.stat_result | None, delete: bool = False,
+               home: Path | None = None):
+        """before_change() for content the caller has already read; None means `path` did not exist.
+
+        `home` is the folder a root multi-user install walked down from to reach
+        `path`; restore_backup() walks the same way.
+        """
+        key = str(path)
+        if not self.enabled or key in self.entries:
+            return
+        if data is None:
+            entry = {"path": key, "action": "created"}
+        else:
+            entry = {"path": key, "action": "deleted" if delete else "overwritten",
+                     "sha256": self._store(data), "size": len(data), "mtime_ns": st.st_mtime_ns,
+                     "uid": st.st_uid, "gid": st.st_gid, "mode": stat.S_IMODE(st.st_mode)}
+        if home is not None:
+            entry["home"] = str(home)
+        with self._lock:
+            if key in self.entries:
+                return
+            entry["tracked"] = self._tracked(path)
+            self.entries[key] = entry
+
+    def commit(self) -> Path | None:
+        """Write the run manifest (if anything changed) and prune old runs; returns its path."""
+        with span("backup") as sp:
+            saved = sum(1 for e in self.entries.values() if e["action"] != "created")
+            sp.set(files=saved, created=len(self.entries) - saved, stored=self.stored_bytes, objects=self.new_objects)
+            if not self.entries:
+                return None
+            doc = {"run_id": self.run_id, "mode": self.mode, "created": time.time(),
+                   "entries": sorted(self.entries.values(), key=lambda e: e["path"])}
+            path = BACKUP_DIR / "runs" / f"{self.run_id}.json"
+            try:
+                _write_private(path, json.dumps(doc, indent=1).encode("utf-8"))
+                _prune_backups()
+            except OSError as e:
+                logging.error(f"Could not write backup manifest {path}: {e}")
+                return None
+        logging.info(
+            f"Backup {self.run_id}: {saved} files saved ({self.new_objects} new, "
+            f"{humanize_bytes(self.stored_bytes)} stored); restore with --restore {self.run_id}"
+        )
+        return path
+
+def list_backups() -> list[dict]:
+    """Run manifests, oldest first (none if the backup folder is not private to us)."""
+    try:
+        _backup_root()
+    except OSError as e:
+        logging.error(f"Not reading backups: {e}")
+        return []
+    runs = []
+    for p in sorted((BACKUP_DIR / "runs").glob("*.json")):
+        try:
+            runs.append(json.loads(p.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            logging.warning(f"Unreadable backup manifest: {p}")
+    return runs
+
+def _prune_backups(keep: int = BACKUP_KEEP_RUNS):
+    """Drop all but the newest `keep` runs and the objects only they referenced."""
+    runs = sorted((BACKUP_DIR / "runs").glob("*.json"))
+    if len(runs) <= keep:
+        return
+    for p in runs[:-keep]:
+        _remove_quietly(p)
+    live = {e.get("sha256") for run in list_backups() for e in run.get("entries", [])}
+    for obj in (BACKUP_DIR / "objects").glob("*/*"):
+        if obj.name not in live:
+            _remove_quietly(obj)
+
+@timed("restore")
+def restore_backup(run_id: str, dry_run: bool = False) -> tuple[int, int]:
+    """Put back every file run `run_id` overwrote or deleted and remove the files it created.
+
+    `run_id` may be "latest". Restored files get back their mode and, when
+    running as root, their owner. Run as root, entries written by a multi-user
+    install are restored and removed from their home folder down without
+    following symlinks, like the install wrote them (see _open_dir_below()).
+    Returns (restored, total). Raises ValueError for an unknown run.
+    """
+    as_root = hasattr(os, "geteuid") and os.geteuid() == 0
+    runs = list_backups()
+    if run_id == "latest" and runs:
+        run = runs[-1]
+    else:
+        run = next((r for r in runs if r.get("run_id") == run_id), None)
+    if run is None:
+        raise ValueError(f"No backup run '{run_id}' in {BACKUP_DIR / 'runs'}")
+    restored = 0
+    tracked_add: list[Path] = []
+    tracked_remove: list[Path] = []
+    for e in run["entries"]:
+        path = Path(e["path"])
+        log_file_event("restored", f"Restore {run['run_id']}: {e['action']} {path}")
+        if dry_run:
+            continue
+        home = Path(e["home"]) if as_root and e.get("home") else None
+        try:
+            if e["action"] == "created":
+                if home is not None:
+                    _unlink_below(home, path)
+                else:
+                    path.unlink(missing_ok=True)
+                tracked_remove.append(path)
+            else:
+                obj = BACKUP_DIR / "objects" / e["sha256"][:2] / e["sha256"]
+                data = zlib.decompress(obj.read_bytes())
+                if hashlib.sha256(data).hexdigest() != e["sha256"]:
+                    raise ValueError("backup object is corrupt")
+                if home is not None:
+                    dfd = _open_dir_below(home, path.parent, (e["uid"], e["gid"]))
+                    try:
+                        _restore_file(path, data, e, dir_fd=dfd)
+                    finally:
+                        os.close(dfd)
+                else:
+                    ensure_dir(path.parent)
+                    _restore_file(path, data, e)
+                (tracked_add if e.get("tracked") else tracked_remove).append(path)
+            restored += 1
+        except (OSError, ValueError, zlib.error) as err:
+            logging.error(f"Could not restore {path}: {err}")
+    if not dry_run:
+        rewrite_installed_list(remove_paths=tracked_remove, add_paths=tracked_add)
+    logging.info(f"Restore {run['run_id']}: {restored}/{len(run['entries'])} files")
+    return restored, len(run["entries"])
+
+def _restore_file(path: Path, data: bytes, entry: dict, dir_fd: int | None = None):
+    """Write `data` to `path` through a fresh temp file, then re-apply the entry's mode, owner and mtime.
+
+    With `dir_fd` (the open parent folder of `path`) both files are named relative to it.
+    """
+    tmp_name = f".{path.name}.{random.getrandbits(32):08x}.restore"
+    name, tmp = (path.name, tmp_name) if dir_fd is not None else (str(path), str(path.with_name(tmp_name)))
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_BINARY", 0)
+    fd = os.open(tmp, flags, 0o600, dir_fd=dir_fd)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            # All metadata goes through the descriptor of the file we just created.
+            if "uid" in entry and hasattr(os, "fchown") and os.geteuid() == 0:
+                os.fchown(f.fileno(), entry["uid"], entry["gid"])
+            if "mode" in entry and hasattr(os, "fchmod"):
+                os.fchmod(f.fileno(), entry["mode"])
+            f.flush()
+            os.utime(f.fileno() if os.utime in os.supports_fd else tmp, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+        if "mode" in entry and not hasattr(os, "fchmod"):
+            os.chmod(tmp, entry["mode"])
+        os.replace(tmp, name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)  # replaces a symlink at `path` itself, never its target
+    except BaseException:
+        try:
+            os.unlink(tmp, dir_fd=dir_fd)
+        except OSError:
+            pass
+        raise
+
+def download_profiles_zip(zip_path: Path, cancel: CancelToken | None = None) -> str:
+    """Download the profiles ZIP to `zip_path`, validate it and return its sha256."""
+    fetch_url_to_file(GITHUB_ZIP_URL, zip_path, cancel=cancel)
+    digest = verify_profiles_zip(zip_path)
+    logging.info(f"ZIP sha256 = {digest}")
+    return digest
+
+@timed("check_download")
+def check_download_only() -> None:
+    """Download and validate the profiles ZIP without installing anything."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    zip_path = CACHE_DIR / "profiles.zip"
+    extract_dir = CACHE_DIR / "profiles_extracted"
+
+    logging.info(f"Download check: {GITHUB_ZIP_URL}")
+    digest = download_profiles_zip(zip_path)
+
+    extract_zip(zip_path, extract_dir)
+    fil, proc = collect_repo_profiles_robust(extract_dir)
+    logging.info(f"Extract OK. Found {len(fil)} filament + {len(proc)} process profiles.")
+
+    # Write a small marker file for quick verification (useful for windowed EXE).
+    try:
+        TEMP_ROOT.mkdir(parents=True, exist_ok=True)
+        marker = TEMP_ROOT / "download_check_ok.txt"
+        marker.write_text(
+            f"OK\nsha256={digest}\nurl={GITHUB_ZIP_URL}\nfilament={len(fil)}\nprocess={len(proc)}\n",
+            encoding='utf-8',
+        )
+        logging.info(f"Wrote marker: {marker}")
+    except Exception as e:
+        logging.warning(f"Could not write marker file: {e}")
+
+def detect_slicers(base: Path, home: Path | None = None) -> list[str]:
+    targets = slicer_targets_from_base(base, home)
+    status = detect_all_slicers(targets, count_limit=0)
+    return [s for s, (_files, detected) in status.items() if detected]
+
+def detect_all_slicers(targets_by_slicer: dict, count_limit: int = DETECT_COUNT_LIMIT) -> dict[str, tuple[int, bool]]:
+    """Detection status for every slicer: name -> (files_found, detected)."""
+    return {s: detect_slicer_status(cats, count_limit) for s, cats in targets_by_slicer.items()}
+
+def detect_slicer_status(targets: dict[str, Path | list[Path]], count_limit: int = DETECT_COUNT_LIMIT) -> tuple[int, bool]:
+    """Return (files_found, detected) for one slicer's target folders.
+
+    `files_found` is capped at `count_limit`; pass 0 to skip counting entirely
+    (silent mode only needs to know whether the slicer is there).
+    """
+    files_found = _count_target_files(targets, limit=count_limit) if count_limit > 0 else 0
+    detected = files_found > 0 or _target_paths_exist(targets)
+    return files_found, detected
+
+def _slicer_status_text(files_found: int, detected: bool, count_limit: int = DETECT_COUNT_LIMIT) -> tuple[str, str]:
+    if files_found >= count_limit > 0:
+        return (f"✔ {count_limit}+ profiles detected", "#0a8f08")
+    if files_found > 0:
+        return (f"✔ {files_found} profiles detected", "#0a8f08")
+    if detected:
+        return ("✔ Slicer detected", "#0a8f08")
+    return ("✘ Not detected", "#c60000")
+
+def _target_paths_exist(targets: dict[str, Path | list[Path]]) -> bool:
+    for path_value in targets.values():
+        if isinstance(path_value, list):
+            for path in path_value:
+                if path.exists() or path.parent.exists():
+                    return True
+        else:
+            if path_value.exists() or path_value.parent.exists():
+                return True
+    return False
+
+def _count_files_under(root: Path, limit: int | None = None) -> int:
+    """Count regular files below `root` with os.scandir, stopping at `limit`."""
+    count = 0
+    stack = [str(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        count += 1
+                        if limit is not None and count >= limit:
+                            return count
+                except OSError:
+                    continue
+    return count
+
+def _count_target_files(targets: dict[str, Path | list[Path]], limit: int | None = None) -> int:
+    files_found = 0
+    for path in _flatten_target_paths(targets):
+        remaining = None if limit is None else limit - files_found
+        if remaining is not None and remaining <= 0:
+            break
+        files_found += _count_files_under(path, remaining)
+    return files_found
+
+def _flatten_target_paths(targets: dict[str, Path | list[Path]]) -> list[Path]:
+    paths: list[Path] = []
+    for path_value in targets.values():
+        if isinstance(path_value, list):
+            paths.extend(path_value)
+        else:
+            paths.append(path_value)
+    return _unique_paths(paths)
+
+def _target_root_for_display(slicer_name: str, target_path: Path) -> Path:
+    if slicer_name == "PrusaSlicer":
+        return target_path.parent
+    if slicer_name in {"OrcaSlicer", "BambuStudio", "SnapmakerOrca", "AnyCubicSlicer", "QIDIStudio"}:
+        return target_path.parent.parent.parent
+    return target_path.parent
+
+def _display_base_for_slicer(slicer_name: str, targets: dict[str, Path | list[Path]]) -> Path:
+    candidates = [_target_root_for_display(slicer_name, path) for path in _flatten_target_paths(targets)]
+    candidates = _unique_paths(candidates)
+
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+
+    return candidates[0] if candidates else appdata_base()
+
+def slicer_watch_paths(slicer_name: str, targets: dict[str, Path | list[Path]]) -> list[Path]:
+    """Existing folders to watch so new installs/accounts of `slicer_name` are noticed.
+
+    Watches the slicer root and its `user` folder. Missing folders are replaced by
+    their nearest existing ancestor (at most two levels up, so we never end up
+    watching a whole home folder), so the first launch of a slicer is seen too.
+    """
+    wanted: list[Path] = []
+    for path in _flatten_target_paths(targets):
+        root = _target_root_for_display(slicer_name, path)
+        wanted.append(root)
+        if slicer_name != "PrusaSlicer":
+            wanted.append(root / "user")
+
+    out: list[Path] = []
+    for path in _unique_paths(wanted):
+        probe = path
+        for _level in range(2):
+            if probe.is_dir():
+                break
+            probe = probe.parent
+        if probe.is_dir():
+            out.append(probe)
+    return _unique_paths(out)
+
+@timed("plan", lambda plan: {"files": len(plan)})
+def build_copy_plan(items: list[dict], targets: dict) -> list[tuple[Path, Path]]:
+    """Map repo profiles onto the resolved slicer targets as (src, dst) pairs."""
+    plan = []
+    for it in items:
+        cat = it.get("category", "filament")
+        base_path = targets.get(it["slicer"], {}).get(cat)
+        if not base_path:
+            continue
+        if isinstance(base_path, list):
+            for bp in base_path:
+                plan.append((it["src"], bp / it["src"].name))
+        else:
+            plan.append((it["src"], base_path / it["src"].name))
+    return plan
+
+def _same_file_content(src: Path, dst: Path) -> bool:
+    try:
+        if src.stat().st_size != dst.stat().st_size:
+            return False
+        return src.read_bytes() == dst.read_bytes()
+    except OSError:
+        return False
+
+# A root-run multi-user install writes into folders their users control, so it
+# must not follow a symlink a user planted there: destinations are reached from
+# the home folder one component at a time with O_NOFOLLOW, checked to be regular
+# files, and replaced through a temp file in the same folder.
+def _open_dir_below(home: Path, d: Path, owner: tuple[int, int] | None) -> int:
+    """Directory fd for `d`, walked down from `home` without following symlinks.
+
+    Missing folders are created and handed to `owner` (uid, gid); with no
+    `owner` they are not created (FileNotFoundError). Raises OSError
+    (ELOOP/ENOTDIR) when a component is a symlink or not a folder.
+    """
+    flags = os.O_RDONLY | os.O_DIRECTORY
+    fd = os.open(home, flags)
+    try:
+        for part in d.relative_to(home).parts:
+            if owner is not None:
+                try:
+                    os.mkdir(part, 0o755, dir_fd=fd)
+                except FileExistsError:
+                    pass
+                else:
+                    os.chown(part, *owner, dir_fd=fd, follow_symlinks=False)
+            child = os.open(part, flags | os.O_NOFOLLOW, dir_fd=fd)
+            os.close(fd)
+            fd = child
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
+
+def _unlink_below(home: Path, path: Path):
+    """Remove `path` (if present) reached from `home` without following symlinks."""
+    try:
+        dfd = _open_dir_below(home, path.parent, None)
+    except FileNotFoundError:
+        return
+    try:
+        os.unlink(path.name, dir_fd=dfd)
+    except FileNotFoundError:
+        pass
+    finally:
+        os.close(dfd)
+
+def _replace_file_below(src: Path, dst: Path, home: Path, owner: tuple[int, int],
+                        backup: BackupRun | None = None) -> int | None:
+    """Copy `src` over `dst` below `home` without following symlinks.
+
+    Returns the bytes written, or None when `dst` already holds the same content.
+    Raises OSError when `dst` or one of its folders is a symlink or not a regular file.
+    """
+    dfd = _open_dir_below(home, dst.parent, owner)
+    try:
+        name = dst.name
+        current = None
+        try:
+            # O_NONBLOCK: opening a planted FIFO must not hang the worker.
+            fd = os.open(name, os.O_RDONLY | os.O_NOFOLLOW | os.O_NONBLOCK, dir_fd=dfd)
+        except FileNotFoundError:
+            pass
+        else:
+            with os.fdopen(fd, "rb") as f:
+                st = os.fstat(f.fileno())
+                if not stat.S_ISREG(st.st_mode):
+                    raise OSError(f"not a regular file: {dst}")
+                current = (f.read(), st)
+        data = src.read_bytes()
+        if current is not None and current[0] == data:
+            return None
+        if backup is not None:
+            backup.record(dst, *(current or (None, None)), home=home)
+        tmp = f".{name}.{random.getrandbits(32):08x}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_NOFOLLOW, 0o644, dir_fd=dfd)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                out.write(data)
+            os.chown(tmp, *owner, dir_fd=dfd, follow_symlinks=False)
+            src_st = src.stat()
+            os.utime(tmp, ns=(src_st.st_atime_ns, src_st.st_mtime_ns), dir_fd=dfd, follow_symlinks=False)
+            os.replace(tmp, name, src_dir_fd=dfd, dst_dir_fd=dfd)
+        except BaseException:
+            try:
+                os.unlink(tmp, dir_fd=dfd)
+            except OSError:
+                pass
+            raise
+        return len(data)
+    finally:
+        os.close(dfd)
+
+def execute_copy_plan(plan: list[tuple[Path, Path]], home: Path | None = None,
+                      cancel: CancelToken | None = None, backup: BackupRun | None = None) -> tuple[list[Path], int]:
+    """Copy every (src, dst) whose destination differs; returns (installed, unchanged_count).
+
+    Destinations that already hold identical content are recorded as installed
+    but not rewritten. With `home` and running as root, destinations below it
+    are written without following symlinks and handed to the home's owner (see
+    above); refused destinations are logged and skipped. With a `backup`, each
+    destination is saved before it is overwritten.
+    """
+    owner = _home_owner(home) if home is not None else None
+    with span("copy") as sp:
+        added: list[Path] = []
+        unchanged = copied_bytes = refused = 0
+        for src, dst in plan:
+            if cancel is not None and cancel.cancelled:
+                logging.warning(f"Copy cancelled after {len(added)} of {len(plan)} files")
+                break
+            if owner is not None:
+                try:
+                    written = _replace_file_below(src, dst, home, owner, backup)
+                except (OSError, ValueError) as e:
+                    logging.warning(f"Refusing to write {dst}: {e}")
+                    refused += 1
+                    continue
+                if written is None:
+                    unchanged += 1
+                    added.append(dst)
+                    continue
+                copied_bytes += written
+            else:
+                if _same_file_content(src, dst):
+                    unchanged += 1
+                    added.append(dst)
+                    continue
+                if backup is not None:
+                    backup.before_change(dst)
+                ensure_dir(dst.parent)
+                shutil.copy2(src, dst)
+                copied_bytes += src.stat().st_size
+            added.append(dst)
+            log_file_event("copied", f"Copied {src.name} -> {dst}")
+        sp.set(files=len(plan), copied=len(added) - unchanged, unchanged=unchanged, bytes=copied_bytes)
+        if refused:
+            sp.set(refused=refused)
+    return added, unchanged
+
+@timed("headless_install")
+def headless_install(selected_slicers: list[str], base: Path | list[Path]):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    zip_path = CACHE_DIR / "profiles.zip"
+    logging.info(f"Downloading: {GITHUB_ZIP_URL}")
+    download_profiles_zip(zip_path)
+    install_from_archive(zip_path, selected_slicers, base)
+    logging.info("Headless install complete.")
+
+def _as_bases(base: Path | list[Path]) -> list[Path]:
+    """One base or several, as a list without repeats (compared by normalized path)."""
+    bases = [base] if isinstance(base, (str, Path)) else list(base)
+    unique: dict[str, Path] = {}
+    for b in bases:
+        unique.setdefault(os.path.normcase(os.path.abspath(b)), Path(b))
+    return list(unique.values())
+
+def build_multi_base_plans(items: list[dict], selected_slicers: list[str],
+                           bases: list[Path]) -> dict[Path, list[tuple[Path, Path]]]:
+    """Copy plan per base; a destination already claimed by an earlier base is dropped.
+
+    Bases overlap more often than one would think: a portable config nested in
+    another base, or Flatpak folders that resolve from the home, not the base.
+    """
+    plans: dict[Path, list[tuple[Path, Path]]] = {}
+    claimed: set[str] = set()
+    dropped = 0
+    for base in bases:
+        with span("targets", slicers=len(selected_slicers), base=str(base)):
+            targets = {s: slicer_targets_for(s, base) for s in ALL_SLICERS if s in selected_slicers}
+        plan = []
+        for src, dst in build_copy_plan(items, targets):
+            key = os.path.normcase(os.path.abspath(dst))
+            if key in claimed:
+                dropped += 1
+                continue
+            claimed.add(key)
+            plan.append((src, dst))
+        plans[base] = plan
+    if dropped:
+        logging.info(f"Skipped {dropped} destinations shared by more than one base")
+    return plans
+
+def execute_multi_base_plans(plans: dict[Path, list[tuple[Path, Path]]], workers: int = 4,
+                             backup: BackupRun | None = None) -> tuple[list[Path], int, dict[Path, str]]:
+    """Run each base's plan on its own thread; returns (installed, unchanged, errors by base).
+
+    A failing base (e.g. an unplugged USB drive) is logged and reported without
+    stopping the others.
+    """
+    def install_base(base: Path) -> tuple[list[Path], int, str | None]:
+        with span("install_base", base=str(base)) as sp:
+            try:
+                added, unchanged = execute_copy_plan(plans[base], backup=backup)
+                return added, unchanged, None
+            except Exception as e:
+                logging.error(f"Install into {base} failed: {e}")
+                sp.set(error=type(e).__name__)
+                return [], 0, str(e)
+
+    if len(plans) == 1:
+        results = [install_base(next(iter(plans)))]
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(plans)))) as pool:
+            results = list(pool.map(install_base, plans))
+    added = [p for r in results for p in r[0]]
+    unchanged = sum(r[1] for r in results)
+    errors = {base: r[2] for base, r in zip(plans, results) if r[2]}
+    return added, unchanged, errors
+
+def install_from_archive(zip_path: Path, selected_slicers: list[str],
+                         base: Path | list[Path]) -> tuple[list[Path], int]:
+    """Extract, catalog, validate and install a verified profiles ZIP; returns (installed, unchanged).
+
+    `base` may be a list: the archive is still extracted and cataloged once and
+    the per-base plans are copied concurrently. Raises RuntimeError after
+    recording the manifest if any base failed.
+    """
+    bases = _as_bases(base)
+    extract_dir = CACHE_DIR / "profiles_extracted"
+    extract_zip(zip_path, extract_dir)
+    fil, proc = collect_repo_profiles_robust(extract_dir)
+    plans = build_multi_base_plans(fil + proc, selected_slicers, bases)
+    failures = validate_profiles(list(dict.fromkeys(src for plan in plans.values() for src, _ in plan)))
+    if failures:
+        _log_validation_failures(failures)
+        plans = {b: [(src, dst) for src, dst in plan if src not in failures] for b, plan in plans.items()}
+    total = sum(len(plan) for plan in plans.values())
+    logging.info(f"Copy plan: {total} files" + (f" across {len(bases)} bases" if len(bases) > 1 else ""))
+    backup = BackupRun("install")
+    try:
+        added, unchanged, errors = execute_multi_base_plans(plans, backup=backup)
+    finally:
+        backup.commit()
+    if unchanged:
+        logging.info(f"Skipped {unchanged} unchanged files")
+    rewrite_installed_list(remove_paths=[], add_paths=added)
+    if errors:
+        raise RuntimeError("Install failed for " + ", ".join(str(b) for b in errors))
+    return added, unchanged
+
+def _home_owner(home: Path) -> tuple[int, int] | None:
+    """(uid, gid) of `home` when running as root on POSIX, else None (no chown)."""
+    if not hasattr(os, "geteuid") or os.geteuid() != 0:
+        return None
+    try:
+        st = home.stat()
+    except OSError:
+        return None
+    return (st.st_uid, st.st_gid)
+
+@timed("fleet_install", lambda results: {"homes": len(results)})
+def fleet_install(homes: list[Path], selected_slicers: list[str] | None, workers: int = 4) -> list[dict]:
+    """Install into every home folder from a single download.
+
+    The archive is downloaded, verified and extracted once; each home then gets
+    its own target resolution (native + Flatpak) and copy plan, executed on a
+    thread pool. Only files whose content differs are written. With no
+    `selected_slicers`, each home gets the slicers detected in it.
+    Returns one summary dict per home.
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    zip_path = CACHE_DIR / "profiles.zip"
+    extract_dir = CACHE_DIR / "profiles_extracted"
+    logging.info(f"Downloading: {GITHUB_ZIP_URL}")
+    download_profiles_zip(zip_path)
+    extract_zip(zip_path, extract_dir)
+    fil, proc = collect_repo_profiles_robust(extract_dir)
+    items = fil + proc
+    failures = validate_profiles([it["src"] for it in items])
+    if failures:
+        _log_validation_failures(failures)
+        items = [it for it in items if it["src"] not in failures]
+    backup = BackupRun("fleet_install")
+
+    def install_home(home: Path) -> dict:
+        summary = {"home": str(home), "slicers": [], "planned": 0, "copied": 0,
+                   "unchanged": 0, "installed": [], "error": None}
+        with span("install_home", home=str(home)) as sp:
+            try:
+                base = appdata_base_for_home(home)
+                slicers = selected_slicers or detect_slicers(base, home=home)
+                summary["slicers"] = slicers
+                with span("targets", slicers=len(slicers)):
+                    targets = {s: slicer_targets_for(s, base, home=home) for s in ALL_SLICERS if s in slicers}
+                plan = build_copy_plan(items, targets)
+                summary["planned"] = len(plan)
+                added, unchanged = execute_copy_plan(plan, home=home, backup=backup)
+                summary["installed"] = added
+                summary["unchanged"] = unchanged
+                summary["copied"] = len(added) - unchanged
+            except Exception as e:
+                logging.error(f"Install for {home} failed: {e}")
+                summary["error"] = str(e)
+                sp.set(error=type(e).__name__)
+        return summary
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            results = list(pool.map(install_home, homes))
+    finally:
+        backup.commit()
+
+    rewrite_installed_list(remove_paths=[], add_paths=[p for r in results for p in r["installed"]])
+    for r in results:
+        status = f"FAILED ({r['error']})" if r["error"] else "ok"
+        logging.info(
+            f"User {r['home']}: {status}; slicers={r['slicers']}; "
+            f"copied {r['copied']}, unchanged {r['unchanged']} of {r['planned']}"
+        )
+    logging.info(f"Multi-user install complete: {len(results)} homes.")
+    return results
+
+# ========= WATCH =========
+# --watch keeps a machine current without re-running the full installer: each
+# poll is one conditional GET (If-None-Match / If-Modified-Since). A 304 costs no
+# disk writes and is only logged at DEBUG; a new archive goes through
+# install_from_archive(), which rewrites only profiles whose content changed.
+WATCH_STATE = CACHE_DIR / "watch_state.json"
+WATCH_INTERVAL = 900.0
+WATCH_JITTER = 0.1
+WATCH_MAX_BACKOFF = 6 * 3600.0
+
+def _watch_delay(interval: float, jitter: float, failures: int, max_backoff: float = WATCH_MAX_BACKOFF) -> float:
+    """Next sleep: `interval`, doubled per consecutive failure (capped), spread by +-jitter."""
+    delay = interval if failures == 0 else min(max_backoff, interval * 2 ** failures)
+    return max(1.0, delay * (1 + random.uniform(-jitter, jitter)))
+
+def _load_watch_state() -> dict:
+    try:
+        with open(WATCH_STATE, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def watch_install(selected_slicers: list[str], base: Path | list[Path], interval: float = WATCH_INTERVAL,
+                  jitter: float = WATCH_JITTER, stop: CancelToken | None = None):
+    """Poll the profiles ZIP and install changes until `stop` is cancelled.
+
+    A poll that stalls fails after DOWNLOAD_TIMEOUT and counts towards the
+    backoff; cancelling `stop` (SIGTERM) also interrupts a poll in progress.
+    """
+    stop = stop or CancelToken()
+    zip_path = CACHE_DIR / "profiles.zip"
+    state = _load_watch_state()
+    if not zip_path.exists():
+        state = {}  # validators without the archive they describe are useless
+    elif state.get("sha256"):
+        # Pick up slicers or accounts that appeared since the last run.
+        try:
+            install_from_archive(zip_path, selected_slicers, base)
+        except Exception as e:
+            logging.warning(f"Watch: could not apply cached archive: {e}")
+    logging.info(f"Watching {GITHUB_ZIP_URL} every {interval:.0f}s (+-{jitter:.0%}); slicers={selected_slicers}")
+
+    failures = 0
+    while not stop.cancelled:
+        try:
+            headers = {}
+            if state.get("etag"):
+                headers["If-None-Match"] = state["etag"]
+            if state.get("last_modified"):
+                headers["If-Modified-Since"] = state["last_modified"]
+            validators = fetch_url_to_file(GITHUB_ZIP_URL, zip_path, cancel=stop, headers=headers)
+            if validators is None:
+                logging.debug("Watch: not modified")
+            else:
+                digest = verify_profiles_zip(zip_path)
+                if digest == state.get("sha256"):
+                    release_archive(zip_path)  # not extracted, so not released by extract_zip()
+                    logging.debug("Watch: same archive (server ignored the conditional request)")
+                else:
+                    logging.info(f"Watch: new profiles archive, sha256 {digest}")
+                    added, unchanged = install_from_archive(zip_path, selected_slicers, base)
+                    logging.info(f"Watch: applied {len(added) - unchanged} changed profiles ({unchanged} unchanged)")
+                state = {**validators, "sha256": digest}
+                _write_atomic(WATCH_STATE, json.dumps(state))
+            failures = 0
+        except Cancelled:
+            break
+        except Exception as e:
+            failures += 1
+            logging.warning(f"Watch: poll failed ({failures} in a row): {e}")
+        stop.wait(_watch_delay(interval, jitter, failures))
+    logging.info("Watch stopped.")
+
+# ========= LAN CACHE SERVER =========
+# --serve-cache lets one machine fetch each archive revision from GitHub once and
+# serve it to the site; clients use it via --source / COLORFABB_PROFILES_URL.
+# Archives are stored by sha256, which doubles as the ETag, and the previous
+# revision is kept so downloads in flight during a refresh can finish.
+SERVE_DIR = CACHE_DIR / "serve"
+SERVE_STATE = SERVE_DIR / "state.json"
+SERVE_PORT = 8765
+SERVE_REFRESH_INTERVAL = 300.0
+
+class _ServedArchive:
+    """The archive revision currently served, swapped atomically by the refresher."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current: dict | None = None
+
+    def publish(self, digest: str, path: Path, catalog: bytes):
+        st = path.stat()
+        snap = {"sha256": digest, "path": path, "size": st.st_size, "mtime": st.st_mtime,
+                "last_modified": formatdate(st.st_mtime, usegmt=True), "catalog": catalog}
+        with self._lock:
+            self._current = snap
+
+    def snapshot(self) -> dict | None:
+        with self._lock:
+            return self._current
+
+def _catalog_json(digest: str, extract_dir: Path) -> bytes:
+    fil, proc = collect_repo_profiles_robust(extract_dir)
+    def rows(items):
+        return [{"slicer": it["slicer"], "category": it.get("category", "filament"),
+                 "path": it["src"].relative_to(extract_dir).as_posix()} for it in items]
+    return json.dumps({"sha256": digest, "filament": rows(fil), "process": rows(proc)}).encode("utf-8")
+
+def _publish_archive(served: _ServedArchive, digest: str, zip_path: Path):
+    extract_dir = SERVE_DIR / "extracted"
+    extract_zip(zip_path, extract_dir)
+    served.publish(digest, zip_path, _catalog_json(digest, extract_dir))
+    keep = {zip_path.name}
+    previous = SERVE_DIR / "previous"
+    if previous.exists():
+        keep.add(previous.read_text(encoding="utf-8").strip())
+    for old in SERVE_DIR.glob("*.zip"):
+        if old.name not in keep:
+            _remove_quietly(old)
+
+def refresh_served_archive(served: _ServedArchive, upstream: str, state: dict) -> bool:
+    """Conditionally fetch `upstream`; publish it if it is a new revision. Returns True on change."""
+    ensure_dir(SERVE_DIR)
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+    incoming = SERVE_DIR / "incoming.zip"
+    validators = fetch_url_to_file(upstream, incoming, headers=headers)
+    if validators is None:
+        return False
+    try:
+        digest = verify_profiles_zip(incoming)
+    finally:
+        # Nothing else reads incoming.zip: it is renamed (and extracted from
+        # disk) or deleted, so do not pin it in memory for the server's lifetime.
+        release_archive(incoming)
+    current = served.snapshot()
+    if current is not None and current["sha256"] == digest:
+        _remove_quietly(incoming)
+        changed = False
+    else:
+        if current is not None:
+            (SERVE_DIR / "previous").write_text(current["path"].name, encoding="utf-8")
+        final = SERVE_DIR / f"{digest}.zip"
+        os.replace(incoming, final)
+        _publish_archive(served, digest, final)
+        logging.info(f"Serving new profiles archive {digest}")
+        changed = True
+    state.clear()
+    state.update(validators, sha256=digest)
+    _write_atomic(SERVE_STATE, json.dumps(state))
+    return changed
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None | bool:
+    """Single `bytes=` range -> (start, end) inclusive; None to ignore; False if unsatisfiable."""
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None  # multi-range: answering with the full body is allowed
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first == "":
+            n = int(last)
+            if n <= 0:
+                return False
+            return (max(0, size - n), size - 1)
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return False
+    return (start, min(end, size - 1))
+
+class _CacheRequestHandler(BaseHTTPRequestHandler):
+    server_version = "colorFabbCache/1"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        logging.debug(f"serve-cache {self.client_address[0]}: {fmt % args}")
+
+    def do_HEAD(self):
+        self._handle(head=True)
+
+    def do_GET(self):
+        self._handle(head=False)
+
+    def _handle(self, head: bool):
+        path = self.path.split("?", 1)[0]
+        snap = self.server.served.snapshot()
+        if path == "/health":
+            return self._send_bytes(b"ok\n" if snap else b"starting\n", "text/plain", None, head,
+                                    status=200 if snap else 503)
+        if snap is None:
+            return self.send_error(503, "No verified archive yet")
+        if path == "/profiles.zip":
+            return self._send_archive(snap, head)
+        if path == "/catalog.json":
+            return self._send_bytes(snap["catalog"], "application/json", f'"{snap["sha256"]}-catalog"', head)
+        self.send_error(404)
+
+    def _not_modified(self, etag: str, mtime: float | None = None) -> bool:
+        inm = self.headers.get("If-None-Match")
+        if inm is not None:
+            return inm.strip() == "*" or etag in [t.strip() for t in inm.split(",")]
+        ims = self.headers.get("If-Modified-Since")
+        if ims and mtime is not None:
+            try:
+                return int(mtime) <= parsedate_to_datetime(ims).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _send_bytes(self, body: bytes, ctype: str, etag: str | None, head: bool, status: int = 200):
+        if etag and self._not_modified(etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _send_archive(self, snap: dict, head: bool):
+        etag, size = f'"{snap["sha256"]}"', snap["size"]
+        if self._not_modified(etag, snap["mtime"]):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        rng = None
+        if self.headers.get("Range") and self.headers.get("If-Range", etag) in (etag, snap["last_modified"]):
+            rng = _parse_range(self.headers["Range"], size)
+            if rng is False:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        start, end = rng if rng else (0, size - 1)
+        try:
+            f = open(snap["path"], "rb")
+        except OSError:
+            return self.send_error(503, "Archive is being replaced, retry")
+        with f:
+            self.send_response(206 if rng else 200)
+            self.send_header("Content-Type", "application/zip")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", snap["last_modified"])
+            if rng:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.end_headers()
+            if head:
+                return
+            f.seek(start)
+            remaining = end - start + 1
+            try:
+                while remaining > 0:
+                    buf = f.read(min(64 * 1024, remaining))
+                    if not buf:
+                        break
+                    self.wfile.write(buf)
+                    remaining -= len(buf)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client went away
+
+class _CacheHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+def serve_cache(host: str = "0.0.0.0", port: int = SERVE_PORT, upstream: str | None = None,
+                refresh_interval: float = SERVE_REFRESH_INTERVAL, stop: CancelToken | None = None,
+                ready=None):
+    """Serve the verified profiles archive (and its catalog) to the LAN until `stop` is cancelled.
+
+    A refresher thread polls `upstream` (default GITHUB_ZIP_URL) with conditional
+    requests, so the site downloads each revision once. `ready(server)` is called
+    once the socket is bound (useful to learn the port when `port` is 0).
+    """
+    upstream = upstream or GITHUB_ZIP_URL
+    stop = stop or CancelToken()
+    served = _ServedArchive()
+    ensure_dir(SERVE_DIR)
+    try:
+        state = json.loads(SERVE_STATE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = {}
+    cached = SERVE_DIR / f"{state.get('sha256', '')}.zip"
+    if state.get("sha256") and cached.exists():
+        _publish_archive(served, state["sha256"], cached)  # serve at once, refresh in the background
+    else:
+        state = {}
+
+    def refresher():
+        failures = 0
+        while not stop.cancelled:
+            try:
+                refresh_served_archive(served, upstream, state)
+                failures = 0
+            except Exception as e:
+                failures += 1
+                logging.warning(f"serve-cache: upstream refresh failed ({failures} in a row): {e}")
+            # Retry quickly while there is nothing to serve yet.
+            interval = refresh_interval if served.snapshot() else min(refresh_interval, 30.0)
+            stop.wait(_watch_delay(interval, WATCH_JITTER, failures))
+
+    httpd = _CacheHTTPServer((host, port), _CacheRequestHandler)
+    httpd.served = served
+    threading.Thread(target=refresher, name="serve-cache-refresh", daemon=True).start()
+    threading.Thread(target=httpd.serve_forever, name="serve-cache-http", daemon=True).start()
+    logging.info(f"Serving profiles cache on http://{host}:{httpd.server_address[1]}/profiles.zip (upstream {upstream})")
+    if ready is not None:
+        ready(httpd)
+    try:
+        while not stop.wait(1.0):
+            pass
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        logging.info("serve-cache stopped.")
@@ -0,0 +1,1604 @@
+from __future__ import annotations
+
+# installer_gui.py — PySide6 wizard of the colorFabb Filament Installer.
+# Imported lazily by main.py only when the wizard starts.
+
+import sys, logging, shutil
+from collections import OrderedDict
+from pathlib import Path
+
+from PySide6.QtCore import (
+    Qt, QThread, Signal, QSize, QTimer, QFileSystemWatcher,
+    QAbstractListModel, QModelIndex, QSortFilterProxyModel
+)
+from PySide6.QtWidgets import (
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QListView, QProgressBar, QStackedWidget, QCheckBox,
+    QMessageBox, QFileDialog, QLineEdit, QDialog, QTextEdit, QDialogButtonBox
+)
+from PySide6.QtGui import QIcon, QPixmap, QPainter, QColor
+
+import installer_core
+from installer_core import (
+    APP_DISPLAY_NAME, DETECT_COUNT_LIMIT, CACHE_DIR,
+    appdata_base, find_logo, ensure_dir, humanize_bytes, CancelToken, Cancelled,
+    fetch_url_to_file, verify_profiles_zip, extract_zip, validate_profiles,
+    build_inherits_index, required_parents, collect_repo_profiles_robust, rewrite_installed_list,
+    load_catalog_cache, save_catalog_cache, release_archive, BackupRun,
+    span, timed,
+    slicer_targets_from_base, slicer_targets_for, detect_slicer_status, slicer_watch_paths,
+    _slicer_status_text, _display_base_for_slicer, _log_validation_failures,
+)
+
+DISCLAIMER_TEXT = """colorFabb Profile Installer – Disclaimer / Important Information (Free Tool)
+
+This free installer downloads and installs 3D printing profiles ("Profiles") maintained by colorFabb from a public GitHub repository and copies them into configuration folders used by the following third-party slicing applications:
+
+• PrusaSlicer
+• OrcaSlicer
+• Bambu Studio
+• Snapmaker Orca
+• AnyCubicSlicer
+• QIDI Studio
+
+By continuing, you acknowledge and agree that:
+
+Third-party software
+PrusaSlicer, OrcaSlicer, Bambu Studio, Snapmaker Orca, AnyCubicSlicer, and QIDI Studio are owned and controlled by third parties. colorFabb does not guarantee compatibility with any specific slicer version, operating system version, or system configuration.
+
+Overwriting existing files
+The installer may create, modify, or overwrite profile files in the target slicer's configuration directories. If a profile file with the same filename already exists, it may be replaced. You are responsible for backing up your existing profiles and settings before proceeding.
+
+System changes
+The installer writes files into user-level application data folders (such as Windows AppData or macOS Application Support) used by your slicers. These changes may affect slicer behavior, available presets, and print results.
+
+Use at your own risk
+Profiles are provided "AS IS" and may not be suitable for your printer, firmware, hardware setup, material batch, environment, or intended use. Incorrect settings may cause failed prints, reduced quality, excessive wear, or equipment damage. Always review profile settings and perform a test print before production use.
+
+No warranties
+To the maximum extent permitted by law, colorFabb disclaims all warranties, express or implied, including merchantability, fitness for a particular purpose, and non-infringement.
+
+Limitation of liability
+To the maximum extent permitted by law, colorFabb is not liable for any direct, indirect, incidental, special, consequential, or exemplary damages, including loss of data, loss of profits, business interruption, hardware damage, or any other loss arising out of or related to the use of this installer or the Profiles, even if advised of the possibility of such damages.
+
+Network and source availability
+Installation requires internet access to download content from GitHub. colorFabb does not guarantee availability, integrity, or continued access to remote resources, and installation may fail or be incomplete due to network conditions or repository changes.
+
+If you do not agree, cancel the installation.
+"""
+
+# Step 1 watches slicer folders; bursts of change events are coalesced for this long.
+WATCH_DEBOUNCE_MS = 750
+
+def make_yellow_icon(pm: QPixmap) -> QIcon:
+    """
+    Compose a square yellow icon (for taskbar/Alt-Tab) with the logo centered.
+    Creates multiple sizes for crisp rendering.
+    """
+    def compose(size: int) -> QPixmap:
+        canvas = QPixmap(size, size)
+        canvas.fill(QColor("#FFC400"))
+        painter = QPainter(canvas)
+        # max logo area with margins
+        margin = int(size * 0.12)
+        target_w = size - 2*margin
+        target_h = size - 2*margin
+        scaled = pm.scaled(target_w, target_h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        x = (size - scaled.width()) // 2
+        y = (size - scaled.height()) // 2
+        painter.drawPixmap(x, y, scaled)
+        painter.end()
+        return canvas
+
+    icon = QIcon()
+    for s in (16, 24, 32, 48, 64, 128, 256):
+        icon.addPixmap(componse := compose(s))
+    return icon
+
+# ========= ASSETS =========
+# Process-wide cache: the logo is decoded once, scaled variants are kept in a small
+# LRU keyed by size, and the window icon is composed once.
+LOGO_SCALED_CACHE_SIZE = 8
+_logo_pixmap: QPixmap | None = None
+_logo_scaled: OrderedDict[tuple, QPixmap] = OrderedDict()
+_window_icon: QIcon | None = None
+
+def logo_pixmap() -> QPixmap | None:
+    global _logo_pixmap
+    if _logo_pixmap is None:
+        lp = find_logo()
+        if not lp:
+            return None
+        pm = QPixmap(str(lp))
+        if pm.isNull():
+            return None
+        _logo_pixmap = pm
+    return _logo_pixmap
+
+def scaled_logo(width: int, height: int | None = None) -> QPixmap | None:
+    """Logo scaled to fit width x height (or to `width` height only if height is None)."""
+    pm = logo_pixmap()
+    if pm is None:
+        return None
+    key = (width, height)
+    scaled = _logo_scaled.get(key)
+    if scaled is not None:
+        _logo_scaled.move_to_end(key)
+        return scaled
+    if height is None:
+        scaled = pm.scaledToHeight(width, Qt.SmoothTransformation)
+    else:
+        scaled = pm.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    _logo_scaled[key] = scaled
+    while len(_logo_scaled) > LOGO_SCALED_CACHE_SIZE:
+        _logo_scaled.popitem(last=False)
+    return scaled
+
+def window_icon() -> QIcon | None:
+    global _window_icon
+    if _window_icon is None:
+        pm = logo_pixmap()
+        if pm is None:
+            return None
+        _window_icon = make_yellow_icon(pm)
+    return _window_icon
+
+
+# ========= DOWNLOAD THREAD =========
+class ZipDownloader(QThread):
+    """Download + validate the profiles ZIP; with `extract_dir`, also extract and catalog it.
+
+    The catalog is left in `self.filament` / `self.process` (parse failures in
+    `self.invalid`, the `inherits` index in `self.inherits`) before finished_ok fires, so the GUI thread never extracts,
+    walks or validates the repo itself. cancel() stops the
+    transfer or extraction promptly; partial files are removed by the core helpers.
+    With a `cached` catalog (see load_catalog_cache) the request is conditional:
+    on 304, or when the same archive comes back, the cached catalog is reused
+    and `not_modified` is set.
+    """
+    progress    = Signal(int, int)
+    finished_ok = Signal(Path, str)  # zip_path, sha256
+    failed      = Signal(str)
+    ssl_error   = Signal(str)  # Special signal for SSL errors
+    cancelled   = Signal()
+    def __init__(self, url: str, dest_zip: Path, verify_ssl: bool = True, extract_dir: Path | None = None,
+                 cached: dict | None = None):
+        super().__init__()
+        self.url = url
+        self.dest_zip = dest_zip
+        self.verify_ssl = verify_ssl
+        self.extract_dir = extract_dir
+        self.cached = cached
+        self.cancel_token = CancelToken()
+        self.filament: list[dict] = []
+        self.process: list[dict] = []
+        self.invalid: dict[Path, str] = {}
+        self.inherits: dict = {}
+        self.validators: dict = {}
+        self.not_modified = False
+    def cancel(self):
+        self.cancel_token.cancel()
+    def _use_cached(self):
+        c = self.cached
+        self.filament, self.process, self.invalid, self.inherits = c["filament"], c["process"], c["invalid"], c["inherits"]
+        self.validators = {"etag": c.get("etag"), "last_modified": c.get("last_modified")}
+        self.not_modified = True
+    def run(self):
+        try:
+            headers = {}
+            if self.cached is not None and self.extract_dir is not None:
+                if self.cached.get("etag"):
+                    headers["If-None-Match"] = self.cached["etag"]
+                if self.cached.get("last_modified"):
+                    headers["If-Modified-Since"] = self.cached["last_modified"]
+            validators = fetch_url_to_file(self.url, self.dest_zip, verify_ssl=self.verify_ssl,
+                                           cancel=self.cancel_token, progress=self.progress.emit, headers=headers)
+            if validators is None:
+                self._use_cached()
+                self.finished_ok.emit(self.dest_zip, self.cached["sha256"])
+                return
+            self.validators = validators
+            digest = verify_profiles_zip(self.dest_zip)
+            if self.extract_dir is not None and self.cached is not None and self.cached["sha256"] == digest:
+                self._use_cached()
+                self.validators = validators
+                save_catalog_cache(self.extract_dir, digest, self.filament, self.process,
+                                   self.invalid, self.inherits, validators)
+            elif self.extract_dir is not None:
+                extract_zip(self.dest_zip, self.extract_dir, cancel=self.cancel_token)
+                # The extracted tree is new from here on: finish cataloging it even if
+                # cancelled, so the lists the wizard shows always match the files on disk.
+                fil, proc = collect_repo_profiles_robust(self.extract_dir)
+                hashes: dict[Path, str] = {}
+                invalid = validate_profiles([it["src"] for it in fil + proc], hashes=hashes)
+                for it in fil + proc:
+                    it["sha256"] = hashes.get(it["src"])
+                inherits = build_inherits_index(fil + proc, digest)
+                self.filament, self.process, self.invalid, self.inherits = fil, proc, invalid, inherits
+                save_catalog_cache(self.extract_dir, digest, fil, proc, invalid, inherits, validators)
+                self.finished_ok.emit(self.dest_zip, digest)
+                return
+            self.cancel_token.check()
+            self.finished_ok.emit(self.dest_zip, digest)
+        except Cancelled:
+            logging.info("Profiles download cancelled")
+            self.cancelled.emit()
+        except Exception as e:
+            error_str = str(e)
+            # Check if it's an SSL certificate error
+            if "CERTIFICATE_VERIFY_FAILED" in error_str or "certificate verify failed" in error_str.lower():
+                self.ssl_error.emit(error_str)
+            else:
+                self.failed.emit(error_str)
+        finally:
+            # extract_zip() releases the in-memory archive itself; the 304,
+            # same-digest and download-only paths never extract.
+            release_archive(self.dest_zip)
+
+# ========= DETECTION THREAD =========
+class SlicerDetector(QThread):
+    """Compute step-1 detection status off the GUI thread."""
+    detected = Signal(str, int, bool, int)  # slicer, files_found, detected, generation
+    def __init__(self, targets_by_slicer: dict, generation: int = 0, count_limit: int = DETECT_COUNT_LIMIT):
+        super().__init__()
+        self.targets_by_slicer = dict(targets_by_slicer)
+        self.generation = generation
+        self.count_limit = count_limit
+    def run(self):
+        for name, cats in self.targets_by_slicer.items():
+            if self.isInterruptionRequested():
+                return
+            try:
+                files_found, found = detect_slicer_status(cats, self.count_limit)
+            except Exception as e:
+                logging.warning(f"Detection failed for {name}: {e}")
+                files_found, found = 0, False
+            self.detected.emit(name, files_found, found, self.generation)
+
+# ========= THEMES =========
+APP_QSS = """
+* { font-family: 'Segoe UI', 'Inter', 'Calibri', 'Arial'; font-size: 12.5pt; }
+QWidget { background: #FAFBFE; color: #121212; }
+QPushButton { background: #111; color: #fff; border: 0; padding: 10px 18px; border-radius: 10px; font-weight: 500; }
+QPushButton:hover { background: #222; color: #fff; }
+QPushButton:disabled { background: #D0D3D9; color: #888; }
+QLineEdit { background: #fff; border: 1px solid #E3E5EA; border-radius: 8px; padding: 8px 10px; }
+QListView { background: #fff; border: 1px solid #E3E5EA; border-radius: 10px; }
+QListView::item { padding: 8px; }
+QListView::item:hover { background: #FFF6CC; }
+QListView::item:selected { background: #FFE27A; color: #111; }
+QListView::indicator { width: 24px; height: 24px; border: 2px solid #333; border-radius: 3px; background: #fff; margin-right: 6px; }
+QListView::indicator:hover { border-color: #FFC400; background: #FFF9E6; }
+QListView::indicator:checked { background: #FFC400; border: 2px solid #333; }
+QProgressBar { border: 1px solid #E3E5EA; border-radius: 10px; background: #fff; text-align: center; height: 16px; }
+QProgressBar::chunk { background: #FFC400; border-radius: 10px; }
+QCheckBox { spacing: 12px; font-size: 13pt; color: #111; }
+QCheckBox::indicator { width: 26px; height: 26px; border: 3px solid #111; border-radius: 4px; background: #fff; }
+QCheckBox::indicator:hover { border-color: #FFC400; background: #FFF9E6; }
+QCheckBox::indicator:checked { background: #FFC400; border: 3px solid #111; }
+"""
+WELCOME_QSS = """
+* { font-family: 'Segoe UI', 'Inter', 'Calibri', 'Arial'; font-size: 12.5pt; }
+QWidget { background: #FFC400; color: #111; }
+QPushButton { background: #111; color: #fff; border: 0; padding: 10px 18px; border-radius: 10px; font-weight: 500; }
+QPushButton:hover { background: #222; color: #fff; }
+QPushButton:disabled { background: #AAB0B7; color: #fff; }
+QLineEdit { background: #fff; border: 1px solid #E3E5EA; border-radius: 8px; padding: 8px 10px; }
+QListView { background: #fff; border: 1px solid #E3E5EA; border-radius: 10px; }
+QListView::item { padding: 6px; }
+QListView::item:selected { background: #FFE27A; color: #111; }
+QProgressBar { border: 1px solid #E3E5EA; border-radius: 10px; background: #fff; text-align: center; height: 16px; }
+QProgressBar::chunk { background: #111; border-radius: 10px; }
+QCheckBox { spacing: 12px; font-size: 14pt; font-weight: 700; color: #111; }
+QCheckBox::indicator { width: 28px; height: 28px; border: 3px solid #111; border-radius: 4px; background: #fff; }
+QCheckBox::indicator:hover { border-color: #000; background: #FFF6CC; }
+QCheckBox::indicator:checked { background: #111; border: 3px solid #111; }
+"""
+HEADER_QSS = "background:#FFC400; padding:14px; border:0; border-bottom:1px solid #e6e6e6;"
+
+# Create checkmark icon for checked state
+def create_checkmark_icon(size: int = 24, color: str = "#fff") -> QIcon:
+    """Create a checkmark icon for checkbox checked state."""
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    
+    # Draw checkmark
+    pen = painter.pen()
+    pen.setColor(QColor(color))
+    pen.setWidth(max(2, size // 12))
+    pen.setCapStyle(Qt.RoundCap)
+    pen.setJoinStyle(Qt.RoundJoin)
+    painter.setPen(pen)
+    
+    # Checkmark path (scaled to icon size)
+    scale = size / 24.0
+    x1, y1 = int(6 * scale), int(12 * scale)
+    x2, y2 = int(10 * scale), int(16 * scale)
+    x3, y3 = int(18 * scale), int(8 * scale)
+    
+    painter.drawLine(x1, y1, x2, y2)
+    painter.drawLine(x2, y2, x3, y3)
+    painter.end()
+    
+    return QIcon(pixmap)
+
+
+class DisclaimerDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Disclaimer / Important Information")
+        self.setMinimumSize(QSize(780, 520))
+
+        root = QVBoxLayout(self)
+        text = QTextEdit()
+        text.setReadOnly(True)
+        text.setPlainText(DISCLAIMER_TEXT)
+        root.addWidget(text, 1)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok)
+        buttons.accepted.connect(self.accept)
+        root.addWidget(buttons, 0)
+
+class PageWelcome(QWidget):
+    next_requested = Signal()
+    acceptance_changed = Signal()
+    def __init__(self):
+        super().__init__()
+        self.logo_path = find_logo()
+        self._logo_size = None
+        root = QVBoxLayout(self)
+        root.setContentsMargins(36, 36, 36, 36)
+
+        self.logo_label = QLabel()
+        self.logo_label.setAlignment(Qt.AlignCenter)
+
+        title = QLabel("colorFabb Filament Installer")
+        title.setStyleSheet("font-size:32pt; font-weight:800; color:#111;")
+        title.setAlignment(Qt.AlignLeft)
+
+        subtitle = QLabel("Install or update filament & print/process profiles for your slicers.\nFast, clean, and always up-to-date.")
+        subtitle.setStyleSheet("font-size:13.5pt; color:#111;")
+        subtitle.setAlignment(Qt.AlignLeft)
+
+        root.addWidget(self.logo_label, 4)
+        root.addSpacing(8)
+        root.addWidget(title, 0, Qt.AlignLeft)
+        root.addWidget(subtitle, 0, Qt.AlignLeft)
+        root.addStretch(2)
+
+        actions = QHBoxLayout()
+        self.btn_disclaimer = QPushButton("Disclaimer")
+        self.btn_disclaimer.clicked.connect(self.show_disclaimer)
+
+        actions.addWidget(self.btn_disclaimer)
+        actions.addStretch(1)
+        root.addLayout(actions)
+
+        self.accept_checkbox = QCheckBox("I have read and understand the above, including the overwrite warning, and I want to continue")
+        self.accept_checkbox.setStyleSheet("QCheckBox { font-size: 14pt; font-weight: 700; color: #111; spacing: 14px; } QCheckBox::indicator { width: 28px; height: 28px; border: 3px solid #111; border-radius: 5px; background: #fff; } QCheckBox::indicator:hover { border-color: #000; background: #FFF6CC; box-shadow: 0 0 8px rgba(0,0,0,0.2); } QCheckBox::indicator:checked { background: #111; border-color: #111; }")
+        self.accept_checkbox.stateChanged.connect(lambda *_: self.acceptance_changed.emit())
+        root.addWidget(self.accept_checkbox)
+
+        overwrite = QLabel("Warning: This installer may overwrite existing profile files. Back up your slicer profiles/settings before proceeding.")
+        overwrite.setStyleSheet("color:#111; font-size:11.5pt;")
+        overwrite.setWordWrap(True)
+        root.addWidget(overwrite)
+
+    def accepted(self) -> bool:
+        try:
+            return self.accept_checkbox.checkState() == Qt.Checked
+        except Exception:
+            return False
+
+    def show_disclaimer(self):
+        dlg = DisclaimerDialog(self)
+        dlg.exec()
+
+    def resizeEvent(self, e):
+        if self.logo_path:
+            # Snap to 8px steps so a drag-resize reuses cached scaled variants.
+            target_w = max(8, int(self.width() * 0.60) // 8 * 8)
+            target_h = max(8, int(self.height() * 0.40) // 8 * 8)
+            if (target_w, target_h) != self._logo_size:
+                scaled = scaled_logo(target_w, target_h)
+                if scaled is not None:
+                    self._logo_size = (target_w, target_h)
+                    self.logo_label.setPixmap(scaled)
+        else:
+            self.logo_label.clear()
+        super().resizeEvent(e)
+
+class Header(QWidget):
+    def __init__(self, text: str):
+        super().__init__()
+        lay = QHBoxLayout(self); lay.setContentsMargins(14,10,14,10)
+        pm = scaled_logo(28)
+        if pm is not None:
+            logo = QLabel()
+            logo.setPixmap(pm)
+            lay.addWidget(logo)
+        title = QLabel(text)
+        title.setStyleSheet("font-size:18pt; font-weight:800; margin-left:12px; color:#111;")
+        lay.addWidget(title); lay.addStretch(1)
+        self.setStyleSheet(HEADER_QSS)
+
+class PageSlicers(QWidget):
+    selection_changed = Signal()
+    base_changed = Signal()
+    def __init__(self):
+        super().__init__()
+        self.base = appdata_base()
+        self.targets = slicer_targets_from_base(self.base)
+        outer = QVBoxLayout(self)
+        outer.addWidget(Header("Step 1 of 4: Select Slicer Software"))
+
+        self.checks = {}
+        self.path_edits = {}
+        self.status_labels = {}
+        self._detect_gen = {}
+        self._detectors = []
+        label_map = {
+            "QIDIStudio": "QIDI Studio",
+            "SnapmakerOrca": "Snapmaker Orca",
+        }
+
+        for name in ["PrusaSlicer","OrcaSlicer","BambuStudio","SnapmakerOrca","AnyCubicSlicer","QIDIStudio"]:
+            row = QHBoxLayout()
+            label = label_map.get(name, name)
+            box = QCheckBox(label)
+            box.stateChanged.connect(lambda *_: self.selection_changed.emit())
+            box.toggled.connect(lambda *_: self.selection_changed.emit())
+            self.checks[name] = box
+
+            cats = self.targets[name]
+            # Placeholder until the background detector reports back.
+            status = QLabel("… Detecting")
+            status.setStyleSheet("color:#5f6368;")
+            self.status_labels[name] = status
+            self._detect_gen[name] = 0
+
+            edit = QLineEdit(str(_display_base_for_slicer(name, cats))); edit.setFixedWidth(360)
+            self.path_edits[name] = edit
+
+            btn = QPushButton("Browse…"); btn.setStyleSheet("QPushButton{background:#FFC400;color:#111;border-radius:8px;}")
+            def pick(s=name):
+                dlg = QFileDialog(self); dlg.setFileMode(QFileDialog.Directory); dlg.setOption(QFileDialog.ShowDirsOnly, True)
+                if dlg.exec():
+                    sel = dlg.selectedFiles()
+                    if sel:
+                        self.path_edits[s].setText(sel[0])
+                        self.update_targets()
+                        self.refresh_watches([s])
+                        self.start_detection([s])
+                        self.base_changed.emit()
+            btn.clicked.connect(pick)
+
+            row.addWidget(box); row.addWidget(status)
+            row.addWidget(edit); row.addWidget(btn)
+            outer.addLayout(row)
+
+        outer.addStretch(1)
+
+        # Live monitoring: slicer roots and `user` folders are watched so a slicer
+        # launched (or an account added) while the installer is open shows up.
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_watched_dir_changed)
+        self._watch_map: dict[str, set[str]] = {}
+        self._pending_changes: set[str] = set()
+        self._watch_timer = QTimer(self)
+        self._watch_timer.setSingleShot(True)
+        self._watch_timer.setInterval(WATCH_DEBOUNCE_MS)
+        self._watch_timer.timeout.connect(self.apply_watched_changes)
+        self.refresh_watches()
+
+        self.selection_changed.emit()
+        self.start_detection(list(self.checks))
+
+    def refresh_watches(self, names: list[str] | None = None):
+        """Re-derive watched folders for `names` (default: all slicers)."""
+        names = list(self.checks) if names is None else names
+        watch_map = {k: set(v) - set(names) for k, v in self._watch_map.items()}
+        for name in names:
+            for path in slicer_watch_paths(name, self.targets[name]):
+                watch_map.setdefault(str(path), set()).add(name)
+        watch_map = {k: v for k, v in watch_map.items() if v}
+
+        stale = [p for p in self._watch_map if p not in watch_map]
+        fresh = [p for p in watch_map if p not in self._watch_map]
+        if stale:
+            self.watcher.removePaths(stale)
+        if fresh:
+            self.watcher.addPaths(fresh)
+        self._watch_map = watch_map
+
+    def on_watched_dir_changed(self, path: str):
+        self._pending_changes |= self._watch_map.get(path, set())
+        self._watch_timer.start()  # restart: debounce event bursts
+
+    def apply_watched_changes(self):
+        names, self._pending_changes = sorted(self._pending_changes), set()
+        if not names:
+            return
+        for name in names:
+            # The target cache is keyed on the `user` folder mtimes, so a new
+            # account or a freshly created slicer root re-resolves by itself.
+            self.targets[name] = slicer_targets_for(name, Path(self.path_edits[name].text()))
+        self.refresh_watches(names)
+        self.start_detection(names)
+        self.base_changed.emit()
+
+    def start_detection(self, names: list[str]):
+        """Recount the given slicers in a worker thread; stale results are dropped."""
+        gen = max(self._detect_gen.values(), default=0) + 1
+        for name in names:
+            self._detect_gen[name] = gen
+            self.status_labels[name].setText("… Detecting")
+            self.status_labels[name].setStyleSheet("color:#5f6368;")
+        det = SlicerDetector({n: self.targets[n] for n in names}, generation=gen)
+        det.detected.connect(self.on_detected)
+        det.finished.connect(lambda d=det: self._detectors.remove(d) if d in self._detectors else None)
+        self._detectors.append(det)
+        det.start()
+
+    def on_detected(self, name: str, files_found: int, detected: bool, generation: int):
+        if self._detect_gen.get(name) != generation:
+            return
+        status_text, status_color = _slicer_status_text(files_found, detected)
+        self.status_labels[name].setText(status_text)
+        self.status_labels[name].setStyleSheet(f"color:{status_color};")
+
+    def update_targets(self):
+        for name in ["PrusaSlicer","OrcaSlicer","BambuStudio","SnapmakerOrca","AnyCubicSlicer","QIDIStudio"]:
+            base = Path(self.path_edits[name].text())
+            self.targets[name] = slicer_targets_for(name, base)
+
+    def selected_slicers(self):
+        return [n for n,b in self.checks.items() if b.checkState() == Qt.Checked]
+
+    def targets_for_selected(self):
+        self.update_targets()
+        return {n:self.targets[n] for n in self.selected_slicers()}
+
+# ------- Profile list model (check states in a compact array) -------
+class ProfileListModel(QAbstractListModel):
+    """Checkable list of repo profiles.
+
+    Check states live in a bytearray instead of per-row widget items, so a
+    QListView can show tens of thousands of profiles without building them.
+    A running `checked_count` keeps "all/none selected" checks O(1).
+    Checking a row also checks the rows in `parent_rows[row]` (its `inherits` chain).
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.items: list[dict] = []
+        self.labels: list[str] = []
+        self.checked = bytearray()
+        self.checked_count = 0
+        self.parent_rows: dict[int, list[int]] = {}
+        self.notes: dict[int, str] = {}
+
+    def set_items(self, items: list[dict], labels: list[str], checked: bool = True,
+                  parent_rows: dict[int, list[int]] | None = None, notes: dict[int, str] | None = None):
+        self.beginResetModel()
+        self.items = list(items)
+        self.labels = list(labels)
+        self.checked = bytearray([1 if checked else 0]) * len(self.items)
+        self.checked_count = len(self.items) if checked else 0
+        self.parent_rows = parent_rows or {}
+        self.notes = notes or {}
+        self.endResetModel()
+
+    def update_items(self, items: list[dict], labels: list[str], parent_rows: dict[int, list[int]] | None = None,
+                     notes: dict[int, str] | None = None) -> tuple[int, int, int]:
+        """Switch to `items` in place, keeping scroll position and check states.
+
+        `items` must list the rows being kept (same `src`, current order) first,
+        then the new ones. Vanished rows are removed and new rows appended with
+        row-level signals; new rows start checked only if every row was checked.
+        Returns (added, removed, changed); "changed" = kept rows whose sha256 differs.
+        """
+        keep = {it["src"] for it in items}
+        gone = [r for r, it in enumerate(self.items) if it["src"] not in keep]
+        for r in reversed(gone):
+            self.beginRemoveRows(QModelIndex(), r, r)
+            self.checked_count -= self.checked[r]
+            del self.items[r], self.labels[r], self.checked[r]
+            self.endRemoveRows()
+        kept = len(self.items)
+        changed = sum(1 for old, new in zip(self.items, items) if old.get("sha256") != new.get("sha256"))
+        added = len(items) - kept
+        if added:
+            state = 1 if self.checked_count == kept else 0
+            self.beginInsertRows(QModelIndex(), kept, len(items) - 1)
+            self.checked.extend(bytes([state]) * added)
+            self.checked_count += state * added
+        self.items, self.labels = list(items), list(labels)
+        if added:
+            self.endInsertRows()
+        self.parent_rows = parent_rows or {}
+        self.notes = notes or {}
+        if self.items:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.items) - 1, 0))
+        return added, len(gone), changed
+
+    def _with_parents(self, rows: list[int]) -> list[int]:
+        if not self.parent_rows:
+            return rows
+        out = dict.fromkeys(rows)
+        for row in rows:
+            out.update(dict.fromkeys(self.parent_rows.get(row, ())))
+        return list(out)
+
+    def set_rows_checked(self, rows: list[int] | None, checked: bool):
+        """Bulk (un)check `rows` (None = all) with a single dataChanged."""
+        n = len(self.items)
+        if n == 0:
+            return
+        state = 1 if checked else 0
+        if rows is None:
+            self.checked[:] = bytes([state]) * n
+            self.checked_count = n if checked else 0
+            first, last = 0, n - 1
+        else:
+            if not rows:
+                return
+            if checked:
+                rows = self._with_parents(rows)
+            marks = self.checked
+            delta = 0
+            for row in rows:
+                if marks[row] != state:
+                    marks[row] = state
+                    delta += 1
+            self.checked_count += delta if checked else -delta
+            first, last = min(rows), max(rows)
+        self.dataChanged.emit(self.index(first, 0), self.index(last, 0), [Qt.CheckStateRole])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return self.labels[row]
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self.checked[row] else Qt.Unchecked
+        if role == Qt.ToolTipRole:
+            note = self.notes.get(row)
+            return f"{self.items[row]['src']}\n{note}" if note else str(self.items[row]["src"])
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        try:
+            state = 1 if Qt.CheckState(value) == Qt.Checked else 0
+        except Exception:
+            state = 1 if value else 0
+        if self.checked[index.row()] == state:
+            return True
+        if state and self.parent_rows.get(index.row()):
+            self.set_rows_checked([index.row()], True)
+            return True
+        self.checked[index.row()] = state
+        self.checked_count += 1 if state else -1
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+# ------- Select/Deselect All helper mixin -------
+class SelectListMixin:
+    def build_profile_list(self, outer: QVBoxLayout):
+        """Search box + virtualized list view over a ProfileListModel."""
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("Filter by slicer, material or name…")
+        self.search.setClearButtonEnabled(True)
+        outer.addWidget(self.search)
+
+        self.model = ProfileListModel(self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.search.textChanged.connect(self.proxy.setFilterFixedString)
+
+        self.list = QListView()
+        self.list.setModel(self.proxy)
+        self.list.setUniformItemSizes(True)  # lets the view skip per-row size hints
+        self.list.setAlternatingRowColors(True)
+        self.model.dataChanged.connect(lambda *_: self.on_item_changed(None))
+        outer.addWidget(self.list, 1)
+
+    def load_items(self, items: list[dict], labels: list[str], index: dict | None):
+        """Fill the model, resolving `inherits` parents to rows of this list."""
+        parent_rows, notes = self._inherit_rows(items, index)
+        self.model.set_items(items, labels, parent_rows=parent_rows, notes=notes)
+
+    def reload_items(self, items: list[dict], labels: list[str], index: dict | None) -> tuple[int, int, int]:
+        """Diff `items` into the loaded list in place; returns (added, removed, changed)."""
+        by_src = {it["src"]: (it, label) for it, label in zip(items, labels)}
+        order = [it["src"] for it in self.model.items if it["src"] in by_src]
+        kept = set(order)
+        order += [src for src in by_src if src not in kept]
+        items = [by_src[src][0] for src in order]
+        labels = [by_src[src][1] for src in order]
+        parent_rows, notes = self._inherit_rows(items, index)
+        return self.model.update_items(items, labels, parent_rows=parent_rows, notes=notes)
+
+    def _inherit_rows(self, items: list[dict], index: dict | None) -> tuple[dict[int, list[int]], dict[int, str]]:
+        parent_rows: dict[int, list[int]] = {}
+        notes: dict[int, str] = {}
+        if index:
+            row_of = {it["src"]: i for i, it in enumerate(items)}
+            for i, it in enumerate(items):
+                chain = [row_of[p] for p in required_parents(index, it["src"]) if p in row_of]
+                if chain:
+                    parent_rows[i] = chain
+                    notes[i] = "Requires: " + ", ".join(items[r]["src"].name for r in chain)
+                missing = index["dangling"].get(it["src"])
+                if missing:
+                    notes[i] = f"Inherits '{missing}', which is not in this repo (must come with the slicer)"
+        return parent_rows, notes
+
+    def visible_rows(self) -> list[int] | None:
+        """Source rows currently shown, or None when no filter is active (all rows)."""
+        if not self.search.text():
+            return None
+        return [self.proxy.mapToSource(self.proxy.index(r, 0)).row() for r in range(self.proxy.rowCount())]
+
+    def are_all_selected(self, model: ProfileListModel) -> bool:
+        return model.checked_count == model.rowCount() if model.rowCount() else False
+    def are_none_selected(self, model: ProfileListModel) -> bool:
+        return model.checked_count == 0
+    def set_all(self, model: ProfileListModel, checked: bool):
+        # One batched model change -> one dataChanged -> one label/nav refresh.
+        model.set_rows_checked(self.visible_rows(), checked)
+
+    def selected_indices(self):
+        return [i for i, c in enumerate(self.model.checked) if c]
+
+    def selected_with_parents(self) -> tuple[list[int], int]:
+        """Checked rows plus every row they inherit from; returns (rows, parents added).
+
+        Unchecking a parent leaves its children checked, so the plan adds it back.
+        """
+        rows = self.selected_indices()
+        full = self.model._with_parents(rows)
+        return full, len(full) - len(rows)
+
+class PageFilament(QWidget, SelectListMixin):
+    selection_changed = Signal()
+    request_download = Signal()
+    request_cancel = Signal()
+    def __init__(self):
+        super().__init__()
+        self.items = []
+        outer = QVBoxLayout(self)
+        outer.addWidget(Header("Step 2 of 4: Select Filament Profiles"))
+
+        self.select_all = QCheckBox("Select All")
+        self.select_all.clicked.connect(self.on_select_all_clicked)  # slimme toggle
+        outer.addWidget(self.select_all)
+
+        self.build_profile_list(outer)
+
+        self.info = QLabel("Loading profiles...")
+        self.info.setStyleSheet("color:#5f6368;"); outer.addWidget(self.info)
+
+        row = QHBoxLayout()
+        self.btn_load = QPushButton("Load Profiles")
+        self.btn_load.setStyleSheet("QPushButton{background:#FFC400;color:#111;border-radius:8px;}")
+        self.btn_load.clicked.connect(self.request_download.emit)
+        self.btn_cancel = QPushButton("Cancel Download")
+        self.btn_cancel.setStyleSheet("QPushButton{background:#eaecef;color:#111;border-radius:8px;}")
+        self.btn_cancel.clicked.connect(self.request_cancel.emit)
+        self.btn_cancel.setVisible(False)
+        row.addWidget(self.btn_load); row.addWidget(self.btn_cancel); row.addStretch(1)
+        outer.addLayout(row)
+        self.loaded = False
+
+    def set_busy(self, busy: bool):
+        """Swap 'Load Profiles' for 'Cancel Download' while a download is attached."""
+        self.btn_load.setEnabled(not busy)
+        self.btn_cancel.setVisible(busy)
+        self.btn_cancel.setEnabled(busy)
+
+    def on_item_changed(self, _item):
+        # update label van Select All
+        self.refresh_select_all_label()
+        self.selection_changed.emit()
+
+    def refresh_select_all_label(self):
+        if self.model.rowCount() == 0:
+            self.select_all.setText("Select All")
+            self.select_all.setChecked(False)
+            return
+        if self.are_all_selected(self.model):
+            self.select_all.setText("Deselect All")
+            self.select_all.setChecked(True)
+        else:
+            self.select_all.setText("Select All")
+            # Houd checkbox-state sync met "niet alles geselecteerd"
+            self.select_all.setChecked(False)
+
+    def on_select_all_clicked(self, _checked: bool):
+        # Toggle op basis van huidige staat van de lijst
+        if self.are_all_selected(self.model):
+            self.set_all(self.model, False)
+        else:
+            self.set_all(self.model, True)
+        # set_all's single dataChanged already refreshed the label and nav;
+        # just resync the checkbox in case nothing was visible to toggle.
+        self.refresh_select_all_label()
+
+    def _labels(self, items):
+        return [f"[{it['slicer']} | filament] {it['src'].name}" for it in items]
+
+    def set_items(self, items, selected_slicers, index: dict | None = None):
+        self.items = [it for it in items if it["slicer"] in selected_slicers]
+        self.load_items(self.items, self._labels(self.items), index)
+        self.loaded = True
+        # Update select all status after loading
+        QTimer.singleShot(0, self.refresh_select_all_label)
+        self.info.setText(f"Loaded {self.model.rowCount()} filament profiles.")
+        self.selection_changed.emit()
+
+    def update_items(self, items, selected_slicers, index: dict | None = None) -> tuple[int, int, int]:
+        """Like set_items, but diffs into the shown list (see ProfileListModel.update_items)."""
+        items = [it for it in items if it["slicer"] in selected_slicers]
+        counts = self.reload_items(items, self._labels(items), index)
+        self.items = list(self.model.items)
+        self.loaded = True
+        self.refresh_select_all_label()
+        self.selection_changed.emit()
+        return counts
+
+class PageProcess(QWidget, SelectListMixin):
+    selection_changed = Signal()
+    def __init__(self):
+        super().__init__()
+        self.items = []
+        outer = QVBoxLayout(self)
+        outer.addWidget(Header("Step 3 of 4: Select Print / Process Profiles"))
+
+        self.select_all = QCheckBox("Select All")
+        self.select_all.clicked.connect(self.on_select_all_clicked)
+        outer.addWidget(self.select_all)
+
+        self.build_profile_list(outer)
+
+        self.info = QLabel("Loading profiles...")
+        self.info.setStyleSheet("color:#5f6368;"); outer.addWidget(self.info)
+        self.loaded = False
+
+    def on_item_changed(self, _item):
+        self.refresh_select_all_label()
+        self.selection_changed.emit()
+
+    def refresh_select_all_label(self):
+        if self.model.rowCount() == 0:
+            self.select_all.setText("Select All")
+            self.select_all.setChecked(False)
+            return
+        if self.are_all_selected(self.model):
+            self.select_all.setText("Deselect All")
+            self.select_all.setChecked(True)
+        else:
+            self.select_all.setText("Select All")
+            self.select_all.setChecked(False)
+
+    def on_select_all_clicked(self, _checked: bool):
+        if self.are_all_selected(self.model):
+            self.set_all(self.model, False)
+        else:
+            self.set_all(self.model, True)
+        # set_all's single dataChanged already refreshed the label and nav;
+        # just resync the checkbox in case nothing was visible to toggle.
+        self.refresh_select_all_label()
+
+    def _labels(self, items):
+        return [f"[{it['slicer']} | {it.get('category', 'process')}] {it['src'].name}" for it in items]
+
+    def set_items(self, items, selected_slicers, index: dict | None = None):
+        self.items = [it for it in items if it["slicer"] in selected_slicers]
+        self.load_items(self.items, self._labels(self.items), index)
+        self.loaded = True
+        # Update select all status after loading
+        QTimer.singleShot(0, self.refresh_select_all_label)
+        self.info.setText(f"Loaded {self.model.rowCount()} print/process profiles.")
+        self.selection_changed.emit()
+
+    def update_items(self, items, selected_slicers, index: dict | None = None) -> tuple[int, int, int]:
+        """Like set_items, but diffs into the shown list (see ProfileListModel.update_items)."""
+        items = [it for it in items if it["slicer"] in selected_slicers]
+        counts = self.reload_items(items, self._labels(items), index)
+        self.items = list(self.model.items)
+        self.loaded = True
+        self.refresh_select_all_label()
+        self.info.setText(f"Loaded {self.model.rowCount()} print/process profiles.")
+        self.selection_changed.emit()
+        return counts
+
+class PageInstall(QWidget):
+    start_install = Signal()
+    request_cancel = Signal()
+    def __init__(self):
+        super().__init__()
+        outer = QVBoxLayout(self)
+        outer.addWidget(Header("Step 4 of 4: Install"))
+        self.label = QLabel("Installing files...")
+        outer.addWidget(self.label)
+        self.progress = QProgressBar(); self.progress.setMinimum(0); self.progress.setValue(0)
+        outer.addWidget(self.progress)
+        self.detail = QLabel(""); self.detail.setStyleSheet("color:#5f6368;")
+        outer.addWidget(self.detail)
+        self.problems = QLabel(""); self.problems.setStyleSheet("color:#b3261e;")
+        self.problems.setWordWrap(True); self.problems.setVisible(False)
+        outer.addWidget(self.problems)
+        row = QHBoxLayout()
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.setStyleSheet("QPushButton{background:#eaecef;color:#111;border-radius:8px;}")
+        self.btn_cancel.clicked.connect(self.request_cancel.emit)
+        self.btn_cancel.setEnabled(False)
+        row.addWidget(self.btn_cancel); row.addStretch(1)
+        outer.addLayout(row)
+        outer.addStretch(1)
+
+    def show_problems(self, failures: dict[Path, str], limit: int = 8):
+        if not failures:
+            self.problems.setVisible(False)
+            return
+        lines = [f"• {p.name}: {err}" for p, err in sorted(failures.items())[:limit]]
+        if len(failures) > limit:
+            lines.append(f"… and {len(failures) - limit} more (see installer.log)")
+        self.problems.setText(f"Skipping {len(failures)} invalid profile(s):\n" + "\n".join(lines))
+        self.problems.setVisible(True)
+
+class PageDone(QWidget):
+    def __init__(self):
+        super().__init__()
+        outer = QVBoxLayout(self)
+        outer.addWidget(Header("Done"))
+        self.summary = QLabel("")
+        outer.addWidget(self.summary)
+        outer.addStretch(1)
+
+class InstallerWindow(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle(APP_DISPLAY_NAME)
+        self.setMinimumSize(QSize(1024, 680))
+
+        # Heldere (gele) taskbar icon
+        try:
+            icon = window_icon()
+            if icon is not None:
+                self.setWindowIcon(icon)
+                QApplication.instance().setWindowIcon(icon)
+        except Exception:
+            pass
+
+        self.zip_path    = CACHE_DIR / "profiles.zip"
+        self.extract_dir = CACHE_DIR / "profiles_extracted"
+
+        layout = QVBoxLayout(self); layout.setContentsMargins(0,0,0,0)
+        self.stack = QStackedWidget(); self.stack.setContentsMargins(0,0,0,0)
+        layout.addWidget(self.stack, 1)
+
+        # Pages are built on first use; until then the stack holds empty placeholders.
+        self._page_factories = [PageWelcome, PageSlicers, PageFilament, PageProcess, PageInstall, PageDone]
+        self._pages = {}
+        for _factory in self._page_factories:
+            self.stack.addWidget(QWidget())
+
+        nav = QHBoxLayout()
+        nav.setContentsMargins(24, 12, 24, 24)
+        nav.setSpacing(16)
+        self.btn_back = QPushButton("← Back"); self.btn_back.setStyleSheet("QPushButton{background:#eaecef;color:#111;border-radius:8px;}")
+        self.btn_next = QPushButton("Get started")
+        nav.addWidget(self.btn_back); nav.addStretch(1); nav.addWidget(self.btn_next)
+        layout.addLayout(nav)
+
+        self.btn_back.clicked.connect(self.on_back)
+        self.btn_next.clicked.connect(self.on_next)
+        # Install is triggered via the shared bottom-right navigation button.
+
+        self.repo_filament_all = []
+        self.repo_process_all  = []
+        self.invalid_profiles = {}
+        self.inherits_index = {}
+        self.copy_plan   = []
+        self.delete_plan = []
+        self.total_ops   = 0
+
+        self.downloader = None
+        self._download_state = None       # None | running | done | failed | ssl_error
+        self._download_result = None
+        self._download_consumed = False   # result already shown on step 2
+        self._download_attached = False   # step 2 is waiting on the fetch
+        self._install_cancel = None       # CancelToken of the running install
+        self._cached_catalog = None       # last known catalog, shown while the fetch revalidates it
+        self._revalidating = False        # step 2 shows the cached catalog, the fetch is re-checking it
+        self._shown_digest = None         # archive sha256 of the cached catalog on screen
+        self._install_pending = False     # Install clicked; waiting for a cancelled re-check to stop
+        self._closing = False             # window hidden, closing once the download thread exits
+
+        self._themed_index = None
+        self.show_page(0)
+        # Speculative prefetch while the user reads the disclaimer and picks slicers.
+        QTimer.singleShot(0, self.start_prefetch)
+
+    pg_welcome  = property(lambda self: self._page(0))   # Step 0
+    pg_slicers  = property(lambda self: self._page(1))   # Step 1
+    pg_filament = property(lambda self: self._page(2))   # Step 2
+    pg_process  = property(lambda self: self._page(3))   # Step 3
+    pg_install  = property(lambda self: self._page(4))   # Step 4
+    pg_done     = property(lambda self: self._page(5))
+
+    def _page(self, idx: int):
+        page = self._pages.get(idx)
+        if page is None:
+            page = self._page_factories[idx]()
+            self._pages[idx] = page
+            current = self.stack.currentIndex()
+            placeholder = self.stack.widget(idx)
+            self.stack.insertWidget(idx, page)
+            self.stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+            self.stack.setCurrentIndex(current)
+            self._connect_page(idx, page)
+        return page
+
+    def _connect_page(self, idx: int, page):
+        if idx == 0:
+            page.acceptance_changed.connect(self.update_nav)
+        elif idx == 1:
+            page.selection_changed.connect(self.update_nav)
+            page.base_changed.connect(self.update_nav)
+        elif idx == 2:
+            page.request_download.connect(self.reload_profiles)
+            page.request_cancel.connect(self.cancel_download)
+            page.selection_changed.connect(self.update_nav)
+        elif idx == 3:
+            page.selection_changed.connect(self.update_nav)
+        elif idx == 4:
+            page.request_cancel.connect(self.cancel_install)
+
+    def show_page(self, idx: int):
+        self._page(idx)
+        self.stack.setCurrentIndex(idx)
+        self.update_nav()
+
+    # Theming per stap
+    def apply_theme(self):
+        app = QApplication.instance()
+        idx = self.stack.currentIndex()
+        # Re-applying an application stylesheet restyles every widget; only do it
+        # when the page (and thus the theme) actually changes.
+        if idx == self._themed_index:
+            return
+        self._themed_index = idx
+        if idx == 0:
+            app.setStyleSheet(WELCOME_QSS)   # alles geel
+        else:
+            app.setStyleSheet(APP_QSS)       # licht thema
+
+    def update_nav(self):
+        self.apply_theme()
+        idx = self.stack.currentIndex()
+        # Back navigation makes sense only within the wizard, not after completion.
+        self.btn_back.setEnabled(0 < idx < 5)
+        if idx == 0:
+            self.btn_next.setText("Get started")
+            self.btn_next.setEnabled(self.pg_welcome.accepted())
+        elif idx == 1:
+            self.btn_next.setText("Next →")
+            self.btn_next.setEnabled(len(self.pg_slicers.selected_slicers()) > 0)
+        elif idx == 2:
+            self.btn_next.setText("Next →")
+            self.btn_next.setEnabled(self.pg_filament.loaded)
+        elif idx == 3:
+            self.btn_next.setText("Install")
+            self.btn_next.setEnabled(self.pg_process.loaded and not self._install_pending)
+            self.btn_back.setEnabled(not self._install_pending)
+        elif idx == 4:
+            self.btn_next.setText("Install")
+            self.btn_next.setEnabled(True)
+        else:
+            self.btn_next.setText("Close")
+            self.btn_next.setEnabled(True)
+
+    def on_back(self):
+        i = self.stack.currentIndex()
+        if i > 0: self.show_page(i - 1)
+        self.update_nav()
+
+    def on_next(self):
+        self.update_nav()
+        i = self.stack.currentIndex()
+        if i == 0:
+            self.show_page(1)
+        elif i == 1:
+            self.show_page(2)
+            self.download_profiles()  # auto-load
+        elif i == 2:
+            self.show_page(3)
+        elif i == 3:
+            self.finish_revalidation(self.start_install)
+            return
+        elif i == 4:
+            self.install_selected()
+        else:
+            self.close()
+        self.update_nav()
+
+    # DOWNLOAD
+    # The profiles ZIP is prefetched (download, verify, extract, catalog) at low
+    # priority as soon as the window opens. Step 2 then *attaches* to that fetch:
+    # progress and results only reach the UI once attached, and prefetch errors are
+    # reported when the user gets there rather than over the welcome page.
+    # With a saved catalog, step 2 shows it immediately (stale-while-revalidate);
+    # the prefetch becomes a conditional request and any upstream change is
+    # diffed into the shown lists, keeping the user's check marks.
+    def start_prefetch(self):
+        if self.downloader is None:
+            self._cached_catalog = load_catalog_cache(self.extract_dir)
+            self._start_download(verify_ssl=True, priority=QThread.LowPriority)
+
+    def _start_download(self, verify_ssl: bool, priority=QThread.InheritPriority):
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self._download_state = "running"
+        self._download_result = None
+        self._download_consumed = False
+        # Read at call time: --source may point the installer at a LAN cache.
+        self.downloader = ZipDownloader(installer_core.GITHUB_ZIP_URL, self.zip_path, verify_ssl=verify_ssl,
+                                        extract_dir=self.extract_dir, cached=self._cached_catalog)
+        self.downloader.progress.connect(self.on_download_progress)
+        self.downloader.finished_ok.connect(self.on_download_done)
+        self.downloader.failed.connect(self.on_download_failed)
+        self.downloader.ssl_error.connect(self.on_ssl_error)
+        self.downloader.cancelled.connect(self.on_download_cancelled)
+        self.downloader.start(priority)
+        if self._download_attached:
+            self.pg_filament.set_busy(True)
+
+    def reload_profiles(self):
+        """'Load Profiles' button: fetch again unless a fetch is already running."""
+        self.download_profiles(force=True)
+
+    def download_profiles(self, verify_ssl: bool = True, force: bool = False):
+        try:
+            self._download_attached = True
+            self.pg_filament.set_busy(True)
+            state = self._download_state
+            if state == "running":
+                if self._cached_catalog is not None:
+                    self.show_cached_catalog()
+                else:
+                    self.pg_filament.info.setText("Downloading profiles ZIP from GitHub...")
+                # The user is now waiting on it: no longer a background prefetch.
+                self.downloader.setPriority(QThread.NormalPriority)
+                return
+            if state == "done" and not (force and self._download_consumed):
+                self.apply_downloaded_profiles()
+                return
+            if state in ("failed", "ssl_error") and not self._download_consumed:
+                self._download_consumed = True
+                if state == "failed" and self._cached_catalog is not None:
+                    self.show_cached_catalog()
+                    self.report_revalidation_failed(self._download_result)
+                elif state == "failed":
+                    self.report_download_failed(self._download_result)
+                else:
+                    self.report_ssl_error(self._download_result)
+                return
+            self.pg_filament.info.setText("Downloading profiles ZIP from GitHub...")
+            self._start_download(verify_ssl=verify_ssl)
+            if self._cached_catalog is not None and not self.pg_filament.loaded:
+                self.show_cached_catalog()
+        except Exception as e:
+            QMessageBox.critical(self, "Download error", str(e))
+            self.pg_filament.set_busy(False)
+
+    def on_download_progress(self, downloaded: int, total: int):
+        if not self._download_attached or self.sender() is not self.downloader:
+            return
+        if total > 0:
+            self.pg_filament.info.setText(f"Downloading... {humanize_bytes(downloaded)} / {humanize_bytes(total)}")
+        else:
+            self.pg_filament.info.setText(f"Downloading... {humanize_bytes(downloaded)}")
+
+    @timed("gui.cached_catalog")
+    def show_cached_catalog(self):
+        """Fill steps 2 and 3 from the saved catalog while the running fetch revalidates it."""
+        c = self._cached_catalog
+        self._revalidating = True
+        self._shown_digest = c["sha256"]
+        self.repo_filament_all = c["filament"]
+        self.repo_process_all  = c["process"]
+        self.invalid_profiles  = c["invalid"]
+        self.inherits_index    = c["inherits"]
+        sel = self.pg_slicers.selected_slicers()
+        self.pg_filament.set_items(c["filament"], sel, c["inherits"])
+        self.pg_process.set_items(c["process"], sel, c["inherits"])
+        self.pg_filament.info.setText(
+            f"Loaded {self.pg_filament.model.rowCount()} filament profiles (saved list); checking for updates..."
+        )
+        self.update_nav()
+
+    def finish_revalidation(self, then):
+        """Stop a background re-check, then call `then` once its thread has exited.
+
+        Planning must not start while the extracted tree can still change. The
+        thread is polled instead of waited on, so the wizard stays responsive
+        even if the cancelled request takes a while to unwind.
+        """
+        d = self.downloader
+        if not (self._revalidating and self._download_state == "running" and d is not None and d.isRunning()):
+            then()
+            return
+        self._install_pending = True
+        self.update_nav()
+        self.pg_process.info.setText("Stopping the update check...")
+        d.cancel()  # sets the token and shuts the socket down; returns at once
+
+        def poll():
+            if not d.isFinished():
+                QTimer.singleShot(50, poll)
+                return
+            # Deliver its finished_ok (extraction already swapped in) or cancelled signal first.
+            QApplication.processEvents()
+            self._install_pending = False
+            if self._closing:
+                return
+            if self.stack.currentIndex() == 3:
+                then()
+            else:
+                self.update_nav()
+
+        QTimer.singleShot(50, poll)
+
+    def start_install(self):
+        self.prepare_copy_and_delete_plans()
+        self.show_page(4)
+        self.update_nav()
+        QApplication.processEvents()
+        self.install_selected()
+
+    def report_revalidation_failed(self, msg: str):
+        self._revalidating = False
+        self.pg_filament.set_busy(False)
+        self.pg_filament.info.setText(f"Could not check for updates ({msg}); showing the saved list.")
+        self.update_nav()
+
+    def on_download_done(self, zip_path: Path, digest: str):
+        if self.sender() is not self.downloader:
+            return
+        d = self.downloader
+        self._download_state = "done"
+        self._download_result = (zip_path, digest, d.filament, d.process, d.invalid, d.inherits)
+        self._cached_catalog = {"sha256": digest, "filament": d.filament, "process": d.process,
+                                "invalid": d.invalid, "inherits": d.inherits, **d.validators}
+        if self._download_attached:
+            self.apply_downloaded_profiles()
+
+    def apply_downloaded_profiles(self):
+        try:
+            _zip_path, digest, fil, proc, invalid, inherits = self._download_result
+            self._download_consumed = True
+            self.repo_filament_all = fil
+            self.repo_process_all  = proc
+            self.invalid_profiles  = invalid
+            self.inherits_index    = inherits
+            sel = self.pg_slicers.selected_slicers()
+            if self._revalidating:
+                self._revalidating = False
+                if digest == self._shown_digest:
+                    self.pg_filament.info.setText(
+                        f"Loaded {self.pg_filament.model.rowCount()} filament profiles (up to date)."
+                    )
+                else:
+                    fa, fr, fc = self.pg_filament.update_items(fil, sel, inherits)
+                    pa, pr, pc = self.pg_process.update_items(proc, sel, inherits)
+                    self.pg_filament.info.setText(
+                        f"Profiles updated: {fa + pa} new, {fr + pr} removed, {fc + pc} changed."
+                    )
+            else:
+                self.pg_filament.set_items(self.repo_filament_all, sel, inherits)
+                self.pg_process.set_items(self.repo_process_all, sel, inherits)
+            if not self.repo_filament_all and not self.repo_process_all:
+                raise RuntimeError("No profiles found in ZIP. Check repo structure and extensions.")
+        except Exception as e:
+            QMessageBox.critical(self, "Extract error", str(e))
+        finally:
+            self.pg_filament.set_busy(False)
+            self.update_nav()
+
+    def cancel_download(self):
+        """'Cancel Download' button: stop the running fetch; cleanup happens in the worker."""
+        if self._download_state == "running" and self.downloader is not None:
+            self.pg_filament.btn_cancel.setEnabled(False)
+            self.pg_filament.info.setText("Cancelling download...")
+            self.downloader.cancel()
+
+    def on_download_cancelled(self):
+        if self.sender() is not self.downloader:
+            return
+        # Nothing to keep: the next 'Load Profiles' starts a fresh fetch.
+        self._download_state = None
+        self._download_result = None
+        if self._download_attached:
+            self.pg_filament.set_busy(False)
+            if self._revalidating:
+                self._revalidating = False
+                self.pg_filament.info.setText("Update check cancelled; showing the saved list.")
+            else:
+                self.pg_filament.info.setText("Download cancelled. Click 'Load Profiles' to retry.")
+            self.update_nav()
+
+    def on_download_failed(self, msg: str):
+        if self.sender() is not self.downloader:
+            return
+        self._download_state = "failed"
+        self._download_result = msg
+        if self._download_attached:
+            self._download_consumed = True
+            if self._revalidating:
+                self.report_revalidation_failed(msg)
+            else:
+                self.report_download_failed(msg)
+
+    def report_download_failed(self, msg: str):
+        QMessageBox.critical(self, "Download failed", msg)
+        self.pg_filament.set_busy(False)
+        self.update_nav()
+
+    def on_ssl_error(self, msg: str):
+        if self.sender() is not self.downloader:
+            return
+        self._download_state = "ssl_error"
+        self._download_result = msg
+        if self._download_attached:
+            self._download_consumed = True
+            self.report_ssl_error(msg)
+
+    def report_ssl_error(self, msg: str):
+        """Handle SSL certificate errors with user-friendly retry option."""
+        result = QMessageBox.warning(
+            self,
+            "SSL Certificate Error",
+            f"Unable to verify GitHub's SSL certificate. This can happen on systems with outdated certificate stores.\n\n"
+            f"Error details: {msg}\n\n"
+            f"Would you like to retry without SSL verification?\n\n"
+            f"Note: Disabling SSL verification is less secure but safe for downloading from trusted sources like GitHub.",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        
+        if result == QMessageBox.Yes:
+            # Retry without SSL verification
+            self._start_download(verify_ssl=False)
+        else:
+            self.pg_filament.set_busy(False)
+            if self._revalidating:
+                self._revalidating = False
+                self.pg_filament.info.setText("Update check skipped; showing the saved list.")
+            else:
+                self.pg_filament.info.setText("Download cancelled. Click 'Load Profiles' to retry.")
+            self.update_nav()
+
+    # PLANS
+    def _dest_for_item(self, it, targets):
+        slicer = it["slicer"]
+        category = it.get("category", "filament")
+        base = targets.get(slicer, {}).get(category)
+        if not base:
+            return None
+        if isinstance(base, list):
+            return [b / it["src"].name for b in base]
+        return base / it["src"].name
+
+    @timed("gui.plan")
+    def prepare_copy_and_delete_plans(self):
+        targets = self.pg_slicers.targets_for_selected()
+        for slicer, cats in targets.items():
+            for d in cats.values():
+                if isinstance(d, list):
+                    for dd in d:
+                        ensure_dir(dd)
+                else:
+                    ensure_dir(d)
+
+        all_dests = set()
+        for it in self.pg_filament.items:
+            dst = self._dest_for_item(it, targets)
+            if isinstance(dst, list):
+                for d in dst:
+                    all_dests.add(d)
+            elif dst:
+                all_dests.add(dst)
+        for it in self.pg_process.items:
+            dst = self._dest_for_item(it, targets)
+            if isinstance(dst, list):
+                for d in dst:
+                    all_dests.add(d)
+            elif dst:
+                all_dests.add(dst)
+
+        fil_rows, fil_parents = self.pg_filament.selected_with_parents()
+        proc_rows, proc_parents = self.pg_process.selected_with_parents()
+        sel_dests = set()
+        for idx in fil_rows:
+            it = self.pg_filament.items[idx]; dst = self._dest_for_item(it, targets)
+            if isinstance(dst, list):
+                for d in dst:
+                    sel_dests.add(d)
+            elif dst:
+                sel_dests.add(dst)
+        for idx in proc_rows:
+            it = self.pg_process.items[idx];  dst = self._dest_for_item(it, targets)
+            if isinstance(dst, list):
+                for d in dst:
+                    sel_dests.add(d)
+            elif dst:
+                sel_dests.add(dst)
+
+        self.delete_plan = [p for p in all_dests - sel_dests if p.exists() and p.is_file()]
+        self.copy_plan   = []
+        for idx in fil_rows:
+            it = self.pg_filament.items[idx]; dst = self._dest_for_item(it, targets)
+            if isinstance(dst, list):
+                for d in dst:
+                    self.copy_plan.append((it["src"], d))
+            elif dst:
+                self.copy_plan.append((it["src"], dst))
+        for idx in proc_rows:
+            it = self.pg_process.items[idx];  dst = self._dest_for_item(it, targets)
+            if isinstance(dst, list):
+                for d in dst:
+                    self.copy_plan.append((it["src"], d))
+            elif dst:
+                self.copy_plan.append((it["src"], dst))
+
+        # Validated in the download worker: never write a profile the slicer cannot parse.
+        failures = {src: self.invalid_profiles[src] for src, _ in self.copy_plan if src in self.invalid_profiles}
+        if failures:
+            _log_validation_failures(failures)
+            self.copy_plan = [(src, dst) for src, dst in self.copy_plan if src not in failures]
+        self.pg_install.show_problems(failures)
+
+        self.total_ops = len(self.copy_plan)
+        self.pg_install.progress.setMaximum(max(1, self.total_ops))
+        text = f"Installing {self.total_ops} files (removing {len(self.delete_plan)} deselected)..."
+        if fil_parents + proc_parents:
+            text += f"\nAlso installing {fil_parents + proc_parents} unchecked parent presets that selected profiles inherit from."
+        self.pg_install.label.setText(text)
+        self.pg_install.detail.setText("Ready.")
+
+    # INSTALL
+    def cancel_install(self):
+        if self._install_cancel is not None:
+            self.pg_install.btn_cancel.setEnabled(False)
+            self.pg_install.detail.setText("Cancelling after the current file...")
+            self._install_cancel.cancel()
+
+    @timed("gui.install")
+    def install_selected(self):
+        cancel = self._install_cancel = CancelToken()
+        backup = BackupRun("gui")
+        try:
+            # Disable navigation during install to prevent double-clicks.
+            self.btn_back.setEnabled(False)
+            self.btn_next.setEnabled(False)
+            self.pg_install.btn_cancel.setEnabled(True)
+            removed = []
+            for dst in self.delete_plan:
+                if cancel.cancelled:
+                    break
+                try:
+                    backup.before_change(dst, delete=True)
+                    dst.unlink(missing_ok=True)
+                    removed.append(dst)
+                    self.pg_install.detail.setText(f"Removed {dst.name} from {dst.parent}")
+                    QApplication.processEvents()
+                except Exception as e:
+                    logging.error(f"Failed to remove {dst}: {e}")
+            rewrite_installed_list(remove_paths=removed, add_paths=[])
+            done = 0; added = []
+            try:
+                for src, dst in self.copy_plan:
+                    if cancel.cancelled:
+                        break
+                    backup.before_change(dst, src=src)
+                    ensure_dir(dst.parent)
+                    shutil.copy2(src, dst)
+                    added.append(dst)
+                    done += 1
+                    self.pg_install.progress.setValue(done)
+                    self.pg_install.detail.setText(f"Copying {src.name} → {dst}")
+                    QApplication.processEvents()
+            finally:
+                # Record whatever was written, so uninstall can still remove it.
+                rewrite_installed_list(remove_paths=[], add_paths=added)
+                saved = backup.commit()
+            if cancel.cancelled:
+                logging.info(f"Install cancelled after {done}/{self.total_ops} files")
+                self.pg_install.detail.setText(
+                    f"Cancelled. Installed {done} of {self.total_ops} files; click Install to run it again."
+                )
+                return
+            self.pg_install.detail.setText("Done.")
+            note = f"\nTo undo this install, run the installer with --restore {backup.run_id}." if saved else ""
+            self.pg_done.summary.setText(
+                f"Installed {self.total_ops} files.\nRemoved {len(removed)} deselected files.{note}\nYou can close the installer."
+            )
+            self.show_page(5)
+            self.update_nav()
+        except Exception as e:
+            QMessageBox.critical(self, "Install error", str(e))
+        finally:
+            self._install_cancel = None
+            self.pg_install.btn_cancel.setEnabled(False)
+            # Restore navigation state based on the active page.
+            self.update_nav()
+
+    def closeEvent(self, event):
+        # Stop background work promptly; workers clean up their partial files.
+        if self._install_cancel is not None:
+            self._install_cancel.cancel()
+        if self.downloader is not None and self.downloader.isRunning():
+            if self._closing:
+                # Back from `finished`: run() has returned, this only joins the thread.
+                self.downloader.wait()
+            else:
+                # cancel() only flags the worker and shuts its socket down; it never
+                # blocks. Hide now and close for real once the thread has exited: Qt
+                # must never destroy a QThread that is still running (e.g. still
+                # cataloguing a tree that was already swapped in).
+                self._closing = True
+                self.downloader.cancel()
+                self.hide()
+                self.downloader.finished.connect(self.close)
+                event.ignore()
+                return
+        if 1 in self._pages:
+            for det in list(self.pg_slicers._detectors):
+                det.requestInterruption()
+                det.wait(1000)
+        super().closeEvent(event)
+
+def show_message(kind: str, text: str):
+    """Standalone message box for CLI modes (e.g. --check-download in the windowed EXE)."""
+    app = QApplication.instance() or QApplication(sys.argv)
+    if kind == "critical":
+        QMessageBox.critical(None, APP_DISPLAY_NAME, text)
+    else:
+        QMessageBox.information(None, APP_DISPLAY_NAME, text)
+
+def run_wizard(pyi_splash=None) -> int:
+    app = QApplication(sys.argv)
+    app.setStyleSheet(WELCOME_QSS)  # start geel
+    # Zet geel icoon (taskbar duidelijk)
+    try:
+        icon = window_icon()
+        if icon is not None:
+            app.setWindowIcon(icon)
+    except Exception:
+        pass
+
+    with span("gui.window"):
+        w = InstallerWindow()
+        w.show()
+    try:
+        if pyi_splash and pyi_splash.is_alive():
+            QTimer.singleShot(0, pyi_splash.close)
+    except Exception:
+        pass
+    return app.exec()
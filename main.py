@@ -2,1457 +2,36 @@ from __future__ import annotations
 
 # main.py (full, updated: full yellow Step 0 + improved list visibility + yellow taskbar icon + robust Select/Deselect All + delete deselected + logging/signal fixes)
 # colorFabb Filament Installer — 2026 look & feel
+#
+# Entry point. The GUI-free core lives in installer_core.py; the PySide6 wizard in
+# installer_gui.py is only imported when the wizard (or a message box) is needed,
+# so headless runs start without loading Qt.
 
-import sys, os, zipfile, shutil, hashlib, argparse, logging, tempfile, ssl
+import os, sys, argparse, logging, atexit, signal
 from pathlib import Path
-from urllib.request import urlopen, Request
 
-# Try to import certifi for better SSL certificate handling
-try:
-    import certifi
-    CERTIFI_AVAILABLE = True
-except ImportError:
-    CERTIFI_AVAILABLE = False
+import installer_core
+from installer_core import (
+    APP_DISPLAY_NAME, ALL_SLICERS, TEMP_ROOT, appdata_base, setup_logging,
+    uninstall_installed_files, check_download_only, detect_slicers, headless_install,
+    enumerate_user_homes, fleet_install, enable_timings, write_timings, metrics_run, LOG_VERBOSITIES,
+    CancelToken, restore_backup, list_backups, watch_install, WATCH_INTERVAL, WATCH_JITTER, serve_cache, SERVE_PORT, SERVE_REFRESH_INTERVAL,
+)
 
-GUI_ENABLED = True
-try:
-    from PySide6.QtCore import Qt, QThread, Signal, QSize, QTimer
-    from PySide6.QtWidgets import (
-        QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-        QListWidget, QListWidgetItem, QProgressBar, QStackedWidget, QCheckBox,
-        QMessageBox, QFileDialog, QLineEdit, QDialog, QTextEdit, QDialogButtonBox
-    )
-    from PySide6.QtGui import QIcon, QPixmap, QPainter, QColor
-except Exception:
-    GUI_ENABLED = False
-
-    class _QtStub:  # noqa: D401
-        pass
-
-    class _SignalStub:
-        def __init__(self, *args, **kwargs):
-            pass
-
-        def emit(self, *args, **kwargs):
-            pass
-
-    def Signal(*args, **kwargs):  # type: ignore
-        return _SignalStub(*args, **kwargs)
-
-    Qt = _QtStub
-    QSize = _QtStub
-    QThread = object
-    QApplication = object
-    QWidget = object
-    QVBoxLayout = object
-    QHBoxLayout = object
-    QLabel = object
-    QPushButton = object
-    QListWidget = object
-    QListWidgetItem = object
-    QProgressBar = object
-    QStackedWidget = object
-    QCheckBox = object
-    QMessageBox = object
-    QFileDialog = object
-    QLineEdit = object
-    QDialog = object
-    QTextEdit = object
-    QDialogButtonBox = object
-    QIcon = object
-    QPixmap = object
-    QPainter = object
-    QColor = object
-
-APP_DISPLAY_NAME = "colorFabb Filament Installer"
 VERSION = "1.6.25"
 
-DISCLAIMER_TEXT = """colorFabb Profile Installer – Disclaimer / Important Information (Free Tool)
-
-This free installer downloads and installs 3D printing profiles ("Profiles") maintained by colorFabb from a public GitHub repository and copies them into configuration folders used by the following third-party slicing applications:
-
-• PrusaSlicer
-• OrcaSlicer
-• Bambu Studio
-• Snapmaker Orca
-• AnyCubicSlicer
-• QIDI Studio
-
-By continuing, you acknowledge and agree that:
-
-Third-party software
-PrusaSlicer, OrcaSlicer, Bambu Studio, Snapmaker Orca, AnyCubicSlicer, and QIDI Studio are owned and controlled by third parties. colorFabb does not guarantee compatibility with any specific slicer version, operating system version, or system configuration.
-
-Overwriting existing files
-The installer may create, modify, or overwrite profile files in the target slicer's configuration directories. If a profile file with the same filename already exists, it may be replaced. You are responsible for backing up your existing profiles and settings before proceeding.
-
-System changes
-The installer writes files into user-level application data folders (such as Windows AppData or macOS Application Support) used by your slicers. These changes may affect slicer behavior, available presets, and print results.
-
-Use at your own risk
-Profiles are provided "AS IS" and may not be suitable for your printer, firmware, hardware setup, material batch, environment, or intended use. Incorrect settings may cause failed prints, reduced quality, excessive wear, or equipment damage. Always review profile settings and perform a test print before production use.
-
-No warranties
-To the maximum extent permitted by law, colorFabb disclaims all warranties, express or implied, including merchantability, fitness for a particular purpose, and non-infringement.
-
-Limitation of liability
-To the maximum extent permitted by law, colorFabb is not liable for any direct, indirect, incidental, special, consequential, or exemplary damages, including loss of data, loss of profits, business interruption, hardware damage, or any other loss arising out of or related to the use of this installer or the Profiles, even if advised of the possibility of such damages.
-
-Network and source availability
-Installation requires internet access to download content from GitHub. colorFabb does not guarantee availability, integrity, or continued access to remote resources, and installation may fail or be incomplete due to network conditions or repository changes.
-
-If you do not agree, cancel the installation.
-"""
-
-GITHUB_ZIP_URL = "https://github.com/colorfabb/printer-profiles/archive/refs/heads/main.zip"
-EXPECTED_SHA256 = None
-
-PRUSA_EXTS = {".ini"}
-JSON_EXTS  = {".json", ".jso"}
-
-LINUX_FLATPAK_BASES = {
-    "BambuStudio": ("com.bambulab.BambuStudio", "BambuStudio"),
-    "PrusaSlicer": ("com.prusa3d.PrusaSlicer", "PrusaSlicer"),
-    "OrcaSlicer": ("com.orcaslicer.OrcaSlicer", "OrcaSlicer"),
-    "AnyCubicSlicer": ("com.anycubic.SlicerNext", "AnycubicSlicerNext"),
-}
-
-# ========= PATH HELPERS =========
-def appdata_base() -> Path:
-    if sys.platform.startswith("win"):
-        return Path(os.environ.get("APPDATA", str(Path.home() / "AppData" / "Roaming")))
-    elif sys.platform == "darwin":
-        return Path.home() / "Library" / "Application Support"
-    else:
-        return Path.home() / ".config"
-
-def _unique_paths(paths: list[Path]) -> list[Path]:
-    seen: set[str] = set()
-    out: list[Path] = []
-    for path in paths:
-        key = str(path)
-        if key in seen:
-            continue
-        seen.add(key)
-        out.append(path)
-    return out
-
-def _merge_target_values(*values):
-    merged: list[Path] = []
-    for value in values:
-        if not value:
-            continue
-        if isinstance(value, list):
-            merged.extend(value)
-        else:
-            merged.append(value)
-
-    merged = _unique_paths(merged)
-    if not merged:
-        return None
-    if len(merged) == 1:
-        return merged[0]
-    return merged
-
-def _linux_flatpak_app_root(flatpak_id: str, app_dir: str) -> Path:
-    return Path.home() / ".var" / "app" / flatpak_id / "config" / app_dir
-
-def _linux_flatpak_targets():
-    bambu_root = _linux_flatpak_app_root(*LINUX_FLATPAK_BASES["BambuStudio"])
-    anycubic_root = _linux_flatpak_app_root(*LINUX_FLATPAK_BASES["AnyCubicSlicer"])
-    prusa_root = _linux_flatpak_app_root(*LINUX_FLATPAK_BASES["PrusaSlicer"])
-    orca_root = _linux_flatpak_app_root(*LINUX_FLATPAK_BASES["OrcaSlicer"])
+def _detect_in(bases: list[Path]) -> list[str]:
+    """Slicers detected in any of `bases`, in ALL_SLICERS order."""
+    found = {s for b in bases for s in detect_slicers(b)}
+    return [s for s in ALL_SLICERS if s in found]
 
-    bambu_user_roots = _discover_bambu_user_profile_roots(bambu_root.parent)
-    anycubic_user_roots = _discover_anycubic_user_profile_roots(anycubic_root.parent)
-
-    return {
-        "PrusaSlicer": {
-            "filament": prusa_root / "filament",
-            "print":    prusa_root / "print",
-        },
-        "OrcaSlicer": {
-            "filament": orca_root / "user" / "default" / "filament",
-            "process":  orca_root / "user" / "default" / "process",
-        },
-        "BambuStudio": {
-            "filament": [p / "filament" for p in bambu_user_roots],
-            "process":  [p / "process" for p in bambu_user_roots],
-        },
-        "AnyCubicSlicer": {
-            "filament": [p / "filament" for p in anycubic_user_roots],
-            "process":  [p / "process" for p in anycubic_user_roots],
-        },
-    }
-
-def _bambu_studio_root_from_base(base: Path) -> Path:
-    """Resolve the BambuStudio root folder from a user-provided base path.
-
-    The UI allows browsing any folder, so handle common selections:
-    - %APPDATA% (Roaming)          -> base/BambuStudio
-    - %APPDATA%/BambuStudio       -> base
-    - %APPDATA%/BambuStudio/user  -> base.parent
-    """
-    try:
-        name = base.name.lower()
-    except Exception:
-        name = ""
-
-    if name == "bambustudio":
-        return base
-    if name == "user" and base.parent.name.lower() == "bambustudio":
-        return base.parent
-    return base / "BambuStudio"
-
-def _discover_bambu_user_profile_root(base: Path) -> Path:
-    """Pick the best BambuStudio user folder.
-
-    Deprecated in favor of `_discover_bambu_user_profile_roots()`.
-    Kept for compatibility; returns the most recently modified candidate.
-    """
-    roots = _discover_bambu_user_profile_roots(base)
-    return roots[0]
-
-def _discover_bambu_user_profile_roots(base: Path) -> list[Path]:
-    """Discover BambuStudio user folders.
-
-    BambuStudio creates per-account folders under %APPDATA%\\BambuStudio\\user\\<digits>.
-    Multiple accounts can be active, so we return *all* candidate folders, sorted by most
-    recently modified (descending).
-
-    Stricter rule: only numeric folders are considered active accounts. We fall back to
-    user\\default only if no numeric folders exist.
-    """
-    bambu_root = _bambu_studio_root_from_base(base)
-    user_root = bambu_root / "user"
-    default_root = user_root / "default"
-
-    if not user_root.exists():
-        return [default_root]
-
-    candidates: list[Path] = []
-    try:
-        for d in user_root.iterdir():
-            if not d.is_dir():
-                continue
-            # Strict: only numeric account folders.
-            if d.name.isdigit():
-                candidates.append(d)
-    except Exception:
-        candidates = []
-
-    if not candidates:
-        return [default_root]
-
-    # De-dupe while preserving order (after sort)
+def _load_gui():
+    """Import the PySide6 wizard module, or None if Qt is unavailable."""
     try:
-        candidates = sorted(candidates, key=lambda p: p.stat().st_mtime, reverse=True)
-    except Exception:
-        pass
-
-    seen: set[str] = set()
-    out: list[Path] = []
-    for p in candidates:
-        k = str(p)
-        if k in seen:
-            continue
-        seen.add(k)
-        out.append(p)
-
-    return out if out else [default_root]
-
-def _anycubic_slicer_root_from_base(base: Path) -> Path:
-    """Resolve the AnycubicSlicerNext root folder from a user-provided base path.
-
-    The UI allows browsing any folder, so handle common selections:
-    - %APPDATA% (Roaming)                 -> base/AnycubicSlicerNext
-    - %APPDATA%/AnycubicSlicerNext        -> base
-    - %APPDATA%/AnycubicSlicerNext/user   -> base.parent
-    """
-    try:
-        name = base.name.lower()
-    except Exception:
-        name = ""
-
-    if name == "anycubicslicernext":
-        return base
-    if name == "user" and base.parent.name.lower() == "anycubicslicernext":
-        return base.parent
-    return base / "AnycubicSlicerNext"
-
-def _discover_anycubic_user_profile_roots(base: Path) -> list[Path]:
-    """Discover AnycubicSlicerNext user folders.
-
-    AnycubicSlicerNext creates per-account folders under %APPDATA%\\AnycubicSlicerNext\\user\\<digits>.
-    Multiple accounts can be active, so we return *all* numeric folders, sorted by most recently
-    modified (descending). We fall back to user\\default only if no numeric folders exist.
-    """
-    anycubic_root = _anycubic_slicer_root_from_base(base)
-    user_root = anycubic_root / "user"
-    default_root = user_root / "default"
-
-    if not user_root.exists():
-        return [default_root]
-
-    candidates: list[Path] = []
-    try:
-        for d in user_root.iterdir():
-            if not d.is_dir():
-                continue
-            if d.name.isdigit():
-                candidates.append(d)
-    except Exception:
-        candidates = []
-
-    if not candidates:
-        return [default_root]
-
-    try:
-        candidates = sorted(candidates, key=lambda p: p.stat().st_mtime, reverse=True)
-    except Exception:
-        pass
-
-    seen: set[str] = set()
-    out: list[Path] = []
-    for p in candidates:
-        k = str(p)
-        if k in seen:
-            continue
-        seen.add(k)
-        out.append(p)
-
-    return out if out else [default_root]
-
-def _snapmaker_orca_root_from_base(base: Path) -> Path:
-    """Resolve the Snapmaker Orca root folder from a user-provided base path.
-
-    The UI allows browsing any folder, so handle common selections:
-    - %APPDATA% (Roaming)                -> base/Snapmaker_Orca
-    - %APPDATA%/Snapmaker_Orca           -> base
-    - %APPDATA%/Snapmaker_Orca/user      -> base.parent
-    """
-    try:
-        name = base.name.lower()
-    except Exception:
-        name = ""
-
-    if name in {"snapmaker_orca", "snapmakerorca"}:
-        return base
-    if name == "user" and base.parent.name.lower() in {"snapmaker_orca", "snapmakerorca"}:
-        return base.parent
-    return base / "Snapmaker_Orca"
-
-def _discover_snapmaker_orca_user_profile_roots(base: Path) -> list[Path]:
-    """Discover Snapmaker Orca user folders.
-
-    Snapmaker Orca creates per-account folders under %APPDATA%\\Snapmaker_Orca\\user\\<digits>.
-    Multiple accounts can be active, so we return *all* numeric folders, sorted by most recently
-    modified (descending). We fall back to user\\default only if no numeric folders exist.
-    """
-    snap_root = _snapmaker_orca_root_from_base(base)
-    user_root = snap_root / "user"
-    default_root = user_root / "default"
-
-    if not user_root.exists():
-        return [default_root]
-
-    candidates: list[Path] = []
-    try:
-        for d in user_root.iterdir():
-            if not d.is_dir():
-                continue
-            if d.name.isdigit():
-                candidates.append(d)
-    except Exception:
-        candidates = []
-
-    if not candidates:
-        return [default_root]
-
-    try:
-        candidates = sorted(candidates, key=lambda p: p.stat().st_mtime, reverse=True)
-    except Exception:
-        pass
-
-    seen: set[str] = set()
-    out: list[Path] = []
-    for p in candidates:
-        k = str(p)
-        if k in seen:
-            continue
-        seen.add(k)
-        out.append(p)
-
-    return out if out else [default_root]
-
-def _qidi_studio_root_from_base(base: Path) -> Path:
-    """Resolve the QIDIStudio root folder from a user-provided base path.
-
-    The UI allows browsing any folder, so handle common selections:
-    - %APPDATA% (Roaming)          -> base/QIDIStudio
-    - %APPDATA%/QIDIStudio         -> base
-    - %APPDATA%/QIDIStudio/user    -> base.parent
-    """
-    try:
-        name = base.name.lower()
-    except Exception:
-        name = ""
-
-    if name == "qidistudio":
-        return base
-    if name == "user" and base.parent.name.lower() == "qidistudio":
-        return base.parent
-    return base / "QIDIStudio"
-
-def _discover_qidi_user_profile_roots(base: Path) -> list[Path]:
-    """Discover QIDIStudio user folders.
-
-    QIDIStudio creates per-account folders under %APPDATA%\\QIDIStudio\\user\\<digits>.
-    Multiple accounts can be active, so we return *all* numeric folders, sorted by most recently
-    modified (descending). We fall back to user\\default only if no numeric folders exist.
-    """
-    qidi_root = _qidi_studio_root_from_base(base)
-    user_root = qidi_root / "user"
-    default_root = user_root / "default"
-
-    if not user_root.exists():
-        return [default_root]
-
-    candidates: list[Path] = []
-    try:
-        for d in user_root.iterdir():
-            if not d.is_dir():
-                continue
-            if d.name.isdigit():
-                candidates.append(d)
-    except Exception:
-        candidates = []
-
-    if not candidates:
-        return [default_root]
-
-    try:
-        candidates = sorted(candidates, key=lambda p: p.stat().st_mtime, reverse=True)
-    except Exception:
-        pass
-
-    seen: set[str] = set()
-    out: list[Path] = []
-    for p in candidates:
-        k = str(p)
-        if k in seen:
-            continue
-        seen.add(k)
-        out.append(p)
-
-    return out if out else [default_root]
-
-def slicer_targets_from_base(base: Path):
-    bambu_user_roots = _discover_bambu_user_profile_roots(base)
-    anycubic_user_roots = _discover_anycubic_user_profile_roots(base)
-    snapmaker_orca_user_roots = _discover_snapmaker_orca_user_profile_roots(base)
-    qidi_user_roots = _discover_qidi_user_profile_roots(base)
-    targets = {
-        "PrusaSlicer": {
-            "filament": base / "PrusaSlicer" / "filament",
-            "print":    base / "PrusaSlicer" / "print",
-        },
-        "OrcaSlicer": {
-            "filament": base / "OrcaSlicer" / "user" / "default" / "filament",
-            "process":  base / "OrcaSlicer" / "user" / "default" / "process",
-        },
-        "BambuStudio": {
-            "filament": [p / "filament" for p in bambu_user_roots],
-            "process":  [p / "process" for p in bambu_user_roots],
-        },
-        "SnapmakerOrca": {
-            "filament": [p / "filament" for p in snapmaker_orca_user_roots],
-            "process":  [p / "process" for p in snapmaker_orca_user_roots],
-        },
-        "AnyCubicSlicer": {
-            "filament": [p / "filament" for p in anycubic_user_roots],
-            "process":  [p / "process" for p in anycubic_user_roots],
-        },
-        "QIDIStudio": {
-            "filament": [p / "filament" for p in qidi_user_roots],
-            "process":  [p / "process" for p in qidi_user_roots],
-        },
-    }
-
-    if not sys.platform.startswith("linux"):
-        return targets
-
-    flatpak_targets = _linux_flatpak_targets()
-    merged_targets = {}
-    for slicer, categories in targets.items():
-        merged_targets[slicer] = {}
-        flatpak_categories = flatpak_targets.get(slicer, {})
-        for category in sorted(set(categories) | set(flatpak_categories)):
-            merged_targets[slicer][category] = _merge_target_values(
-                categories.get(category),
-                flatpak_categories.get(category),
-            )
-    return merged_targets
-
-# ========= TEMP =========
-TEMP_ROOT = Path(tempfile.gettempdir()) / "colorfabb_installer"
-CACHE_DIR = TEMP_ROOT / "cache"
-INSTALLED_LIST = TEMP_ROOT / "installed_files.txt"
-LOG_FILE = TEMP_ROOT / "installer.log"
-
-# ========= LOGO (MEIPASS-aware) =========
-SCRIPT_DIR = Path(__file__).parent
-LOGO_CANDIDATES = [
-    ("logo/cF_Logo.png", "logo"),            # primair
-    ("logo/logo.png",    "logo"),
-    ("logo/colorfabb.png","logo"),
-    ("logo/colorfabb_logo.png","logo"),
-    ("logo.png",         ""),                # root fallback
-]
-
-def find_logo() -> Path | None:
-    candidates = []
-    if getattr(sys, "_MEIPASS", None):
-        base = Path(sys._MEIPASS)
-        for rel, _sub in LOGO_CANDIDATES:
-            p = base / rel
-            if p.exists():
-                candidates.append(p)
-    for rel, _sub in LOGO_CANDIDATES:
-        p = SCRIPT_DIR / rel
-        if p.exists():
-            candidates.append(p)
-    return candidates[0] if candidates else None
-
-def make_yellow_icon(pm: QPixmap) -> QIcon:
-    """
-    Compose a square yellow icon (for taskbar/Alt-Tab) with the logo centered.
-    Creates multiple sizes for crisp rendering.
-    """
-    def compose(size: int) -> QPixmap:
-        canvas = QPixmap(size, size)
-        canvas.fill(QColor("#FFC400"))
-        painter = QPainter(canvas)
-        # max logo area with margins
-        margin = int(size * 0.12)
-        target_w = size - 2*margin
-        target_h = size - 2*margin
-        scaled = pm.scaled(target_w, target_h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        x = (size - scaled.width()) // 2
-        y = (size - scaled.height()) // 2
-        painter.drawPixmap(x, y, scaled)
-        painter.end()
-        return canvas
-
-    icon = QIcon()
-    for s in (16, 24, 32, 48, 64, 128, 256):
-        icon.addPixmap(componse := compose(s))
-    return icon
-
-# ========= LOGGING =========
-def setup_logging():
-    try:
-        LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    except Exception:
-        pass
-    handlers = []
-    try:
-        handlers.append(logging.FileHandler(LOG_FILE, encoding='utf-8'))
-    except Exception:
-        pass
-    handlers.append(logging.StreamHandler(sys.stdout))
-    logging.basicConfig(level=logging.INFO,
-                        format='%(asctime)s [%(levelname)s] %(message)s',
-                        handlers=handlers)
-
-# ========= UTILS =========
-def ensure_dir(p: Path):
-    p.mkdir(parents=True, exist_ok=True)
-
-def humanize_bytes(n: int) -> str:
-    for unit in ['B','KB','MB','GB','TB']:
-        if n < 1024.0:
-            return f"{n:3.1f} {unit}" if unit != 'B' else f"{n} {unit}"
-        n /= 1024.0
-    return f"{n:.1f} PB"
-
-def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with open(path, 'rb') as f:
-        for chunk in iter(lambda: f.read(8192), b''):
-            h.update(chunk)
-    return h.hexdigest()
-
-# ========= DOWNLOAD THREAD =========
-class ZipDownloader(QThread):
-    progress    = Signal(int, int)
-    finished_ok = Signal(Path, str)  # zip_path, sha256
-    failed      = Signal(str)
-    ssl_error   = Signal(str)  # Special signal for SSL errors
-    def __init__(self, url: str, dest_zip: Path, verify_ssl: bool = True):
-        super().__init__()
-        self.url = url
-        self.dest_zip = dest_zip
-        self.verify_ssl = verify_ssl
-    def run(self):
-        try:
-            ensure_dir(self.dest_zip.parent)
-            req = Request(self.url, headers={"User-Agent":"colorFabb-Installer"})
-            
-            # Create SSL context
-            ssl_context = None
-            if self.verify_ssl:
-                if CERTIFI_AVAILABLE:
-                    # Use certifi's CA bundle if available
-                    ssl_context = ssl.create_default_context(cafile=certifi.where())
-                else:
-                    # Use default context
-                    ssl_context = ssl.create_default_context()
-            else:
-                # Disable SSL verification (only when explicitly requested by user)
-                ssl_context = ssl._create_unverified_context()
-            
-            with urlopen(req, context=ssl_context) as r:
-                total = int(r.headers.get("Content-Length", "0")) if r.headers.get("Content-Length") else 0
-                downloaded = 0
-                chunk = 8192
-                with open(self.dest_zip, "wb") as f:
-                    while True:
-                        buf = r.read(chunk)
-                        if not buf: break
-                        f.write(buf)
-                        downloaded += len(buf)
-                        self.progress.emit(downloaded, total)
-            with zipfile.ZipFile(self.dest_zip, 'r') as z:
-                z.testzip()
-            self.finished_ok.emit(self.dest_zip, sha256_file(self.dest_zip))
-        except Exception as e:
-            error_str = str(e)
-            # Check if it's an SSL certificate error
-            if "CERTIFICATE_VERIFY_FAILED" in error_str or "certificate verify failed" in error_str.lower():
-                self.ssl_error.emit(error_str)
-            else:
-                self.failed.emit(error_str)
-
-# ========= EXTRACT & PARSE REPO =========
-def extract_zip(zip_path: Path, dest_dir: Path):
-    if dest_dir.exists():
-        shutil.rmtree(dest_dir)
-    ensure_dir(dest_dir)
-    with zipfile.ZipFile(zip_path, "r") as z:
-        z.extractall(dest_dir)
-
-def _casefold(s: str) -> str:
-    return s.replace("\\", "/").lower()
-
-def collect_repo_profiles_robust(extracted_root: Path):
-    filament_items = []
-    process_items  = []
-    for p in extracted_root.rglob("*"):
-        if not p.is_file(): continue
-        ext  = p.suffix.lower()
-        path = _casefold(str(p))
-        if "/prusaslicer/" in path and ext in PRUSA_EXTS:
-            if "/filament/" in path:
-                filament_items.append({"slicer":"PrusaSlicer","src":p})
-            elif "/print/" in path:
-                process_items.append({"slicer":"PrusaSlicer","src":p,"category":"print"})
-            continue
-        if "/orcaslicer/" in path and ext in JSON_EXTS:
-            if "/filament/" in path:
-                filament_items.append({"slicer":"OrcaSlicer","src":p})
-            elif "/process/" in path:
-                process_items.append({"slicer":"OrcaSlicer","src":p,"category":"process"})
-            continue
-        if ("/anycubicslicer/" in path or "/anycubicslicernext/" in path) and ext in JSON_EXTS:
-            if "/filament/" in path:
-                filament_items.append({"slicer":"AnyCubicSlicer","src":p})
-            elif "/process/" in path:
-                process_items.append({"slicer":"AnyCubicSlicer","src":p,"category":"process"})
-            continue
-        if ("/bambustudio/" in path or "/bambu studio/" in path) and ext in JSON_EXTS:
-            if "/filament/" in path:
-                filament_items.append({"slicer":"BambuStudio","src":p})
-            elif "/process/" in path:
-                process_items.append({"slicer":"BambuStudio","src":p,"category":"process"})
-            continue
-        if ("/snapmakerorca/" in path or "/snapmaker_orca/" in path or "/snapmaker orca/" in path) and ext in JSON_EXTS:
-            if "/filament/" in path:
-                filament_items.append({"slicer":"SnapmakerOrca","src":p})
-            elif "/process/" in path:
-                process_items.append({"slicer":"SnapmakerOrca","src":p,"category":"process"})
-            continue
-        if ("/qidistudio/" in path or "/qidi studio/" in path) and ext in JSON_EXTS:
-            if "/filament/" in path:
-                filament_items.append({"slicer":"QIDIStudio","src":p})
-            elif "/process/" in path:
-                process_items.append({"slicer":"QIDIStudio","src":p,"category":"process"})
-            continue
-    return filament_items, process_items
-
-# ========= STATE =========
-def read_installed_set() -> set[Path]:
-    s = set()
-    if INSTALLED_LIST.exists():
-        with open(INSTALLED_LIST, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line: s.add(Path(line))
-    return s
-
-def rewrite_installed_list(remove_paths: list[Path], add_paths: list[Path]):
-    current = read_installed_set()
-    for p in remove_paths: current.discard(Path(p))
-    for p in add_paths:    current.add(Path(p))
-    try:
-        INSTALLED_LIST.parent.mkdir(parents=True, exist_ok=True)
-        with open(INSTALLED_LIST, 'w', encoding='utf-8') as f:
-            for p in sorted(current):
-                f.write(str(p) + "\n")
-    except Exception:
-        pass
-
-def uninstall_installed_files(dry_run: bool = False) -> tuple[int, int]:
-    current = read_installed_set()
-    total = len(current); deleted = 0
-    for p in list(current):
-        if p.exists() and p.is_file():
-            logging.info(f"Uninstall: removing {p}")
-            if not dry_run:
-                try:
-                    p.unlink(); deleted += 1
-                except Exception as e:
-                    logging.error(f"Failed to remove {p}: {e}")
-        else:
-            logging.info(f"Uninstall: not found {p}")
-    if not dry_run:
-        rewrite_installed_list(remove_paths=list(current), add_paths=[])
-    return (deleted, total)
-
-# ========= THEMES =========
-APP_QSS = """
-* { font-family: 'Segoe UI', 'Inter', 'Calibri', 'Arial'; font-size: 12.5pt; }
-QWidget { background: #FAFBFE; color: #121212; }
-QPushButton { background: #111; color: #fff; border: 0; padding: 10px 18px; border-radius: 10px; font-weight: 500; }
-QPushButton:hover { background: #222; color: #fff; }
-QPushButton:disabled { background: #D0D3D9; color: #888; }
-QLineEdit { background: #fff; border: 1px solid #E3E5EA; border-radius: 8px; padding: 8px 10px; }
-QListWidget { background: #fff; border: 1px solid #E3E5EA; border-radius: 10px; }
-QListWidget::item { padding: 8px; }
-QListWidget::item:hover { background: #FFF6CC; }
-QListWidget::item:selected { background: #FFE27A; color: #111; }
-QListWidget::indicator { width: 24px; height: 24px; border: 2px solid #333; border-radius: 3px; background: #fff; margin-right: 6px; }
-QListWidget::indicator:hover { border-color: #FFC400; background: #FFF9E6; }
-QListWidget::indicator:checked { background: #FFC400; border: 2px solid #333; }
-QProgressBar { border: 1px solid #E3E5EA; border-radius: 10px; background: #fff; text-align: center; height: 16px; }
-QProgressBar::chunk { background: #FFC400; border-radius: 10px; }
-QCheckBox { spacing: 12px; font-size: 13pt; color: #111; }
-QCheckBox::indicator { width: 26px; height: 26px; border: 3px solid #111; border-radius: 4px; background: #fff; }
-QCheckBox::indicator:hover { border-color: #FFC400; background: #FFF9E6; }
-QCheckBox::indicator:checked { background: #FFC400; border: 3px solid #111; }
-"""
-WELCOME_QSS = """
-* { font-family: 'Segoe UI', 'Inter', 'Calibri', 'Arial'; font-size: 12.5pt; }
-QWidget { background: #FFC400; color: #111; }
-QPushButton { background: #111; color: #fff; border: 0; padding: 10px 18px; border-radius: 10px; font-weight: 500; }
-QPushButton:hover { background: #222; color: #fff; }
-QPushButton:disabled { background: #AAB0B7; color: #fff; }
-QLineEdit { background: #fff; border: 1px solid #E3E5EA; border-radius: 8px; padding: 8px 10px; }
-QListWidget { background: #fff; border: 1px solid #E3E5EA; border-radius: 10px; }
-QListWidget::item { padding: 6px; }
-QListWidget::item:selected { background: #FFE27A; color: #111; }
-QProgressBar { border: 1px solid #E3E5EA; border-radius: 10px; background: #fff; text-align: center; height: 16px; }
-QProgressBar::chunk { background: #111; border-radius: 10px; }
-QCheckBox { spacing: 12px; font-size: 14pt; font-weight: 700; color: #111; }
-QCheckBox::indicator { width: 28px; height: 28px; border: 3px solid #111; border-radius: 4px; background: #fff; }
-QCheckBox::indicator:hover { border-color: #000; background: #FFF6CC; }
-QCheckBox::indicator:checked { background: #111; border: 3px solid #111; }
-"""
-HEADER_QSS = "background:#FFC400; padding:14px; border:0; border-bottom:1px solid #e6e6e6;"
-
-# Create checkmark icon for checked state
-def create_checkmark_icon(size: int = 24, color: str = "#fff") -> QIcon:
-    """Create a checkmark icon for checkbox checked state."""
-    pixmap = QPixmap(size, size)
-    pixmap.fill(Qt.transparent)
-    painter = QPainter(pixmap)
-    painter.setRenderHint(QPainter.Antialiasing)
-    
-    # Draw checkmark
-    pen = painter.pen()
-    pen.setColor(QColor(color))
-    pen.setWidth(max(2, size // 12))
-    pen.setCapStyle(Qt.RoundCap)
-    pen.setJoinStyle(Qt.RoundJoin)
-    painter.setPen(pen)
-    
-    # Checkmark path (scaled to icon size)
-    scale = size / 24.0
-    x1, y1 = int(6 * scale), int(12 * scale)
-    x2, y2 = int(10 * scale), int(16 * scale)
-    x3, y3 = int(18 * scale), int(8 * scale)
-    
-    painter.drawLine(x1, y1, x2, y2)
-    painter.drawLine(x2, y2, x3, y3)
-    painter.end()
-    
-    return QIcon(pixmap)
-
-# ========= GUI =========
-if GUI_ENABLED:
-
-    class DisclaimerDialog(QDialog):
-        def __init__(self, parent=None):
-            super().__init__(parent)
-            self.setWindowTitle("Disclaimer / Important Information")
-            self.setMinimumSize(QSize(780, 520))
-
-            root = QVBoxLayout(self)
-            text = QTextEdit()
-            text.setReadOnly(True)
-            text.setPlainText(DISCLAIMER_TEXT)
-            root.addWidget(text, 1)
-
-            buttons = QDialogButtonBox(QDialogButtonBox.Ok)
-            buttons.accepted.connect(self.accept)
-            root.addWidget(buttons, 0)
-
-    class PageWelcome(QWidget):
-        next_requested = Signal()
-        acceptance_changed = Signal()
-        def __init__(self):
-            super().__init__()
-            self.logo_path = find_logo()
-            root = QVBoxLayout(self)
-            root.setContentsMargins(36, 36, 36, 36)
-
-            self.logo_label = QLabel()
-            self.logo_label.setAlignment(Qt.AlignCenter)
-
-            title = QLabel("colorFabb Filament Installer")
-            title.setStyleSheet("font-size:32pt; font-weight:800; color:#111;")
-            title.setAlignment(Qt.AlignLeft)
-
-            subtitle = QLabel("Install or update filament & print/process profiles for your slicers.\nFast, clean, and always up-to-date.")
-            subtitle.setStyleSheet("font-size:13.5pt; color:#111;")
-            subtitle.setAlignment(Qt.AlignLeft)
-
-            root.addWidget(self.logo_label, 4)
-            root.addSpacing(8)
-            root.addWidget(title, 0, Qt.AlignLeft)
-            root.addWidget(subtitle, 0, Qt.AlignLeft)
-            root.addStretch(2)
-
-            actions = QHBoxLayout()
-            self.btn_disclaimer = QPushButton("Disclaimer")
-            self.btn_disclaimer.clicked.connect(self.show_disclaimer)
-
-            actions.addWidget(self.btn_disclaimer)
-            actions.addStretch(1)
-            root.addLayout(actions)
-
-            self.accept_checkbox = QCheckBox("I have read and understand the above, including the overwrite warning, and I want to continue")
-            self.accept_checkbox.setStyleSheet("QCheckBox { font-size: 14pt; font-weight: 700; color: #111; spacing: 14px; } QCheckBox::indicator { width: 28px; height: 28px; border: 3px solid #111; border-radius: 5px; background: #fff; } QCheckBox::indicator:hover { border-color: #000; background: #FFF6CC; box-shadow: 0 0 8px rgba(0,0,0,0.2); } QCheckBox::indicator:checked { background: #111; border-color: #111; }")
-            self.accept_checkbox.stateChanged.connect(lambda *_: self.acceptance_changed.emit())
-            root.addWidget(self.accept_checkbox)
-
-            overwrite = QLabel("Warning: This installer may overwrite existing profile files. Back up your slicer profiles/settings before proceeding.")
-            overwrite.setStyleSheet("color:#111; font-size:11.5pt;")
-            overwrite.setWordWrap(True)
-            root.addWidget(overwrite)
-
-        def accepted(self) -> bool:
-            try:
-                return self.accept_checkbox.checkState() == Qt.Checked
-            except Exception:
-                return False
-
-        def show_disclaimer(self):
-            dlg = DisclaimerDialog(self)
-            dlg.exec()
-
-        def resizeEvent(self, e):
-            if self.logo_path:
-                pm = QPixmap(str(self.logo_path))
-                if not pm.isNull():
-                    target_w = int(self.width() * 0.60)
-                    target_h = int(self.height() * 0.40)
-                    scaled = pm.scaled(target_w, target_h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    self.logo_label.setPixmap(scaled)
-            else:
-                self.logo_label.clear()
-            super().resizeEvent(e)
-
-    class Header(QWidget):
-        def __init__(self, text: str):
-            super().__init__()
-            lay = QHBoxLayout(self); lay.setContentsMargins(14,10,14,10)
-            lp = find_logo()
-            if lp:
-                pm = QPixmap(str(lp))
-                if not pm.isNull():
-                    logo = QLabel()
-                    logo.setPixmap(pm.scaledToHeight(28, Qt.SmoothTransformation))
-                    lay.addWidget(logo)
-            title = QLabel(text)
-            title.setStyleSheet("font-size:18pt; font-weight:800; margin-left:12px; color:#111;")
-            lay.addWidget(title); lay.addStretch(1)
-            self.setStyleSheet(HEADER_QSS)
-
-    class PageSlicers(QWidget):
-        selection_changed = Signal()
-        base_changed = Signal()
-        def __init__(self):
-            super().__init__()
-            self.base = appdata_base()
-            self.targets = slicer_targets_from_base(self.base)
-            outer = QVBoxLayout(self)
-            outer.addWidget(Header("Step 1 of 4: Select Slicer Software"))
-
-            self.checks = {}
-            self.path_edits = {}
-            label_map = {
-                "QIDIStudio": "QIDI Studio",
-                "SnapmakerOrca": "Snapmaker Orca",
-            }
-            def mk_status_text(cats: dict[str, Path | list[Path]]) -> tuple[str, str]:
-                files_found = _count_target_files(cats)
-                if files_found > 0:
-                    return (f"✔ {files_found} profiles detected", "#0a8f08")
-                if _target_paths_exist(cats):
-                    return ("✔ Slicer detected", "#0a8f08")
-                return ("✘ Not detected", "#c60000")
-
-            for name in ["PrusaSlicer","OrcaSlicer","BambuStudio","SnapmakerOrca","AnyCubicSlicer","QIDIStudio"]:
-                row = QHBoxLayout()
-                label = label_map.get(name, name)
-                box = QCheckBox(label)
-                box.stateChanged.connect(lambda *_: self.selection_changed.emit())
-                box.toggled.connect(lambda *_: self.selection_changed.emit())
-                self.checks[name] = box
-
-                cats = self.targets[name]
-                status_text, status_color = mk_status_text(cats)
-                status = QLabel(status_text)
-                status.setStyleSheet(f"color:{status_color};")
-
-                edit = QLineEdit(str(_display_base_for_slicer(name, cats))); edit.setFixedWidth(360)
-                self.path_edits[name] = edit
-
-                btn = QPushButton("Browse…"); btn.setStyleSheet("QPushButton{background:#FFC400;color:#111;border-radius:8px;}")
-                def pick(s=name):
-                    dlg = QFileDialog(self); dlg.setFileMode(QFileDialog.Directory); dlg.setOption(QFileDialog.ShowDirsOnly, True)
-                    if dlg.exec():
-                        sel = dlg.selectedFiles()
-                        if sel:
-                            self.path_edits[s].setText(sel[0])
-                            self.update_targets()
-                            cats2 = self.targets[s]
-                            status_text, status_color = mk_status_text(cats2)
-                            status.setText(status_text)
-                            status.setStyleSheet(f"color:{status_color};")
-                            self.base_changed.emit()
-                btn.clicked.connect(pick)
-
-                row.addWidget(box); row.addWidget(status)
-                row.addWidget(edit); row.addWidget(btn)
-                outer.addLayout(row)
-
-            outer.addStretch(1)
-            self.selection_changed.emit()
-
-        def update_targets(self):
-            for name in ["PrusaSlicer","OrcaSlicer","BambuStudio","SnapmakerOrca","AnyCubicSlicer","QIDIStudio"]:
-                base = Path(self.path_edits[name].text())
-                self.targets[name] = slicer_targets_from_base(base)[name]
-
-        def selected_slicers(self):
-            return [n for n,b in self.checks.items() if b.checkState() == Qt.Checked]
-
-        def targets_for_selected(self):
-            self.update_targets()
-            return {n:self.targets[n] for n in self.selected_slicers()}
-
-    # ------- Select/Deselect All helper mixin -------
-    class SelectListMixin:
-        def are_all_selected(self, list_widget: QListWidget) -> bool:
-            return all(list_widget.item(i).checkState() == Qt.Checked for i in range(list_widget.count())) if list_widget.count() else False
-        def are_none_selected(self, list_widget: QListWidget) -> bool:
-            return all(list_widget.item(i).checkState() == Qt.Unchecked for i in range(list_widget.count())) if list_widget.count() else True
-        def set_all(self, list_widget: QListWidget, checked: bool):
-            for i in range(list_widget.count()):
-                it = list_widget.item(i)
-                it.setCheckState(Qt.Checked if checked else Qt.Unchecked)
-
-    class PageFilament(QWidget, SelectListMixin):
-        selection_changed = Signal()
-        request_download = Signal()
-        def __init__(self):
-            super().__init__()
-            self.items = []
-            outer = QVBoxLayout(self)
-            outer.addWidget(Header("Step 2 of 4: Select Filament Profiles"))
-
-            self.select_all = QCheckBox("Select All")
-            self.select_all.clicked.connect(self.on_select_all_clicked)  # slimme toggle
-            outer.addWidget(self.select_all)
-
-            self.list = QListWidget()
-            self.list.setAlternatingRowColors(True)
-            self.list.itemChanged.connect(self.on_item_changed)  # label/updating
-            outer.addWidget(self.list, 1)
-
-            self.info = QLabel("Loading profiles...")
-            self.info.setStyleSheet("color:#5f6368;"); outer.addWidget(self.info)
-
-            row = QHBoxLayout()
-            self.btn_load = QPushButton("Load Profiles")
-            self.btn_load.setStyleSheet("QPushButton{background:#FFC400;color:#111;border-radius:8px;}")
-            self.btn_load.clicked.connect(self.request_download.emit)
-            row.addWidget(self.btn_load); row.addStretch(1)
-            outer.addLayout(row)
-            self.loaded = False
-
-        def on_item_changed(self, _item):
-            # update label van Select All
-            self.refresh_select_all_label()
-            self.selection_changed.emit()
-
-        def refresh_select_all_label(self):
-            if self.list.count() == 0:
-                self.select_all.setText("Select All")
-                self.select_all.setChecked(False)
-                return
-            if self.are_all_selected(self.list):
-                self.select_all.setText("Deselect All")
-                self.select_all.setChecked(True)
-            else:
-                self.select_all.setText("Select All")
-                # Houd checkbox-state sync met "niet alles geselecteerd"
-                self.select_all.setChecked(False)
-
-        def on_select_all_clicked(self, _checked: bool):
-            # Toggle op basis van huidige staat van de lijst
-            if self.are_all_selected(self.list):
-                self.set_all(self.list, False)
-            else:
-                self.set_all(self.list, True)
-            self.refresh_select_all_label()
-            self.selection_changed.emit()
-
-        def set_items(self, items, selected_slicers):
-            self.items = [it for it in items if it["slicer"] in selected_slicers]
-            self.list.blockSignals(True)
-            self.list.clear()
-            for it in self.items:
-                label = f"[{it['slicer']} | filament] {it['src'].name}"
-                li = QListWidgetItem(label)
-                li.setFlags(li.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                li.setCheckState(Qt.Checked)
-                li.setToolTip(str(it['src']))
-                self.list.addItem(li)
-            self.list.blockSignals(False)
-            self.loaded = True
-            # Update select all status after loading
-            QTimer.singleShot(0, self.refresh_select_all_label)
-            self.info.setText(f"Loaded {self.list.count()} filament profiles.")
-            self.selection_changed.emit()
-
-        def selected_indices(self):
-            return [i for i in range(self.list.count()) if self.list.item(i).checkState()==Qt.Checked]
-
-    class PageProcess(QWidget, SelectListMixin):
-        selection_changed = Signal()
-        def __init__(self):
-            super().__init__()
-            self.items = []
-            outer = QVBoxLayout(self)
-            outer.addWidget(Header("Step 3 of 4: Select Print / Process Profiles"))
-
-            self.select_all = QCheckBox("Select All")
-            self.select_all.clicked.connect(self.on_select_all_clicked)
-            outer.addWidget(self.select_all)
-
-            self.list = QListWidget()
-            self.list.setAlternatingRowColors(True)
-            self.list.itemChanged.connect(self.on_item_changed)
-            outer.addWidget(self.list, 1)
-
-            self.info = QLabel("Loading profiles...")
-            self.info.setStyleSheet("color:#5f6368;"); outer.addWidget(self.info)
-            self.loaded = False
-
-        def on_item_changed(self, _item):
-            self.refresh_select_all_label()
-            self.selection_changed.emit()
-
-        def refresh_select_all_label(self):
-            if self.list.count() == 0:
-                self.select_all.setText("Select All")
-                self.select_all.setChecked(False)
-                return
-            if self.are_all_selected(self.list):
-                self.select_all.setText("Deselect All")
-                self.select_all.setChecked(True)
-            else:
-                self.select_all.setText("Select All")
-                self.select_all.setChecked(False)
-
-        def on_select_all_clicked(self, _checked: bool):
-            if self.are_all_selected(self.list):
-                self.set_all(self.list, False)
-            else:
-                self.set_all(self.list, True)
-            self.refresh_select_all_label()
-            self.selection_changed.emit()
-
-        def set_items(self, items, selected_slicers):
-            self.items = [it for it in items if it["slicer"] in selected_slicers]
-            self.list.blockSignals(True)
-            self.list.clear()
-            for it in self.items:
-                cat = it.get("category","process")
-                label = f"[{it['slicer']} | {cat}] {it['src'].name}"
-                li = QListWidgetItem(label)
-                li.setFlags(li.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                li.setCheckState(Qt.Checked)
-                li.setToolTip(str(it['src']))
-                self.list.addItem(li)
-            self.list.blockSignals(False)
-            self.loaded = True
-            # Update select all status after loading
-            QTimer.singleShot(0, self.refresh_select_all_label)
-            self.info.setText(f"Loaded {self.list.count()} print/process profiles.")
-            self.selection_changed.emit()
-
-        def selected_indices(self):
-            return [i for i in range(self.list.count()) if self.list.item(i).checkState()==Qt.Checked]
-
-    class PageInstall(QWidget):
-        start_install = Signal()
-        def __init__(self):
-            super().__init__()
-            outer = QVBoxLayout(self)
-            outer.addWidget(Header("Step 4 of 4: Install"))
-            self.label = QLabel("Installing files...")
-            outer.addWidget(self.label)
-            self.progress = QProgressBar(); self.progress.setMinimum(0); self.progress.setValue(0)
-            outer.addWidget(self.progress)
-            self.detail = QLabel(""); self.detail.setStyleSheet("color:#5f6368;")
-            outer.addWidget(self.detail)
-            outer.addStretch(1)
-
-    class PageDone(QWidget):
-        def __init__(self):
-            super().__init__()
-            outer = QVBoxLayout(self)
-            outer.addWidget(Header("Done"))
-            self.summary = QLabel("")
-            outer.addWidget(self.summary)
-            outer.addStretch(1)
-
-    class InstallerWindow(QWidget):
-        def __init__(self):
-            super().__init__()
-            self.setWindowTitle(APP_DISPLAY_NAME)
-            self.setMinimumSize(QSize(1024, 680))
-
-            # Heldere (gele) taskbar icon
-            lp = find_logo()
-            if lp:
-                try:
-                    pm = QPixmap(str(lp))
-                    if not pm.isNull():
-                        icon = make_yellow_icon(pm)
-                        self.setWindowIcon(icon)
-                        QApplication.instance().setWindowIcon(icon)
-                except Exception:
-                    pass
-
-            self.zip_path    = CACHE_DIR / "profiles.zip"
-            self.extract_dir = CACHE_DIR / "profiles_extracted"
-
-            layout = QVBoxLayout(self); layout.setContentsMargins(0,0,0,0)
-            self.stack = QStackedWidget(); self.stack.setContentsMargins(0,0,0,0)
-            layout.addWidget(self.stack, 1)
-
-            self.pg_welcome  = PageWelcome()      # Step 0
-            self.pg_slicers  = PageSlicers()      # Step 1
-            self.pg_filament = PageFilament()     # Step 2
-            self.pg_process  = PageProcess()      # Step 3
-            self.pg_install  = PageInstall()      # Step 4
-            self.pg_done     = PageDone()
-            for pg in [self.pg_welcome, self.pg_slicers, self.pg_filament, self.pg_process, self.pg_install, self.pg_done]:
-                self.stack.addWidget(pg)
-
-            nav = QHBoxLayout()
-            nav.setContentsMargins(24, 12, 24, 24)
-            nav.setSpacing(16)
-            self.btn_back = QPushButton("← Back"); self.btn_back.setStyleSheet("QPushButton{background:#eaecef;color:#111;border-radius:8px;}")
-            self.btn_next = QPushButton("Get started")
-            nav.addWidget(self.btn_back); nav.addStretch(1); nav.addWidget(self.btn_next)
-            layout.addLayout(nav)
-
-            self.btn_back.clicked.connect(self.on_back)
-            self.btn_next.clicked.connect(self.on_next)
-            self.pg_filament.request_download.connect(self.download_profiles)
-            self.pg_slicers.selection_changed.connect(self.update_nav)
-            self.pg_slicers.base_changed.connect(self.update_nav)
-            self.pg_filament.selection_changed.connect(self.update_nav)
-            self.pg_process.selection_changed.connect(self.update_nav)
-            self.pg_welcome.acceptance_changed.connect(self.update_nav)
-            # Install is triggered via the shared bottom-right navigation button.
-
-            self.repo_filament_all = []
-            self.repo_process_all  = []
-            self.copy_plan   = []
-            self.delete_plan = []
-            self.total_ops   = 0
-
-            self.apply_theme()
-            self.update_nav()
-
-        # Theming per stap
-        def apply_theme(self):
-            app = QApplication.instance()
-            idx = self.stack.currentIndex()
-            if idx == 0:
-                app.setStyleSheet(WELCOME_QSS)   # alles geel
-            else:
-                app.setStyleSheet(APP_QSS)       # licht thema
-
-        def update_nav(self):
-            self.apply_theme()
-            idx = self.stack.currentIndex()
-            # Back navigation makes sense only within the wizard, not after completion.
-            self.btn_back.setEnabled(0 < idx < 5)
-            if idx == 0:
-                self.btn_next.setText("Get started")
-                self.btn_next.setEnabled(self.pg_welcome.accepted())
-            elif idx == 1:
-                self.btn_next.setText("Next →")
-                self.btn_next.setEnabled(len(self.pg_slicers.selected_slicers()) > 0)
-            elif idx == 2:
-                self.btn_next.setText("Next →")
-                self.btn_next.setEnabled(self.pg_filament.loaded)
-            elif idx == 3:
-                self.btn_next.setText("Install")
-                self.btn_next.setEnabled(self.pg_process.loaded)
-            elif idx == 4:
-                self.btn_next.setText("Install")
-                self.btn_next.setEnabled(True)
-            else:
-                self.btn_next.setText("Close")
-                self.btn_next.setEnabled(True)
-
-        def on_back(self):
-            i = self.stack.currentIndex()
-            if i > 0: self.stack.setCurrentIndex(i - 1)
-            self.update_nav()
-
-        def on_next(self):
-            self.update_nav()
-            i = self.stack.currentIndex()
-            if i == 0:
-                self.stack.setCurrentIndex(1)
-            elif i == 1:
-                self.stack.setCurrentIndex(2)
-                self.download_profiles()  # auto-load
-            elif i == 2:
-                self.stack.setCurrentIndex(3)
-            elif i == 3:
-                self.prepare_copy_and_delete_plans()
-                self.stack.setCurrentIndex(4)
-                self.update_nav()
-                QApplication.processEvents()
-                self.install_selected()
-                return
-            elif i == 4:
-                self.install_selected()
-            else:
-                self.close()
-            self.update_nav()
-
-        # DOWNLOAD
-        def download_profiles(self, verify_ssl: bool = True):
-            try:
-                CACHE_DIR.mkdir(parents=True, exist_ok=True)
-                self.pg_filament.btn_load.setEnabled(False)
-                self.pg_filament.info.setText("Downloading profiles ZIP from GitHub...")
-                self.downloader = ZipDownloader(GITHUB_ZIP_URL, self.zip_path, verify_ssl=verify_ssl)
-                self.downloader.progress.connect(self.on_download_progress)
-                self.downloader.finished_ok.connect(self.on_download_done)
-                self.downloader.failed.connect(self.on_download_failed)
-                self.downloader.ssl_error.connect(self.on_ssl_error)
-                self.downloader.start()
-            except Exception as e:
-                QMessageBox.critical(self, "Download error", str(e))
-                self.pg_filament.btn_load.setEnabled(True)
-
-        def on_download_progress(self, downloaded: int, total: int):
-            if total > 0:
-                self.pg_filament.info.setText(f"Downloading... {humanize_bytes(downloaded)} / {humanize_bytes(total)}")
-            else:
-                self.pg_filament.info.setText(f"Downloading... {humanize_bytes(downloaded)}")
-
-        def on_download_done(self, zip_path: Path, digest: str):
-            try:
-                if EXPECTED_SHA256 and digest.lower() != EXPECTED_SHA256.lower():
-                    raise RuntimeError(f"SHA256 mismatch. Got {digest}, expected {EXPECTED_SHA256}")
-                self.pg_filament.info.setText(f"Extracting ZIP... (sha256: {digest[:12]}…)")
-                extract_zip(zip_path, self.extract_dir)
-                fil, proc = collect_repo_profiles_robust(self.extract_dir)
-                self.repo_filament_all = fil
-                self.repo_process_all  = proc
-                sel = self.pg_slicers.selected_slicers()
-                self.pg_filament.set_items(self.repo_filament_all, sel)
-                self.pg_process.set_items(self.repo_process_all, sel)
-                if not self.repo_filament_all and not self.repo_process_all:
-                    raise RuntimeError("No profiles found in ZIP. Check repo structure and extensions.")
-            except Exception as e:
-                QMessageBox.critical(self, "Extract error", str(e))
-            finally:
-                self.pg_filament.btn_load.setEnabled(True)
-                self.update_nav()
-
-        def on_download_failed(self, msg: str):
-            QMessageBox.critical(self, "Download failed", msg)
-            self.pg_filament.btn_load.setEnabled(True)
-            self.update_nav()
-
-        def on_ssl_error(self, msg: str):
-            """Handle SSL certificate errors with user-friendly retry option."""
-            result = QMessageBox.warning(
-                self,
-                "SSL Certificate Error",
-                f"Unable to verify GitHub's SSL certificate. This can happen on systems with outdated certificate stores.\n\n"
-                f"Error details: {msg}\n\n"
-                f"Would you like to retry without SSL verification?\n\n"
-                f"Note: Disabling SSL verification is less secure but safe for downloading from trusted sources like GitHub.",
-                QMessageBox.Yes | QMessageBox.No,
-                QMessageBox.No
-            )
-            
-            if result == QMessageBox.Yes:
-                # Retry without SSL verification
-                self.download_profiles(verify_ssl=False)
-            else:
-                self.pg_filament.btn_load.setEnabled(True)
-                self.pg_filament.info.setText("Download cancelled. Click 'Load Profiles' to retry.")
-                self.update_nav()
-
-        # PLANS
-        def _dest_for_item(self, it, targets):
-            slicer = it["slicer"]
-            category = it.get("category", "filament")
-            base = targets.get(slicer, {}).get(category)
-            if not base:
-                return None
-            if isinstance(base, list):
-                return [b / it["src"].name for b in base]
-            return base / it["src"].name
-
-        def prepare_copy_and_delete_plans(self):
-            targets = self.pg_slicers.targets_for_selected()
-            for slicer, cats in targets.items():
-                for d in cats.values():
-                    if isinstance(d, list):
-                        for dd in d:
-                            ensure_dir(dd)
-                    else:
-                        ensure_dir(d)
-
-            all_dests = set()
-            for it in self.pg_filament.items:
-                dst = self._dest_for_item(it, targets)
-                if isinstance(dst, list):
-                    for d in dst:
-                        all_dests.add(d)
-                elif dst:
-                    all_dests.add(dst)
-            for it in self.pg_process.items:
-                dst = self._dest_for_item(it, targets)
-                if isinstance(dst, list):
-                    for d in dst:
-                        all_dests.add(d)
-                elif dst:
-                    all_dests.add(dst)
-
-            sel_dests = set()
-            for idx in self.pg_filament.selected_indices():
-                it = self.pg_filament.items[idx]; dst = self._dest_for_item(it, targets)
-                if isinstance(dst, list):
-                    for d in dst:
-                        sel_dests.add(d)
-                elif dst:
-                    sel_dests.add(dst)
-            for idx in self.pg_process.selected_indices():
-                it = self.pg_process.items[idx];  dst = self._dest_for_item(it, targets)
-                if isinstance(dst, list):
-                    for d in dst:
-                        sel_dests.add(d)
-                elif dst:
-                    sel_dests.add(dst)
-
-            self.delete_plan = [p for p in all_dests - sel_dests if p.exists() and p.is_file()]
-            self.copy_plan   = []
-            for idx in self.pg_filament.selected_indices():
-                it = self.pg_filament.items[idx]; dst = self._dest_for_item(it, targets)
-                if isinstance(dst, list):
-                    for d in dst:
-                        self.copy_plan.append((it["src"], d))
-                elif dst:
-                    self.copy_plan.append((it["src"], dst))
-            for idx in self.pg_process.selected_indices():
-                it = self.pg_process.items[idx];  dst = self._dest_for_item(it, targets)
-                if isinstance(dst, list):
-                    for d in dst:
-                        self.copy_plan.append((it["src"], d))
-                elif dst:
-                    self.copy_plan.append((it["src"], dst))
-
-            self.total_ops = len(self.copy_plan)
-            self.pg_install.progress.setMaximum(max(1, self.total_ops))
-            self.pg_install.label.setText(f"Installing {self.total_ops} files (removing {len(self.delete_plan)} deselected)...")
-            self.pg_install.detail.setText("Ready.")
-
-        # INSTALL
-        def install_selected(self):
-            try:
-                # Disable navigation during install to prevent double-clicks.
-                self.btn_back.setEnabled(False)
-                self.btn_next.setEnabled(False)
-                removed = []
-                for dst in self.delete_plan:
-                    try:
-                        dst.unlink()
-                        removed.append(dst)
-                        self.pg_install.detail.setText(f"Removed {dst.name} from {dst.parent}")
-                        QApplication.processEvents()
-                    except Exception as e:
-                        logging.error(f"Failed to remove {dst}: {e}")
-                rewrite_installed_list(remove_paths=removed, add_paths=[])
-                done = 0; added = []
-                for src, dst in self.copy_plan:
-                    ensure_dir(dst.parent)
-                    shutil.copy2(src, dst)
-                    added.append(dst)
-                    done += 1
-                    self.pg_install.progress.setValue(done)
-                    self.pg_install.detail.setText(f"Copying {src.name} → {dst}")
-                    QApplication.processEvents()
-                rewrite_installed_list(remove_paths=[], add_paths=added)
-                self.pg_install.detail.setText("Done.")
-                self.pg_done.summary.setText(
-                    f"Installed {self.total_ops} files.\nRemoved {len(removed)} deselected files.\nYou can close the installer."
-                )
-                self.stack.setCurrentIndex(5)
-                self.update_nav()
-            except Exception as e:
-                QMessageBox.critical(self, "Install error", str(e))
-            finally:
-                # Restore navigation state based on the active page.
-                self.update_nav()
+        import installer_gui
+    except ImportError:
+        return None
+    return installer_gui
 
 # ========= CLI =========
 def parse_args():
@@ -1461,158 +40,42 @@ def parse_args():
     ap.add_argument('--all', action='store_true', help='With --silent, install for all detected slicers')
     ap.add_argument('--slicers', nargs='*', default=None, help='Limit to specific slicers')
     ap.add_argument('--uninstall', action='store_true', help='Remove files installed by this installer')
-    ap.add_argument('--dry-run', action='store_true', help='Only report what would be removed (with --uninstall)')
+    ap.add_argument('--dry-run', action='store_true', help='Only report what would be removed or restored (with --uninstall/--restore)')
+    ap.add_argument('--restore', default=None, metavar='RUN_ID',
+                    help="Undo an install run: put back the files it overwrote or deleted and remove those it created ('latest' for the last run)")
+    ap.add_argument('--list-backups', action='store_true', help='List install runs that --restore can undo')
     ap.add_argument('--check-download', action='store_true', help='Download + validate the profiles ZIP (no install)')
-    ap.add_argument('--base', default=None, help='Override the slicer app-data base folder (defaults to the platform standard location)')
+    ap.add_argument('--base', nargs='+', action='extend', default=None, metavar='DIR',
+                    help='Slicer app-data base folder(s) to install into; repeatable, e.g. %%APPDATA%% plus a portable config on a USB drive (defaults to the platform standard location)')
+    ap.add_argument('--all-users', action='store_true', help='Headless install for every local user home (/home/*, /Users/* or C:\\Users\\*)')
+    ap.add_argument('--users-file', default=None, help='Headless install for the home folders listed in this file (one per line)')
+    ap.add_argument('--workers', type=int, default=4, help='Parallel installs with --all-users/--users-file')
+    ap.add_argument('--profile-timings', nargs='?', const='json', choices=['json', 'chrome'], default=None,
+                    help='Record per-phase timings; write timings.json (or timings.trace.json for chrome://tracing) next to installer.log')
+    ap.add_argument('--watch', action='store_true', help='Keep running headless: poll for profile updates and install only what changed')
+    ap.add_argument('--watch-interval', type=float, default=WATCH_INTERVAL, help='Seconds between polls with --watch')
+    ap.add_argument('--watch-jitter', type=float, default=WATCH_JITTER, help='Random spread of the poll interval (fraction, e.g. 0.1 = +-10%%)')
+    ap.add_argument('--source', default=os.environ.get('COLORFABB_PROFILES_URL'),
+                    help='Profiles ZIP URL to install from, e.g. a LAN cache (http://host:8765/profiles.zip); env COLORFABB_PROFILES_URL')
+    ap.add_argument('--serve-cache', nargs='?', const=str(SERVE_PORT), default=None, metavar='[HOST:]PORT',
+                    help=f'Serve the verified profiles ZIP to other installers on the LAN (default port {SERVE_PORT})')
+    ap.add_argument('--serve-refresh', type=float, default=SERVE_REFRESH_INTERVAL, help='Seconds between upstream checks with --serve-cache')
+    ap.add_argument('--archive-memory-mb', type=float, default=installer_core.ARCHIVE_MEMORY_LIMIT / 2**20,
+                    help='Keep profile archives up to this size in memory while installing; larger ones are memory-mapped (0 = always map)')
+    ap.add_argument('--log-verbosity', choices=list(LOG_VERBOSITIES), default='files',
+                    help="'files' logs every copied/removed file; 'summary' logs periodic counts instead")
+    ap.add_argument('--metrics', nargs='?', const='', default=None, metavar='DIR',
+                    help='Headless modes: write colorfabb_installer.prom (Prometheus textfile) and metrics.json to DIR (default: next to installer.log)')
     return ap.parse_args()
 
-def check_download_only() -> None:
-    """Download and validate the profiles ZIP without installing anything."""
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    zip_path = CACHE_DIR / "profiles.zip"
-    extract_dir = CACHE_DIR / "profiles_extracted"
-
-    logging.info(f"Download check: {GITHUB_ZIP_URL}")
-    req = Request(GITHUB_ZIP_URL, headers={"User-Agent": "colorFabb-Installer"})
-    with urlopen(req) as r, open(zip_path, 'wb') as f:
-        shutil.copyfileobj(r, f)
-
-    with zipfile.ZipFile(zip_path, 'r') as z:
-        z.testzip()
-
-    digest = sha256_file(zip_path)
-    logging.info(f"ZIP sha256 = {digest}")
-    if EXPECTED_SHA256 and digest.lower() != EXPECTED_SHA256.lower():
-        raise RuntimeError(f"SHA256 mismatch: got {digest}, expected {EXPECTED_SHA256}")
-
-    extract_zip(zip_path, extract_dir)
-    fil, proc = collect_repo_profiles_robust(extract_dir)
-    logging.info(f"Extract OK. Found {len(fil)} filament + {len(proc)} process profiles.")
-
-    # Write a small marker file for quick verification (useful for windowed EXE).
-    try:
-        TEMP_ROOT.mkdir(parents=True, exist_ok=True)
-        marker = TEMP_ROOT / "download_check_ok.txt"
-        marker.write_text(
-            f"OK\nsha256={digest}\nurl={GITHUB_ZIP_URL}\nfilament={len(fil)}\nprocess={len(proc)}\n",
-            encoding='utf-8',
-        )
-        logging.info(f"Wrote marker: {marker}")
-    except Exception as e:
-        logging.warning(f"Could not write marker file: {e}")
-
-def detect_slicers(base: Path) -> list[str]:
-    targets = slicer_targets_from_base(base)
-    detected: list[str] = []
-    for s, cats in targets.items():
-        any_exists = False
-        for p in cats.values():
-            if isinstance(p, list):
-                for pp in p:
-                    if pp.exists() or pp.parent.exists():
-                        any_exists = True
-                        break
-            else:
-                if Path(p).exists() or Path(p).parent.exists():
-                    any_exists = True
-            if any_exists:
-                break
-        if any_exists:
-            detected.append(s)
-    return detected
-
-def _target_paths_exist(targets: dict[str, Path | list[Path]]) -> bool:
-    for path_value in targets.values():
-        if isinstance(path_value, list):
-            for path in path_value:
-                if path.exists() or path.parent.exists():
-                    return True
-        else:
-            if path_value.exists() or path_value.parent.exists():
-                return True
-    return False
-
-def _count_target_files(targets: dict[str, Path | list[Path]]) -> int:
-    files_found = 0
-    for path_value in targets.values():
-        if isinstance(path_value, list):
-            for path in path_value:
-                if path.exists():
-                    files_found += sum(1 for f in path.glob("**/*") if f.is_file())
-        else:
-            if path_value.exists():
-                files_found += sum(1 for f in path_value.glob("**/*") if f.is_file())
-    return files_found
-
-def _flatten_target_paths(targets: dict[str, Path | list[Path]]) -> list[Path]:
-    paths: list[Path] = []
-    for path_value in targets.values():
-        if isinstance(path_value, list):
-            paths.extend(path_value)
-        else:
-            paths.append(path_value)
-    return _unique_paths(paths)
-
-def _target_root_for_display(slicer_name: str, target_path: Path) -> Path:
-    if slicer_name == "PrusaSlicer":
-        return target_path.parent
-    if slicer_name in {"OrcaSlicer", "BambuStudio", "SnapmakerOrca", "AnyCubicSlicer", "QIDIStudio"}:
-        return target_path.parent.parent.parent
-    return target_path.parent
-
-def _display_base_for_slicer(slicer_name: str, targets: dict[str, Path | list[Path]]) -> Path:
-    candidates = [_target_root_for_display(slicer_name, path) for path in _flatten_target_paths(targets)]
-    candidates = _unique_paths(candidates)
-
-    for candidate in candidates:
-        if candidate.exists():
-            return candidate
-
-    return candidates[0] if candidates else appdata_base()
-
-def headless_install(selected_slicers: list[str], base: Path):
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    zip_path = CACHE_DIR / "profiles.zip"
-    extract_dir = CACHE_DIR / "profiles_extracted"
-    logging.info(f"Downloading: {GITHUB_ZIP_URL}")
-    req = Request(GITHUB_ZIP_URL, headers={"User-Agent":"colorFabb-Installer"})
-    with urlopen(req) as r, open(zip_path, 'wb') as f:
-        shutil.copyfileobj(r, f)
-    with zipfile.ZipFile(zip_path, 'r') as z:
-        z.testzip()
-    digest = sha256_file(zip_path)
-    logging.info(f"ZIP sha256 = {digest}")
-    if EXPECTED_SHA256 and digest.lower() != EXPECTED_SHA256.lower():
-        raise RuntimeError(f"SHA256 mismatch: got {digest}, expected {EXPECTED_SHA256}")
-    extract_zip(zip_path, extract_dir)
-    fil, proc = collect_repo_profiles_robust(extract_dir)
-    targets = slicer_targets_from_base(base)
-    targets = {k:v for k,v in targets.items() if k in selected_slicers}
-    plan = []
-    for it in fil + proc:
-        cat = it.get("category", "filament")
-        base_path = targets.get(it["slicer"], {}).get(cat)
-        if not base_path:
-            continue
-        if isinstance(base_path, list):
-            for bp in base_path:
-                plan.append((it["src"], bp / it["src"].name))
-        else:
-            plan.append((it["src"], base_path / it["src"].name))
-    logging.info(f"Copy plan: {len(plan)} files")
-    added = []
-    for src, dst in plan:
-        ensure_dir(dst.parent)
-        shutil.copy2(src, dst)
-        added.append(dst)
-        logging.info(f"Copied {src.name} -> {dst}")
-    rewrite_installed_list(remove_paths=[], add_paths=added)
-    logging.info("Headless install complete.")
 
 # ========= ENTRY =========
 def main():
-    setup_logging()
     args = parse_args()
+    setup_logging(args.log_verbosity)
+    if args.profile_timings:
+        enable_timings()
+        atexit.register(write_timings, args.profile_timings)
 
     # Splash support is Windows-only in the PyInstaller spec. Keep the runtime
     # import dynamic so Linux builds do not activate PyInstaller's splash hook.
@@ -1630,11 +93,18 @@ def main():
         except Exception:
             pyi_splash = None  # type: ignore
 
-    base = Path(args.base) if args.base else appdata_base()
+    installer_core.ARCHIVE_MEMORY_LIMIT = int(args.archive_memory_mb * 2**20)
+    if args.source:
+        installer_core.GITHUB_ZIP_URL = args.source
+    bases = [Path(b) for b in args.base] if args.base else [appdata_base()]
     TEMP_ROOT.mkdir(parents=True, exist_ok=True)
+    metrics_dir = Path(args.metrics) if args.metrics else None
+    def metrics(mode: str):
+        return metrics_run(mode, metrics_dir, enabled=args.metrics is not None, version=VERSION)
 
     if args.uninstall:
-        deleted, total = uninstall_installed_files(dry_run=args.dry_run)
+        with metrics("uninstall"):
+            deleted, total = uninstall_installed_files(dry_run=args.dry_run)
         logging.info(f"Uninstall complete: deleted {deleted}/{total}")
         try:
             if pyi_splash and pyi_splash.is_alive():
@@ -1643,14 +113,37 @@ def main():
             pass
         return
 
+    if args.list_backups:
+        for run in list_backups():
+            counts = {}
+            for e in run.get("entries", []):
+                counts[e["action"]] = counts.get(e["action"], 0) + 1
+            summary = ", ".join(f"{n} {action}" for action, n in sorted(counts.items()))
+            print(f"{run.get('run_id')}  {run.get('mode', '?'):13} {summary}")
+        return
+
+    if args.restore:
+        try:
+            with metrics("restore") as status:
+                restored, total = restore_backup(args.restore, dry_run=args.dry_run)
+                status["ok"] = restored == total or args.dry_run
+        except ValueError as e:
+            logging.error(str(e))
+            sys.exit(1)
+        logging.info(f"Restore complete: {restored}/{total}")
+        if restored != total and not args.dry_run:
+            sys.exit(1)
+        return
+
     if args.check_download:
         try:
-            check_download_only()
+            with metrics("check_download"):
+                check_download_only()
             logging.info("Download check OK.")
-            if GUI_ENABLED and not args.silent:
+            gui = None if args.silent else _load_gui()
+            if gui:
                 try:
-                    app = QApplication.instance() or QApplication(sys.argv)
-                    QMessageBox.information(None, APP_DISPLAY_NAME, "Download check OK. Profiles ZIP downloaded and validated.")
+                    gui.show_message("information", "Download check OK. Profiles ZIP downloaded and validated.")
                 except Exception:
                     pass
             try:
@@ -1661,52 +154,72 @@ def main():
             return
         except Exception as e:
             logging.error(f"Download check failed: {e}")
-            if GUI_ENABLED and not args.silent:
+            gui = None if args.silent else _load_gui()
+            if gui:
                 try:
-                    app = QApplication.instance() or QApplication(sys.argv)
-                    QMessageBox.critical(None, APP_DISPLAY_NAME, f"Download check failed:\n{e}")
+                    gui.show_message("critical", f"Download check failed:\n{e}")
                 except Exception:
                     pass
             raise
 
-    if args.silent:
-        selected = args.slicers or (detect_slicers(base) if args.all or not args.slicers else [])
-        if not selected:
-            selected = ["PrusaSlicer","OrcaSlicer","BambuStudio","SnapmakerOrca","AnyCubicSlicer","QIDIStudio"]
-        logging.info(f"Silent mode: slicers={selected}; base={base}")
-        headless_install(selected_slicers=selected, base=base)
+    if args.all_users or args.users_file:
+        homes = enumerate_user_homes(Path(args.users_file) if args.users_file else None)
+        logging.info(f"Multi-user mode: {len(homes)} homes; slicers={args.slicers or 'detected per user'}")
+        with metrics("fleet_install") as status:
+            results = fleet_install(homes, selected_slicers=args.slicers, workers=args.workers)
+            status["ok"] = not any(r["error"] for r in results)
         try:
             if pyi_splash and pyi_splash.is_alive():
                 pyi_splash.close()
         except Exception:
             pass
+        if any(r["error"] for r in results):
+            sys.exit(1)
         return
 
-    if not GUI_ENABLED:
-        print("GUI libraries not available; use --silent or install PySide6")
-        sys.exit(1)
+    if args.serve_cache:
+        host, _, port = args.serve_cache.rpartition(":")
+        stop = CancelToken()
+        signal.signal(signal.SIGTERM, lambda *_: stop.cancel())
+        try:
+            serve_cache(host or "0.0.0.0", int(port), refresh_interval=args.serve_refresh, stop=stop)
+        except KeyboardInterrupt:
+            stop.cancel()
+        return
 
-    app = QApplication(sys.argv)
-    app.setStyleSheet(WELCOME_QSS)  # start geel
-    # Zet geel icoon (taskbar duidelijk)
-    lp = find_logo()
-    if lp:
+    if args.watch:
+        selected = args.slicers or _detect_in(bases) or list(ALL_SLICERS)
+        stop = CancelToken()
+        signal.signal(signal.SIGTERM, lambda *_: stop.cancel())
+        try:
+            watch_install(selected, bases, interval=args.watch_interval, jitter=args.watch_jitter, stop=stop)
+        except KeyboardInterrupt:
+            logging.info("Watch interrupted.")
+        return
+
+    if args.silent:
+        selected = args.slicers or (_detect_in(bases) if args.all or not args.slicers else [])
+        if not selected:
+            selected = list(ALL_SLICERS)
+        logging.info(f"Silent mode: slicers={selected}; base={', '.join(str(b) for b in bases)}")
+        with metrics("install"):
+            headless_install(selected_slicers=selected, base=bases)
         try:
-            pm = QPixmap(str(lp))
-            if not pm.isNull():
-                icon = make_yellow_icon(pm)
-                app.setWindowIcon(icon)
+            if pyi_splash and pyi_splash.is_alive():
+                pyi_splash.close()
         except Exception:
             pass
+        return
 
-    w = InstallerWindow()
-    w.show()
-    try:
-        if pyi_splash and pyi_splash.is_alive():
-            QTimer.singleShot(0, pyi_splash.close)
-    except Exception:
-        pass
-    sys.exit(app.exec())
+    gui = _load_gui()
+    if gui is None:
+        print("GUI libraries not available; use --silent or install PySide6")
+        sys.exit(1)
+    sys.exit(gui.run_wizard(pyi_splash))
 
 if __name__ == "__main__":
+    # Profile validation uses a process pool; frozen Windows builds need this so
+    # worker processes do not start another installer.
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Synthetic fixtures for the benchmark suite (tools/bench_suite.py).
+
+- make_profiles_zip(): a profiles ZIP laid out like the GitHub repo archive,
+  with `profiles` filament + process presets per slicer (JSON for the Orca
+  family, INI for PrusaSlicer; every 4th Orca preset inherits from another).
+- make_appdata(): a fake home with native slicer folders, `accounts` numeric
+  account folders per account-folder slicer and, optionally, Flatpak layouts.
+- ThrottledServer: a local HTTP stand-in for GitHub with configurable
+  latency and bandwidth.
+"""
+
+import hashlib
+import io
+import json
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+REPO_PREFIX = "printer-profiles-main"
+
+# Repo folder per slicer, as in the real archive.
+REPO_DIRS = {
+    "PrusaSlicer": "PrusaSlicer",
+    "OrcaSlicer": "OrcaSlicer",
+    "BambuStudio": "BambuStudio",
+    "SnapmakerOrca": "SnapmakerOrca",
+    "AnyCubicSlicer": "AnycubicSlicerNext",
+    "QIDIStudio": "QIDIStudio",
+}
+
+
+def _orca_preset(name: str, category: str, parent: str | None, size: int) -> bytes:
+    doc = {"type": category, "name": name, "from": "User", "instantiation": "true"}
+    if parent:
+        doc["inherits"] = parent
+    # Pad with realistic-looking keys so file sizes resemble real presets.
+    i = 0
+    while len(json.dumps(doc)) < size:
+        doc[f"setting_{i}"] = [str(i * 7 % 300)]
+        i += 1
+    return json.dumps(doc, indent=4).encode("utf-8")
+
+
+def _prusa_preset(name: str, size: int) -> bytes:
+    lines = [f"# generated by bench_fixtures for {name}"]
+    i = 0
+    while sum(len(line) + 1 for line in lines) < size:
+        lines.append(f"setting_{i} = {i * 7 % 300}")
+        i += 1
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def make_profiles_zip(slicers: list[str], profiles: int, size: int = 2048) -> bytes:
+    """Build a profiles ZIP in memory with `profiles` presets per slicer and category."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        for slicer in slicers:
+            root = f"{REPO_PREFIX}/{REPO_DIRS[slicer]}"
+            if slicer == "PrusaSlicer":
+                for cat in ("filament", "print"):
+                    for i in range(profiles):
+                        z.writestr(f"{root}/{cat}/colorFabb {cat} {i:05d}.ini", _prusa_preset(f"{cat} {i}", size))
+                continue
+            for cat in ("filament", "process"):
+                for i in range(profiles):
+                    parent = f"colorFabb {cat} {i - 1:05d}" if i % 4 == 3 else None
+                    name = f"colorFabb {cat} {i:05d}"
+                    z.writestr(f"{root}/{cat}/{name}.json", _orca_preset(name, cat, parent, size))
+        z.writestr(f"{REPO_PREFIX}/README.md", "synthetic benchmark repo\n")
+    return buf.getvalue()
+
+
+def make_appdata(home: Path, base: Path, slicers: list[str], accounts: int, flatpak: bool,
+                 account_slicers: dict, flatpak_bases: dict):
+    """Create slicer app-data folders under `base` (and Flatpak ones under `home`)."""
+    for slicer in slicers:
+        roots = [base]
+        if flatpak and slicer in flatpak_bases:
+            app_id, _app_dir = flatpak_bases[slicer]
+            roots.append(home / ".var" / "app" / app_id / "config")
+        for root in roots:
+            if slicer in account_slicers:
+                user_root = root / account_slicers[slicer]["root"] / "user"
+                for a in range(accounts):
+                    for cat in ("filament", "process"):
+                        (user_root / str(1000000 + a) / cat).mkdir(parents=True, exist_ok=True)
+            elif slicer == "PrusaSlicer":
+                (root / "PrusaSlicer" / "filament").mkdir(parents=True, exist_ok=True)
+            elif slicer == "OrcaSlicer":
+                (root / "OrcaSlicer" / "user" / "default" / "filament").mkdir(parents=True, exist_ok=True)
+
+
+class ThrottledServer:
+    """Serve `payload` at /profiles.zip with added latency and a bandwidth cap.
+
+    Answers If-None-Match with 304 like GitHub does; `transfers` counts full
+    bodies sent, so callers can check how often the "upstream" was hit.
+    """
+
+    def __init__(self, payload: bytes, latency_ms: float = 0.0, bandwidth_kbps: float = 0.0):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/profiles.zip":
+                    self.send_error(404)
+                    return
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000.0)
+                etag = f'"{hashlib.sha256(server.payload).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                with server.lock:
+                    server.transfers += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/zip")
+                self.send_header("Content-Length", str(len(server.payload)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                chunk = 64 * 1024
+                rate = server.bandwidth_kbps * 1024 / 8  # bytes per second
+                for i in range(0, len(server.payload), chunk):
+                    piece = server.payload[i:i + chunk]
+                    self.wfile.write(piece)
+                    if rate:
+                        time.sleep(len(piece) / rate)
+
+            def log_message(self, *args):
+                pass
+
+        self.payload = payload
+        self.latency_ms = latency_ms
+        self.bandwidth_kbps = bandwidth_kbps
+        self.transfers = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/profiles.zip"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        return False
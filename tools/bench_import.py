@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for headless runs (--silent, --uninstall, --check-download).
+
+Runs `python -X importtime -c "import main"` in fresh interpreters, parses the
+cumulative import time of `main` and fails when Qt gets imported or the best
+run exceeds the budget.
+
+Usage: python tools/bench_import.py [--budget-ms 300] [--runs 5]
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Map module name -> cumulative import time (microseconds) from -X importtime output."""
+    times: dict[str, int] = {}
+    for line in stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative = int(parts[1].strip())
+        except ValueError:
+            continue  # header line
+        times[parts[2].strip()] = cumulative
+    return times
+
+
+def measure_once() -> dict[str, int]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--budget-ms", type=float, default=300.0, help="Max cumulative import time of main.py")
+    ap.add_argument("--runs", type=int, default=5, help="Runs to take the best of")
+    args = ap.parse_args()
+
+    best_us = None
+    for _ in range(max(1, args.runs)):
+        times = measure_once()
+        qt = sorted(m for m in times if m.startswith("PySide6"))
+        if qt:
+            print(f"FAIL: headless import pulled in Qt: {', '.join(qt[:5])}")
+            return 1
+        if "main" not in times:
+            print("FAIL: no import time recorded for main")
+            return 1
+        best_us = times["main"] if best_us is None else min(best_us, times["main"])
+
+    best_ms = best_us / 1000.0
+    status = "OK" if best_ms <= args.budget_ms else "FAIL"
+    print(f"{status}: import main = {best_ms:.1f} ms (budget {args.budget_ms:.0f} ms, best of {args.runs})")
+    return 0 if status == "OK" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Localhost load check for --serve-cache.
+
+Starts a throttled "GitHub" (tools/bench_fixtures.py), runs the installer's LAN
+cache server against it and fires many concurrent simulated clients doing full
+downloads, Range requests and conditional (If-None-Match) requests. Fails if any
+client sees wrong bytes or status codes, or if the upstream archive was
+transferred more than once.
+
+Usage: python tools/bench_serve_cache.py [--clients 300] [--concurrency 64]
+                                         [--profiles 200] [--bandwidth-kbps 0]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def client(url: str, kind: str, payload: bytes, etag: str) -> str | None:
+    """One simulated installer; returns an error string or None."""
+    headers = {}
+    if kind == "range":
+        headers["Range"] = "bytes=100-1099"
+    elif kind == "conditional":
+        headers["If-None-Match"] = etag
+    try:
+        with urlopen(Request(url, headers=headers), timeout=60) as r:
+            body = r.read()
+            status = r.status
+    except HTTPError as e:
+        status, body = e.code, b""
+    if kind == "full" and (status != 200 or body != payload):
+        return f"full: status {status}, {len(body)} bytes"
+    if kind == "range" and (status != 206 or body != payload[100:1100]):
+        return f"range: status {status}, {len(body)} bytes"
+    if kind == "conditional" and status != 304:
+        return f"conditional: status {status}"
+    return None
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--clients", type=int, default=300)
+    ap.add_argument("--concurrency", type=int, default=64)
+    ap.add_argument("--profiles", type=int, default=200, help="Presets per slicer and category in the synthetic repo")
+    ap.add_argument("--bandwidth-kbps", type=float, default=0.0, help="Upstream bandwidth cap (0 = unlimited)")
+    args = ap.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="cf_serve_"))
+    os.environ["TMPDIR"] = os.environ["TEMP"] = os.environ["TMP"] = str(work)
+    tempfile.tempdir = None
+    sys.path.insert(0, str(REPO_ROOT))
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import installer_core as core
+    import bench_fixtures as fixtures
+
+    payload = fixtures.make_profiles_zip(list(core.ALL_SLICERS), args.profiles)
+    etag = f'"{hashlib.sha256(payload).hexdigest()}"'
+    stop = core.CancelToken()
+    bound = threading.Event()
+    ports = []
+
+    with fixtures.ThrottledServer(payload, bandwidth_kbps=args.bandwidth_kbps) as upstream:
+        t = threading.Thread(target=core.serve_cache, kwargs=dict(
+            host="127.0.0.1", port=0, upstream=upstream.url, refresh_interval=0.5, stop=stop,
+            ready=lambda httpd: (ports.append(httpd.server_address[1]), bound.set())), daemon=True)
+        t.start()
+        bound.wait(10)
+        url = f"http://127.0.0.1:{ports[0]}/profiles.zip"
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            try:
+                with urlopen(url.replace("profiles.zip", "health"), timeout=5):
+                    break
+            except HTTPError:
+                time.sleep(0.1)
+
+        kinds = ["full", "range", "conditional"]
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            errors = [e for e in pool.map(lambda i: client(url, kinds[i % 3], payload, etag), range(args.clients)) if e]
+        elapsed = time.perf_counter() - t0
+        time.sleep(1.5)  # let the refresher poll again: must be a 304, not a transfer
+        stop.cancel()
+        t.join(5)
+        transfers = upstream.transfers
+
+    full = sum(1 for i in range(args.clients) if i % 3 == 0)
+    print(f"{args.clients} clients ({args.concurrency} concurrent) in {elapsed:.2f}s; "
+          f"archive {len(payload) / 1e6:.1f} MB; served {full * len(payload) / 1e6 / elapsed:.0f} MB/s of full downloads")
+    print(f"upstream transfers: {transfers}; client errors: {len(errors)}")
+    for e in errors[:5]:
+        print("  ", e)
+    ok = not errors and transfers == 1
+    print("OK" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the install pipeline at several repo/app-data scales.
+
+Each scale generates a synthetic profiles repo (tools/bench_fixtures.py),
+serves it from a local HTTP stand-in with optional latency/bandwidth limits and
+runs the headless pipeline in an isolated TMPDIR/HOME. Phase times come from
+the installer's own spans (download, verify, extract, catalog, validate, plan,
+copy, manifest), plus cold target resolution, a warm re-install and uninstall.
+The wizard's install loop needs Qt; its core equivalent is the `copy` phase.
+
+Results are compared against tools/bench_baseline.json; --save-baseline
+rewrites it. Baselines are machine-specific: refresh them on the machine
+that runs the comparison.
+
+Usage: python tools/bench_suite.py [--scales small medium large] [--repeat 3]
+                                   [--latency-ms 0] [--bandwidth-kbps 0]
+                                   [--save-baseline] [--fail-over 50]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE = Path(__file__).resolve().parent / "bench_baseline.json"
+
+# profiles = presets per slicer and category; accounts = account folders per
+# account-folder slicer (native and Flatpak each).
+SCALES = {
+    "small":  {"profiles": 25,   "accounts": 1},
+    "medium": {"profiles": 200,  "accounts": 2},
+    "large":  {"profiles": 1000, "accounts": 2},
+}
+
+# Ignore regressions smaller than this; tiny phases are mostly noise.
+MIN_REGRESSION_MS = 5.0
+
+
+def _isolate(work: Path):
+    """Point TMPDIR/HOME at `work` before installer_core computes its paths."""
+    (work / "tmp").mkdir(parents=True, exist_ok=True)
+    os.environ["TMPDIR"] = os.environ["TEMP"] = os.environ["TMP"] = str(work / "tmp")
+    tempfile.tempdir = None
+    sys.path.insert(0, str(REPO_ROOT))
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def _set_home(home: Path):
+    home.mkdir(parents=True, exist_ok=True)
+    os.environ["HOME"] = os.environ["USERPROFILE"] = str(home)
+
+
+def _phase_ms(core, since: int, prefix: str) -> dict[str, float]:
+    out: dict[str, float] = {}
+    for sp in core.timing_spans()[since:]:
+        key = f"{prefix}.{sp['name']}"
+        out[key] = out.get(key, 0.0) + sp["dur_ns"] / 1e6
+    return out
+
+
+def run_scale(core, fixtures, work: Path, scale: dict, args) -> dict[str, float]:
+    slicers = list(core.ALL_SLICERS)
+    payload = fixtures.make_profiles_zip(slicers, scale["profiles"])
+    home = work / "home"
+    if home.exists():
+        shutil.rmtree(home)
+    shutil.rmtree(core.TEMP_ROOT, ignore_errors=True)
+    _set_home(home)
+    base = home / "appdata"
+    fixtures.make_appdata(home, base, slicers, scale["accounts"], args.flatpak,
+                          core.ACCOUNT_SLICERS, core.LINUX_FLATPAK_BASES)
+    core.invalidate_target_cache()
+
+    results: dict[str, float] = {"zip_bytes": float(len(payload))}
+    with fixtures.ThrottledServer(payload, args.latency_ms, args.bandwidth_kbps) as srv:
+        core.GITHUB_ZIP_URL = srv.url
+
+        mark = len(core.timing_spans())
+        core.headless_install(slicers, base)
+        results.update(_phase_ms(core, mark, "cold"))
+
+        core.invalidate_target_cache()
+        t0 = time.perf_counter()
+        core.slicer_targets_from_base(base)
+        results["targets.cold"] = (time.perf_counter() - t0) * 1000
+
+        mark = len(core.timing_spans())
+        core.headless_install(slicers, base)  # destinations unchanged, validation cached
+        results.update(_phase_ms(core, mark, "warm"))
+
+    results["files_installed"] = float(len(core.read_installed_set()))
+    mark = len(core.timing_spans())
+    core.uninstall_installed_files()
+    results.update(_phase_ms(core, mark, "cleanup"))
+    return results
+
+
+def compare(results: dict, baseline: dict, fail_over: float) -> int:
+    regressions = 0
+    for scale, phases in results.items():
+        base_phases = baseline.get("results", {}).get(scale, {})
+        print(f"\n== {scale} ==")
+        print(f"{'phase':34} {'ms':>10} {'baseline':>10} {'delta':>8}")
+        for name in sorted(phases):
+            ms = phases[name]
+            if name in ("zip_bytes", "files_installed"):
+                print(f"{name:34} {ms:>10.0f}")
+                continue
+            ref = base_phases.get(name)
+            if ref is None:
+                print(f"{name:34} {ms:>10.1f} {'-':>10} {'':>8}")
+                continue
+            delta = (ms - ref) / ref * 100 if ref else 0.0
+            flag = ""
+            if ms > ref * (1 + fail_over / 100) and ms - ref > MIN_REGRESSION_MS:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(f"{name:34} {ms:>10.1f} {ref:>10.1f} {delta:>+7.0f}%{flag}")
+    return regressions
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--scales", nargs="*", default=["small", "medium"], choices=sorted(SCALES))
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per scale; the fastest of each phase is kept")
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="Added server latency per request")
+    ap.add_argument("--bandwidth-kbps", type=float, default=0.0, help="Server bandwidth cap (0 = unlimited)")
+    ap.add_argument("--no-flatpak", dest="flatpak", action="store_false", help="Skip Flatpak app-data layouts")
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    ap.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    ap.add_argument("--fail-over", type=float, default=50.0, help="Exit 1 if a phase is this many %% slower than baseline")
+    args = ap.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="cf_bench_"))
+    _isolate(work)
+    import installer_core as core
+    import bench_fixtures as fixtures
+    core.enable_timings()
+
+    config = {"latency_ms": args.latency_ms, "bandwidth_kbps": args.bandwidth_kbps, "flatpak": args.flatpak,
+              "repeat": args.repeat, "python": platform.python_version(), "platform": sys.platform}
+    results: dict[str, dict[str, float]] = {}
+    try:
+        for name in args.scales:
+            best: dict[str, float] = {}
+            for _ in range(max(1, args.repeat)):
+                for phase, ms in run_scale(core, fixtures, work, SCALES[name], args).items():
+                    best[phase] = min(ms, best.get(phase, ms))
+            results[name] = {k: round(v, 3) for k, v in best.items()}
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    if args.save_baseline:
+        doc = {"config": config, "scales": {n: SCALES[n] for n in results}, "results": results}
+        args.baseline.write_text(json.dumps(doc, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+        compare(results, {}, args.fail_over)
+        print(f"\nBaseline written: {args.baseline}")
+        return 0
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("config", {}).get("latency_ms") != args.latency_ms or \
+                baseline.get("config", {}).get("bandwidth_kbps") != args.bandwidth_kbps:
+            print("note: baseline was recorded with different network settings")
+    regressions = compare(results, baseline, args.fail_over)
+    if regressions:
+        print(f"\nFAIL: {regressions} phase(s) regressed by more than {args.fail_over:.0f}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())